@@ -4,8 +4,8 @@
 from gevent import monkey
 monkey.patch_all()
 
-# pylint: disable=wrong-import-position
-from flask_sqlalchemy import SQLAlchemy
+# pylint: disable=wrong-import-position, wrong-import-order
+import logging
 from flask_migrate import Migrate, MigrateCommand
 from flask_login import LoginManager
 from flask_cors import CORS
@@ -19,14 +19,15 @@ from flask_socketio import SocketIO
 
 from redis import Redis
 from .celery_config import make_celery
+from .db_config import make_gevent_pool, RoutingSQLAlchemy
 from .logging_config import create_logger
 from .config import (
     Config,
     GOOGLE_CLIENT_ID,
     GOOGLE_CLIENT_SECRET,
-    GOOGLE_PROVIDER_CONFIG,
     REDIS_PASSWORD
 )
+from .discovery_config import GoogleOAuthConfig
 
 
 APP = Flask(__name__)
@@ -37,16 +38,20 @@ NGFG_CORS = CORS(
     expose_headers=['session', "Set-Cookie"]
 )
 APP.config.from_object(Config)
+APP.config['GOOGLE_OAUTH'] = GoogleOAuthConfig()
 REDIS = Redis(password=REDIS_PASSWORD)
 LOGIN_MANAGER = LoginManager()
 LOGIN_MANAGER.init_app(APP)
-DB = SQLAlchemy(APP, session_options={'autocommit': True})
+make_gevent_pool()
+DB = RoutingSQLAlchemy(APP, session_options={'autocommit': True})
 MIGRATE = Migrate(APP, DB, directory=APP.config['MIGRATION_DIR'])
 MANAGER = Manager(APP)
 MANAGER.add_command('db', MigrateCommand)
 LOGGER = create_logger(APP.config['LOG_DIR'], filename='warning.log')
 SHEET_LOGGER = create_logger(APP.config['LOG_DIR'], filename='sheet.log')
 CONNECTIONS_LOGGER = create_logger(APP.config['LOG_DIR'], filename='connections.log')
+TIMING_LOGGER = create_logger(APP.config['LOG_DIR'], filename='timing.log',
+                              name='timing', level=logging.INFO)
 MA = Marshmallow(APP)
 BLUEPRINT = Blueprint('api', __name__, url_prefix='/api/v1')
 API = Api(
@@ -59,17 +64,15 @@ APP.register_blueprint(BLUEPRINT)
 
 CELERY = make_celery(APP)
 
+# endpoints are read from GOOGLE_OAUTH config on first login
 GOOGLE_CLIENT = OAuth(APP).remote_app(
     'ngfg',
-    base_url=GOOGLE_PROVIDER_CONFIG['issuer'],
-    authorize_url=GOOGLE_PROVIDER_CONFIG['authorization_endpoint'],
+    app_key='GOOGLE_OAUTH',
 
-    request_token_url=None,
     request_token_params={
         'scope': 'openid email profile',
     },
 
-    access_token_url=GOOGLE_PROVIDER_CONFIG['token_endpoint'],
     access_token_method='POST',
 
     consumer_key=GOOGLE_CLIENT_ID,
@@ -86,6 +89,12 @@ SOCKETIO = SocketIO(
 )
 
 
+from .helper.timing import init_timing  # pylint: disable=wrong-import-position
+from .helper.metrics import init_metrics  # pylint: disable=wrong-import-position
+from .helper.query_counter import init_query_logging  # pylint: disable=wrong-import-position
+init_timing(APP)
+init_metrics(APP)
+init_query_logging(APP)
 
 from .routers import (  # pylint: disable=wrong-import-position
     main,
@@ -98,7 +107,8 @@ from .routers import (  # pylint: disable=wrong-import-position
     form_answer,
     shared_field,
     shared_form,
-    token_check
+    token_check,
+    search
 )
 from .models import *  # pylint: disable=wrong-import-position
 from .celery_tasks import *  # pylint: disable=wrong-import-position
@@ -3,3 +3,9 @@ Init tasks
 """
 
 from .example import call_task
+from .partitions import create_form_results_partitions
+from .archive import archive_inactive_forms
+from .autocomplete import sync_autocomplete_mirror
+from .reconciliation import reconcile_sheets
+from .form_events import emit_new_results
+from .form_results import delete_inserted_submissions
@@ -0,0 +1,16 @@
+"""
+Celery task to archive results of inactive forms
+"""
+
+from app import CELERY
+from app.services import FormResultArchiveService
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.archive.archive_inactive_forms')
+def archive_inactive_forms():
+    """
+    Move results of forms whose tokens have all expired to archive files
+
+    :return: list of archived form ids
+    """
+    return FormResultArchiveService.archive_inactive_forms()
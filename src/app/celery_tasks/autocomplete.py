@@ -0,0 +1,16 @@
+"""
+Celery task to mirror autocomplete sheets to Redis
+"""
+
+from app import CELERY
+from app.services import AutocompleteMirrorService
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.autocomplete.sync_autocomplete_mirror')
+def sync_autocomplete_mirror():
+    """
+    Read all autocomplete ranges and update their mirror
+
+    :return: dict with amount of changed, unchanged and failed fields
+    """
+    return AutocompleteMirrorService.sync()
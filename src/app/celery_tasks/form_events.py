@@ -0,0 +1,16 @@
+"""
+Celery task to emit coalesced counts of new form results
+"""
+
+from app import CELERY
+from app.helper.form_events import FormEvents
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.form_events.emit_new_results')
+def emit_new_results():
+    """
+    Emit counts of results created since previous run to form rooms
+
+    :return: dict {form_id: amount of new results}
+    """
+    return FormEvents.emit_new_results()
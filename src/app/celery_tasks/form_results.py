@@ -0,0 +1,21 @@
+"""
+Celery task to delete ids of inserted batch mode submissions
+"""
+
+import datetime
+
+from app import APP, CELERY
+from app.services import FormResultService
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.form_results.delete_inserted_submissions')
+def delete_inserted_submissions():
+    """
+    Delete ids of submissions inserted longer than FORM_RESULTS_SUBMISSION_KEEP_TIME ago
+
+    :return: amount of deleted ids or None
+    """
+    before = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+        seconds=APP.config['FORM_RESULTS_SUBMISSION_KEEP_TIME']
+    )
+    return FormResultService.delete_inserted(before)
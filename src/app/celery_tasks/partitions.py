@@ -0,0 +1,20 @@
+"""
+Celery task to create partitions of partitioned tables ahead of time
+"""
+
+from app import APP, CELERY
+from app.helper.partition_manager import PartitionManager
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.partitions.create_form_results_partitions')
+def create_form_results_partitions():
+    """
+    Create form_results partitions for current and upcoming months,
+    so inserts never fall into default partition
+
+    :return: list of partition names or None
+    """
+    return PartitionManager.create_partitions(
+        'form_results',
+        APP.config['FORM_RESULTS_PARTITIONS_AHEAD']
+    )
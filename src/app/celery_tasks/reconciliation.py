@@ -0,0 +1,16 @@
+"""
+Celery task to append results missing in form sheets
+"""
+
+from app import CELERY
+from app.services import SheetReconciliationService
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.reconciliation.reconcile_sheets')
+def reconcile_sheets():
+    """
+    Append results saved in db but missing in sheets of their forms
+
+    :return: dict {form_id: amount of appended rows or None if failed}
+    """
+    return SheetReconciliationService.reconcile_all()
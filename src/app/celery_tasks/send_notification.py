@@ -1,21 +1,53 @@
 """
-Celery task to send notification
+Celery tasks to send notifications
 """
 
-from app import SOCKETIO, CELERY
+from app import APP, SOCKETIO, CELERY
+from app.helper.notification_buffer import NotificationBuffer
+
+
+def notify(message, current_user_email):
+    """
+    Buffer message, first message of window schedules one flush of room,
+    so bulk operations emit one batch and enqueue one task per window
+
+    :param message: message to send via socket
+    :param current_user_email: socket room
+    """
+    if NotificationBuffer.add(current_user_email, message):
+        flush_notifications.apply_async(
+            args=[current_user_email],
+            countdown=APP.config['NOTIFICATION_WINDOW']
+        )
 
 
 @CELERY.task(name='ngfg.app.celery_tasks.send_notification.send_notification')
 def send_notification(message, current_user_email):
     """
-    Send message via socket
+    Buffer message of task linked to it.
+    Share tasks call notify themselves, task is kept for messages already queued
 
     :param message: message to send via socket
     :param current_user_email: socket room
     """
-    SOCKETIO.emit(
-        'message',
-        {'notification': message},
-        broadcast=False,
-        room=current_user_email
-    )
+    notify(message, current_user_email)
+
+
+@CELERY.task(name='ngfg.app.celery_tasks.send_notification.flush_notifications')
+def flush_notifications(current_user_email):
+    """
+    Send buffered messages of room via socket with one emit
+
+    :param current_user_email: socket room
+    :return: amount of sent messages
+    """
+    messages = NotificationBuffer.pop(current_user_email)
+    if messages:
+        SOCKETIO.emit(
+            'message',
+            # notification keeps clients reading single message working
+            {'notification': messages[-1], 'notifications': messages},
+            broadcast=False,
+            room=current_user_email
+        )
+    return len(messages)
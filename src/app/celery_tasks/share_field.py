@@ -6,7 +6,7 @@ from flask_login import current_user
 
 from app import CELERY, MAIL
 from app.helper.email_generator import generate_share_field_message
-from .send_notification import send_notification
+from .send_notification import notify
 
 
 def call_share_field_task(recipients, field):
@@ -19,19 +19,20 @@ def call_share_field_task(recipients, field):
     """
     share_field.apply_async(
         args=[recipients, field],
-        link=[send_notification.s(current_user.email)]
+        kwargs={'notification_room': current_user.email}
     )
     return 0
 
 
 @CELERY.task(name='ngfg.app.celery_tasks.share_field.share_field')
-def share_field(recipients, field):
+def share_field(recipients, field, notification_room=None):
     """
     Send emails to recipients
 
     :param self:
     :param recipients:
     :param field:
+    :param notification_room: email of user to notify via socket
     :return:
     """
 
@@ -40,4 +41,7 @@ def share_field(recipients, field):
             msg = generate_share_field_message(recipient, field)
             conn.send(msg)
 
-    return 'Field ' + field['name'] + ' have been sent!'
+    message = 'Field ' + field['name'] + ' have been sent!'
+    if notification_room is not None:
+        notify(message, notification_room)
+    return message
@@ -9,7 +9,7 @@ from app.helper.email_generator import (
     generate_share_form_to_group_user_message,
     generate_share_form_to_user_message
 )
-from app.celery_tasks.send_notification import send_notification
+from app.celery_tasks.send_notification import notify
 
 
 def call_share_form_to_group_task(recipients, group_name, form_title, token):
@@ -23,13 +23,13 @@ def call_share_form_to_group_task(recipients, group_name, form_title, token):
     """
     share_form_to_group.apply_async(
         args=[recipients, group_name, form_title, token],
-        link=[send_notification.s(current_user.email)]
+        kwargs={'notification_room': current_user.email}
     )
     return 0
 
 
 @CELERY.task(name='ngfg.app.celery_tasks.share_form.share_form_to_group')
-def share_form_to_group(recipients, group_name, form_title, token):
+def share_form_to_group(recipients, group_name, form_title, token, notification_room=None):
     """
     Send emails to group users
 
@@ -37,6 +37,7 @@ def share_form_to_group(recipients, group_name, form_title, token):
     :param group_name: name of group to which form will be shared
     :param form_title: title of form that will be shared
     :param token: form token
+    :param notification_room: email of user to notify via socket
     """
 
     with MAIL.connect() as conn:
@@ -49,7 +50,10 @@ def share_form_to_group(recipients, group_name, form_title, token):
             )
             conn.send(msg)
 
-    return f"Form '{form_title}' has been sent to '{group_name}' group!"
+    message = f"Form '{form_title}' has been sent to '{group_name}' group!"
+    if notification_room is not None:
+        notify(message, notification_room)
+    return message
 
 
 def call_share_form_to_users_task(recipients, form_title, token):
@@ -63,19 +67,20 @@ def call_share_form_to_users_task(recipients, form_title, token):
     share_form_to_users.apply_async(
         args=[recipients, form_title, token],
         # serializer='pickle',
-        link=[send_notification.s(current_user.email)]
+        kwargs={'notification_room': current_user.email}
     )
     return 0
 
 
 @CELERY.task(name='ngfg.app.celery_tasks.share_form.share_form_to_users')
-def share_form_to_users(recipients, form_title, token):
+def share_form_to_users(recipients, form_title, token, notification_room=None):
     """
     Send emails to recipients
 
     :param recipients: users emails
     :param form_title: title of form that will be shared
     :param token: form token
+    :param notification_room: email of user to notify via socket
     """
 
     with MAIL.connect() as conn:
@@ -83,4 +88,7 @@ def share_form_to_users(recipients, form_title, token):
             msg = generate_share_form_to_user_message(recipient, form_title, token)
             conn.send(msg)
 
-    return f'Form {form_title} has been shared with users!'
+    message = f'Form {form_title} has been shared with users!'
+    if notification_room is not None:
+        notify(message, notification_room)
+    return message
@@ -3,7 +3,8 @@
 """
 
 import os
-import requests
+from celery.schedules import crontab
+from sqlalchemy.pool import NullPool
 
 BASEDIR = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
 
@@ -15,18 +16,45 @@ DATABASE = {
     'DB_NAME': os.environ.get('DB_NAME')
 }
 
+# Connection pool configuration
+# with PgBouncer pooling is left to it, so app doesn't keep connections
+DB_PGBOUNCER = os.environ.get('DB_PGBOUNCER') == 'true'
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 20))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 10))  # seconds
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds
+
+# Read-only queries are sent to replica if it's configured
+DB_REPLICA_URI = os.environ.get('DB_REPLICA_URI')
+
 # Google auth configuration
 GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET")
 GOOGLE_DISCOVERY_URL = (
     "https://accounts.google.com/.well-known/openid-configuration"
 )
-GOOGLE_PROVIDER_CONFIG = requests.get(GOOGLE_DISCOVERY_URL).json()
+SHEETS_DISCOVERY_URL = "https://sheets.googleapis.com/$discovery/rest?version=v4"
+DRIVE_DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/drive/v3/rest"
+# discovery documents are fetched on first use and cached on disk
+DISCOVERY_CACHE_DIR = os.environ.get(
+    'DISCOVERY_CACHE_DIR', os.path.join(BASEDIR, 'cache', 'discovery')
+)
+DISCOVERY_CACHE_TIME = 86400  # 1 day
+DISCOVERY_TIMEOUT = 5  # seconds
 
 REDIS_EXPIRE_TIME = 3600  # 1 hour
+IDEMPOTENCY_EXPIRE_TIME = 86400  # 1 day
+# submission holds lock while it waits for Sheets up to SHEETS_REQUEST_DEADLINE
+IDEMPOTENCY_LOCK_TIME = 300  # 5 minutes
 REDIS_PASSWORD = os.environ.get("REDIS_PASSWORD")
 
 
+# autocomplete sheets are mirrored to Redis every AUTOCOMPLETE_SYNC_INTERVAL,
+# so values respondents see are at most that old while sync works
+AUTOCOMPLETE_SYNC_INTERVAL = int(os.environ.get('AUTOCOMPLETE_SYNC_INTERVAL', 300))  # seconds
+# counts of new results are emitted to form rooms every FORM_EVENTS_INTERVAL
+FORM_EVENTS_INTERVAL = int(os.environ.get('FORM_EVENTS_INTERVAL', 10))  # seconds
+
 # jwt secret key
 SECRET_KEY = os.environ.get("APP_SECRET_KEY")
 
@@ -41,6 +69,19 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    SQLALCHEMY_BINDS = {'replica': DB_REPLICA_URI} if DB_REPLICA_URI else {}
+
+    if DB_PGBOUNCER:
+        SQLALCHEMY_ENGINE_OPTIONS = {'poolclass': NullPool}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
+            'pool_timeout': DB_POOL_TIMEOUT,
+            'pool_recycle': DB_POOL_RECYCLE,
+            'pool_pre_ping': True
+        }
+
     MIGRATION_DIR = os.path.join(BASEDIR, 'migrations')
 
     # Swagger
@@ -49,12 +90,30 @@ class Config:
     SWAGGER_UI_REQUEST_DURATION = True
 
     LOG_DIR = os.path.join(BASEDIR, 'logs')
+    # share of requests timed by stages and logged to timing.log
+    TIMING_SAMPLE_RATE = float(os.environ.get('TIMING_SAMPLE_RATE', 0.1))
+    # dev mode: log statements repeated within one request (possible N+1)
+    QUERY_LOGGING = os.environ.get('QUERY_LOGGING') == 'true'
+    QUERY_REPEAT_THRESHOLD = 3
+    ARCHIVE_DIR = os.path.join(BASEDIR, 'archive')
+    # mirror not synced for this long is ignored and sheet is read live
+    AUTOCOMPLETE_MIRROR_MAX_AGE = 3 * AUTOCOMPLETE_SYNC_INTERVAL
+    AUTOCOMPLETE_MIRROR_EXPIRE_TIME = 86400  # 1 day
+    # sync reads only sheets modified since last read according to Drive modifiedTime.
+    # Values computed by formulas like IMPORTRANGE change without it, disable for them
+    AUTOCOMPLETE_CHECK_MODIFIED = os.environ.get('AUTOCOMPLETE_CHECK_MODIFIED', 'true') == 'true'
+    # results younger than delay may still be appended by submission, so they wait
+    SHEET_RECONCILE_DELAY = 600  # seconds
+    SHEET_RECONCILE_PAGE_SIZE = 5000  # sheet rows and results read at once
+    SHEET_RECONCILE_BATCH_SIZE = 500  # rows appended at once
 
     ERROR_404_HELP = False
 
     # celery
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL')
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND')
+    # worker serves its own metrics, web app /metrics has only web process
+    CELERY_METRICS_PORT = int(os.environ.get('CELERY_METRICS_PORT', 9100))
     CELERY_ROUTES = {
         'ngfg.app.celery_tasks.example.*': {
             'queue': 'example_queue'
@@ -70,6 +129,50 @@ class Config:
         },
         'ngfg.app.celery_tasks.share_form.share_form_to_users': {
             'queue': 'share_form_to_users_queue'
+        },
+        'ngfg.app.celery_tasks.partitions.*': {
+            'queue': 'partitions_queue'
+        },
+        'ngfg.app.celery_tasks.archive.*': {
+            'queue': 'archive_queue'
+        },
+        'ngfg.app.celery_tasks.autocomplete.*': {
+            'queue': 'autocomplete_queue'
+        },
+        'ngfg.app.celery_tasks.reconciliation.*': {
+            'queue': 'reconciliation_queue'
+        },
+        'ngfg.app.celery_tasks.form_events.*': {
+            'queue': 'form_events_queue'
+        },
+        'ngfg.app.celery_tasks.form_results.*': {
+            'queue': 'form_results_queue'
+        }
+    }
+    CELERYBEAT_SCHEDULE = {
+        'create_form_results_partitions': {
+            'task': 'ngfg.app.celery_tasks.partitions.create_form_results_partitions',
+            'schedule': crontab(minute=0, hour=3)
+        },
+        'archive_inactive_forms': {
+            'task': 'ngfg.app.celery_tasks.archive.archive_inactive_forms',
+            'schedule': crontab(minute=0, hour=4)
+        },
+        'delete_inserted_submissions': {
+            'task': 'ngfg.app.celery_tasks.form_results.delete_inserted_submissions',
+            'schedule': crontab(minute=0, hour=5)
+        },
+        'sync_autocomplete_mirror': {
+            'task': 'ngfg.app.celery_tasks.autocomplete.sync_autocomplete_mirror',
+            'schedule': AUTOCOMPLETE_SYNC_INTERVAL
+        },
+        'reconcile_sheets': {
+            'task': 'ngfg.app.celery_tasks.reconciliation.reconcile_sheets',
+            'schedule': crontab(minute=30)
+        },
+        'emit_new_results': {
+            'task': 'ngfg.app.celery_tasks.form_events.emit_new_results',
+            'schedule': FORM_EVENTS_INTERVAL
         }
     }
 
@@ -84,3 +187,71 @@ class Config:
     MAIL_DEFAULT_SENDER = MAIL_USERNAME
 
     SESSION_COOKIE_HTTPONLY = False
+
+    # users allowed to see internal state, comma separated emails
+    ADMIN_EMAILS = {email.strip() for email in os.environ.get('ADMIN_EMAILS', '').split(',')
+                    if email.strip()}
+    # bearer token Prometheus scrapes /metrics and /db_pool with,
+    # without it they are available only to users from ADMIN_EMAILS
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+    # rate limiting of token-gated endpoints
+    # (tokens added per second, bucket capacity)
+    RATE_LIMIT_ENABLED = True
+    # one IP can be NAT of many users, so IP bucket is large
+    # and single client is limited by bucket of IP and token
+    RATE_LIMIT_IP = (20, 100)
+    RATE_LIMIT_IP_TOKEN = (5, 30)
+    RATE_LIMIT_TOKEN = (20, 50)
+    RATE_LIMIT_FORM = (50, 200)
+    # per process, below DB pool so requests don't wait for connections
+    # and a quarter of pool is left to endpoints without limit
+    MAX_CONCURRENT_REQUESTS = max(1, (DB_POOL_SIZE + DB_MAX_OVERFLOW) * 3 // 4)
+    CONCURRENCY_RETRY_AFTER = 1  # seconds
+
+    # batched ingestion of form results through Redis stream
+    FORM_RESULTS_BATCH_MODE = os.environ.get('FORM_RESULTS_BATCH_MODE') == 'true'
+    FORM_RESULTS_STREAM = 'form_results_stream'
+    FORM_RESULTS_BATCH_SIZE = 500
+    FORM_RESULTS_BATCH_BLOCK = 1000  # milliseconds
+    # ids of inserted submissions are kept while stream can return them again
+    FORM_RESULTS_SUBMISSION_KEEP_TIME = 86400  # 1 day
+    # wait of consumer after failed batch, doubled up to max while errors repeat
+    FORM_RESULTS_CONSUMER_BACKOFF = 1  # seconds
+    FORM_RESULTS_CONSUMER_BACKOFF_MAX = 60  # seconds
+
+    # new results pushed to socket rooms of forms
+    FORM_EVENTS_ENABLED = True
+    # notifications of user are coalesced and emitted once per window
+    NOTIFICATION_WINDOW = 2  # seconds
+
+    # google sheets backend: google or fake (in-memory, for offline tests and benchmarks)
+    SHEETS_BACKEND = os.environ.get('SHEETS_BACKEND', 'google')
+    SHEETS_CREDENTIALS_FILE = os.path.join(BASEDIR, 'app', 'ngfg-сredentials.json')
+    SHEETS_FAKE_LATENCY = float(os.environ.get('SHEETS_FAKE_LATENCY', 0))  # seconds
+    SHEETS_FAKE_ERROR_RATE = float(os.environ.get('SHEETS_FAKE_ERROR_RATE', 0))  # share of 429s
+    # connections of google backend used by concurrent greenlets
+    SHEETS_HTTP_POOL_SIZE = int(os.environ.get('SHEETS_HTTP_POOL_SIZE', 10))
+    # seconds to wait for free connection, web requests wait until SHEETS_REQUEST_DEADLINE
+    SHEETS_HTTP_POOL_TIMEOUT = 30
+    SHEETS_HTTP_TIMEOUT = 30  # seconds
+    # quotas of Sheets API shared by all processes through Redis buckets,
+    # requests per minute: Google counts them per minute for project and for user,
+    # all calls are made by one service account user.
+    # Buckets hold SHEETS_QUOTA_BURST tokens and refill with the rest of quota,
+    # so no 60 seconds window goes over it
+    SHEETS_QUOTA_ENABLED = True
+    SHEETS_QUOTAS = {
+        'read': {'project': 300, 'user': 60},
+        'write': {'project': 300, 'user': 60}
+    }
+    SHEETS_QUOTA_BURST = 1
+    SHEETS_QUOTA_MAX_WAIT = 60  # seconds
+    # web requests don't wait for quota and retries longer, they get 503 with Retry-After
+    SHEETS_REQUEST_DEADLINE = 5  # seconds
+    SHEETS_MAX_RETRIES = 5
+    SHEETS_BACKOFF_BASE = 0.5  # seconds
+    SHEETS_BACKOFF_MAX = 32  # seconds
+
+    # form_results is partitioned by month of created
+    FORM_RESULTS_PARTITIONS_AHEAD = 3  # months
@@ -0,0 +1,126 @@
+"""
+Database connection pool configuration
+"""
+
+from collections import Counter
+
+from flask import g, has_app_context
+from flask_sqlalchemy import SQLAlchemy, SignallingSession
+from gevent.socket import wait_read, wait_write
+from psycopg2 import extensions, OperationalError
+from sqlalchemy import event, orm
+from sqlalchemy.pool import Pool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+POOL_EVENTS = Counter()
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(SignallingSession):
+    """
+    Session that sends reads marked with read_only decorator to replica.
+    Writes, flushes and every query after a write within
+    the same request stay on primary
+    """
+
+    def __init__(self, db, **options):
+        # SignallingSession keeps only app, replica engine is taken from db
+        self.db = db  # pylint: disable=invalid-name
+        super().__init__(db, **options)
+
+    def get_bind(self, mapper=None, clause=None):
+        """
+        Choose engine for query
+        """
+        if not has_app_context():
+            return super().get_bind(mapper, clause)
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            g.db_written = True
+        elif (g.get('use_replica') and not g.get('db_written')
+              and REPLICA_BIND in (self.app.config['SQLALCHEMY_BINDS'] or {})):
+            return self.db.get_engine(self.app, bind=REPLICA_BIND)
+
+        return super().get_bind(mapper, clause)
+
+
+class RoutingSQLAlchemy(SQLAlchemy):
+    """
+    SQLAlchemy that uses RoutingSession
+    """
+
+    def create_session(self, options):
+        """
+        Create session factory of RoutingSession
+
+        :param options: session options
+        :return: sessionmaker
+        """
+        return orm.sessionmaker(class_=RoutingSession, db=self, **options)
+
+
+def gevent_wait_callback(conn, timeout=None):
+    """
+    psycopg2 wait callback that yields to gevent hub while
+    connection waits for socket, so queries don't block other greenlets
+
+    :param conn: psycopg2 connection
+    :param timeout: seconds to wait for socket
+    """
+    while True:
+        state = conn.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            wait_read(conn.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(conn.fileno(), timeout=timeout)
+        else:
+            raise OperationalError(f'Bad result from poll: {state}')
+
+
+def make_gevent_pool():
+    """
+    Make psycopg2 cooperative with gevent and start counting pool events
+    """
+    extensions.set_wait_callback(gevent_wait_callback)
+
+    for event_name in ('connect', 'checkout', 'checkin', 'invalidate'):
+        event.listen(Pool, event_name, _count_event(event_name))
+
+
+def _count_event(event_name):
+    """
+    Create pool event listener that counts events
+
+    :param event_name: pool event name
+    :return: listener
+    """
+    def listener(*args):  # pylint: disable=unused-argument
+        POOL_EVENTS[event_name] += 1
+    return listener
+
+
+def get_pool_status(engine):
+    """
+    Get connection pool usage
+
+    :param engine: SQLAlchemy engine
+    :return: dict
+    """
+    pool = engine.pool
+    status = {
+        'pool': type(pool).__name__,
+        'connects': POOL_EVENTS['connect'],
+        'checkouts': POOL_EVENTS['checkout'],
+        'checkins': POOL_EVENTS['checkin'],
+        'invalidations': POOL_EVENTS['invalidate']
+    }
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'checkedIn': pool.checkedin(),
+            'checkedOut': pool.checkedout(),
+            'overflow': pool.overflow()
+        })
+    return status
@@ -0,0 +1,161 @@
+"""
+Discovery documents of Google services, fetched on first use.
+Documents are cached in process and on disk, so processes don't fetch
+them at import and keep working with stale copy when Google is unreachable
+"""
+import functools
+import json
+import os
+import tempfile
+import time
+from collections.abc import Mapping
+
+import requests
+
+from .config import (
+    DISCOVERY_CACHE_DIR,
+    DISCOVERY_CACHE_TIME,
+    DISCOVERY_TIMEOUT,
+    DRIVE_DISCOVERY_URL,
+    GOOGLE_DISCOVERY_URL,
+    SHEETS_DISCOVERY_URL
+)
+
+
+class DiscoveryCache:
+    """
+    Discovery documents saved as json files in directory
+
+    :param directory: folder for cached documents
+    :param max_age: seconds document is used without refetching
+    :param timeout: seconds to wait for Google
+    """
+
+    def __init__(self, directory, max_age, timeout):
+        self.directory = directory
+        self.max_age = max_age
+        self.timeout = timeout
+
+    def get_path(self, name):
+        """
+        Get path of cached document
+
+        :param name: document name
+        :return: str
+        """
+        return os.path.join(self.directory, f'{name}.json')
+
+    def read(self, name, fresh=True):
+        """
+        Read cached document
+
+        :param name: document name
+        :param fresh: return only document younger than max_age
+        :return: dict or None
+        """
+        path = self.get_path(name)
+        try:
+            if fresh and time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path) as document_file:
+                return json.load(document_file)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, name, document):
+        """
+        Save document, file is replaced atomically
+        so concurrent processes never read half-written one
+
+        :param name: document name
+        :param document: dict
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        descriptor, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'w') as document_file:
+            json.dump(document, document_file)
+        os.replace(tmp_path, self.get_path(name))
+
+    def get(self, name, url):
+        """
+        Get document from cache or fetch it.
+        Stale cached copy is used if fetch fails
+
+        :param name: document name
+        :param url: discovery url
+        :return: dict
+        """
+        document = self.read(name)
+        if document is not None:
+            return document
+
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            document = response.json()
+        except (requests.RequestException, ValueError):
+            document = self.read(name, fresh=False)
+            if document is None:
+                raise
+            return document
+
+        try:
+            self.write(name, document)
+        except OSError:
+            pass  # read-only disk shouldn't break startup, document is memoized anyway
+        return document
+
+
+DISCOVERY_CACHE = DiscoveryCache(DISCOVERY_CACHE_DIR, DISCOVERY_CACHE_TIME, DISCOVERY_TIMEOUT)
+
+
+@functools.lru_cache(maxsize=None)
+def get_google_provider_config():
+    """
+    Get Google OpenID provider configuration
+
+    :return: dict
+    """
+    return DISCOVERY_CACHE.get('google_openid', GOOGLE_DISCOVERY_URL)
+
+
+@functools.lru_cache(maxsize=None)
+def get_sheets_discovery():
+    """
+    Get Sheets API v4 discovery document
+
+    :return: dict
+    """
+    return DISCOVERY_CACHE.get('sheets_v4', SHEETS_DISCOVERY_URL)
+
+
+@functools.lru_cache(maxsize=None)
+def get_drive_discovery():
+    """
+    Get Drive API v3 discovery document
+
+    :return: dict
+    """
+    return DISCOVERY_CACHE.get('drive_v3', DRIVE_DISCOVERY_URL)
+
+
+class GoogleOAuthConfig(Mapping):
+    """
+    Settings of OAuth remote app read by flask-oauthlib with app_key.
+    Provider configuration is fetched on first login, not at import
+    """
+
+    ENDPOINTS = {
+        'base_url': 'issuer',
+        'authorize_url': 'authorization_endpoint',
+        'access_token_url': 'token_endpoint'
+    }
+
+    def __getitem__(self, key):
+        return get_google_provider_config()[self.ENDPOINTS[key]]
+
+    def __iter__(self):
+        return iter(self.ENDPOINTS)
+
+    def __len__(self):
+        return len(self.ENDPOINTS)
@@ -10,3 +10,9 @@ MAX_POSTGRES_INT = 2147483647
 JWT_ALGORITHM = 'HS256'
 URL_DOMAIN = 'localhost:3000'
 LEEWAY_TIME = 30 # seconds
+LIBRARY_PER_PAGE = 50
+MAX_LIBRARY_PER_PAGE = 200
+SEARCH_KINDS = ('field', 'form', 'question')
+SEARCH_TEXT_CONFIG = 'simple'
+SEARCH_PER_PAGE = 20
+MAX_SEARCH_PER_PAGE = 100
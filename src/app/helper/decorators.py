@@ -3,6 +3,7 @@ Project decorators
 """
 
 import functools
+from flask import g, has_app_context
 from sqlalchemy.exc import (
     IntegrityError,
     ProgrammingError,
@@ -44,3 +45,32 @@ def transaction_decorator(func):
         DB.session.rollback()
         return None
     return wrapper
+
+
+def read_only(func):
+    """
+    Send queries of function to read replica.
+    Function called inside transaction keeps using primary.
+    Results read inside it aren't cached by RedisManager.set, so don't decorate
+    methods whose cache must be fresh, e.g. checks before insert
+
+    :param func: function to decorate
+    :return: function wrapper
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """
+        Function decorator
+
+        :param *args: args
+        :param **kwargs: kwargs
+        """
+        if not has_app_context() or DB.session().transaction is not None or g.get('use_replica'):
+            return func(*args, **kwargs)
+
+        g.use_replica = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            g.use_replica = False
+    return wrapper
@@ -0,0 +1,76 @@
+"""
+Form events module
+"""
+
+from app import APP, LOGGER, REDIS, SOCKETIO
+
+NEW_RESULTS_KEY = 'form_events:new_results'
+
+
+class FormEvents:
+    """
+    Class to push new results of form to sockets of form owner,
+    so dashboards don't have to poll all answers.
+    Results are emitted to form room right away, counts of new results
+    are coalesced in Redis and emitted periodically
+    """
+
+    @staticmethod
+    def get_room(form_id):
+        """
+        Get socket room of form
+
+        :param form_id:
+        :return: str
+        """
+        return f'form:{form_id}'
+
+    @staticmethod
+    def publish_results(form_id, results):
+        """
+        Emit created results to form room and add them to new results count.
+        Results are saved already, so failed publishing is only logged
+
+        :param form_id:
+        :param results: list of FormResult json
+        """
+        if not APP.config['FORM_EVENTS_ENABLED'] or not results:
+            return
+        try:
+            SOCKETIO.emit(
+                'form_results',
+                {'formId': form_id, 'results': results},
+                room=FormEvents.get_room(form_id)
+            )
+            REDIS.hincrby(NEW_RESULTS_KEY, form_id, len(results))
+        except Exception as ex:  # pylint: disable=broad-except
+            LOGGER.warning('Cannot publish results of form %s: %s', form_id, ex)
+
+    @staticmethod
+    def pop_new_results():
+        """
+        Get and reset counts of results created since previous call
+
+        :return: dict {form_id: amount of new results}
+        """
+        pipeline = REDIS.pipeline()
+        pipeline.hgetall(NEW_RESULTS_KEY)
+        pipeline.delete(NEW_RESULTS_KEY)
+        counts, _ = pipeline.execute()
+        return {int(form_id): int(count) for form_id, count in counts.items()}
+
+    @staticmethod
+    def emit_new_results():
+        """
+        Emit one count of new results to room of every form that got results
+
+        :return: dict {form_id: amount of new results}
+        """
+        counts = FormEvents.pop_new_results()
+        for form_id, count in counts.items():
+            SOCKETIO.emit(
+                'form_results_count',
+                {'formId': form_id, 'newResults': count},
+                room=FormEvents.get_room(form_id)
+            )
+        return counts
@@ -0,0 +1,126 @@
+"""
+Form result stream module
+"""
+
+import os
+import pickle
+import socket
+import uuid
+
+from redis.exceptions import ResponseError
+
+from app import APP, REDIS
+from app.helper.redis_manager import RedisManager
+
+CONSUMER_GROUP = 'form_results_consumers'
+
+
+class FormResultStream:
+    """
+    Class to queue validated submissions in Redis stream,
+    so they can be inserted in micro-batches
+    """
+
+    @staticmethod
+    def publish(submission):
+        """
+        Add submission to stream and mark it as pending
+
+        :param submission: dict with user_id, token_id, answers, sheet_id, values
+        :return: submission id
+        """
+        submission_id = uuid.uuid4().hex
+        submission = dict(submission, submission_id=submission_id)
+        FormResultStream.set_status(submission_id, submission['token'], 'pending')
+        REDIS.xadd(APP.config['FORM_RESULTS_STREAM'], {'data': pickle.dumps(submission)})
+        return submission_id
+
+    @staticmethod
+    def read(count, block):
+        """
+        Read submissions of this consumer.
+        Not acknowledged submissions (e.g. after crash) are read first
+
+        :param count: max amount of submissions
+        :param block: milliseconds to wait for new submissions
+        :return: list of (message_id, submission)
+        """
+        stream = APP.config['FORM_RESULTS_STREAM']
+        FormResultStream.create_group()
+
+        consumer = FormResultStream.consumer_name()
+        messages = REDIS.xreadgroup(CONSUMER_GROUP, consumer, {stream: '0'}, count=count)
+        if not messages or not messages[0][1]:
+            messages = REDIS.xreadgroup(
+                CONSUMER_GROUP,
+                consumer,
+                {stream: '>'},
+                count=count,
+                block=block
+            )
+
+        result = []
+        for _, stream_messages in messages or []:
+            for message_id, fields in stream_messages:
+                result.append((message_id, pickle.loads(fields[b'data'])))
+        return result
+
+    @staticmethod
+    def ack(message_ids):
+        """
+        Acknowledge and delete processed submissions
+
+        :param message_ids: list of stream message ids
+        """
+        if message_ids:
+            stream = APP.config['FORM_RESULTS_STREAM']
+            REDIS.xack(stream, CONSUMER_GROUP, *message_ids)
+            REDIS.xdel(stream, *message_ids)
+
+    @staticmethod
+    def create_group():
+        """
+        Create consumer group and stream if they don't exist
+        """
+        try:
+            REDIS.xgroup_create(APP.config['FORM_RESULTS_STREAM'], CONSUMER_GROUP, mkstream=True)
+        except ResponseError as error:
+            if 'BUSYGROUP' not in str(error):
+                raise
+
+    @staticmethod
+    def consumer_name():
+        """
+        Get name of this consumer
+
+        :return: str
+        """
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    @staticmethod
+    def set_status(submission_id, token, status, result=None, errors=None):
+        """
+        Save submission status
+
+        :param submission_id:
+        :param token: token submission was sent with
+        :param status: 'pending', 'created' or 'failed'
+        :param result: created FormResult json
+        :param errors: why submission failed
+        """
+        RedisManager.set(f'form_result_submission:{submission_id}', {
+            'token': token,
+            'status': status,
+            'result': result,
+            'errors': errors
+        })
+
+    @staticmethod
+    def get_status(submission_id):
+        """
+        Get submission status
+
+        :param submission_id:
+        :return: dict or None
+        """
+        return RedisManager.get(f'form_result_submission:{submission_id}', 'data')
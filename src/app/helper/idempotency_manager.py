@@ -0,0 +1,125 @@
+"""
+Idempotency manager module
+"""
+
+import pickle
+import uuid
+
+from werkzeug.exceptions import Conflict
+
+from app import REDIS
+from app.config import IDEMPOTENCY_EXPIRE_TIME, IDEMPOTENCY_LOCK_TIME
+
+# delete lock only if it still holds value of request that acquired it
+RELEASE_SCRIPT = REDIS.register_script("""
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+
+class IdempotencyManager:
+    """
+    Class to store first responses of requests sent with Idempotency-Key
+    header, so retries can be replayed instead of processed again
+    """
+
+    @staticmethod
+    def generate_key(scope, idempotency_key):
+        """
+        Generate Redis key for record
+
+        :param scope: str | what key belongs to, e.g. token
+        :param idempotency_key: client-supplied key
+        :return: generated string
+        """
+        return f'idempotency:{scope}:{idempotency_key}'
+
+    @staticmethod
+    def get(scope, idempotency_key):
+        """
+        Get stored record
+
+        :param scope:
+        :param idempotency_key:
+        :return: record or None
+        """
+        record = REDIS.get(IdempotencyManager.generate_key(scope, idempotency_key))
+        if record is not None:
+            record = pickle.loads(record)
+        return record
+
+    @staticmethod
+    def save(scope, idempotency_key, record):
+        """
+        Save record
+
+        :param scope:
+        :param idempotency_key:
+        :param record: anything picklable
+        :return:
+        """
+        REDIS.set(
+            IdempotencyManager.generate_key(scope, idempotency_key),
+            pickle.dumps(record),
+            ex=IDEMPOTENCY_EXPIRE_TIME
+        )
+
+    @staticmethod
+    def acquire(scope, idempotency_key):
+        """
+        Lock key while first request is processed
+
+        :param scope:
+        :param idempotency_key:
+        :return: lock value to release lock with or None if key is already processed
+        """
+        key = IdempotencyManager.generate_key(scope, idempotency_key)
+        lock = uuid.uuid4().hex
+        if REDIS.set(f'{key}:lock', lock, nx=True, ex=IDEMPOTENCY_LOCK_TIME):
+            return lock
+        return None
+
+    @staticmethod
+    def release(scope, idempotency_key, lock):
+        """
+        Release lock of key if it's still held by the same request,
+        lock expired in the middle of request may be held by other one
+
+        :param scope:
+        :param idempotency_key:
+        :param lock: value returned by acquire
+        :return:
+        """
+        key = IdempotencyManager.generate_key(scope, idempotency_key)
+        RELEASE_SCRIPT(keys=[f'{key}:lock'], args=[lock])
+
+    @staticmethod
+    def run(scope, idempotency_key, process, replay):
+        """
+        Process request only once per key. Stored record of processed request
+        is replayed, otherwise request is processed holding lock of key
+
+        :param scope:
+        :param idempotency_key:
+        :param process: function without arguments processing request
+        :param replay: function replaying response from stored record
+        :return: result of process or replay
+        :raise Conflict: if request with the same key is in progress
+        """
+        record = IdempotencyManager.get(scope, idempotency_key)
+        if record is not None:
+            return replay(record)
+
+        lock = IdempotencyManager.acquire(scope, idempotency_key)
+        if lock is None:
+            raise Conflict('Request with this Idempotency-Key is in progress')
+        try:
+            # first request could save record and release lock after get above
+            record = IdempotencyManager.get(scope, idempotency_key)
+            if record is not None:
+                return replay(record)
+            return process()
+        finally:
+            IdempotencyManager.release(scope, idempotency_key, lock)
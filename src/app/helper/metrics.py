@@ -0,0 +1,290 @@
+"""
+Prometheus metrics module
+"""
+
+import functools
+import os
+import time
+
+from celery.signals import task_prerun, task_postrun, worker_process_shutdown, worker_ready
+from flask import g, request
+from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess, \
+    start_http_server
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import APP, CELERY, DB, LOGGER
+from app.db_config import get_pool_status
+
+REQUEST_LATENCY = Histogram(
+    'ngfg_request_duration_seconds',
+    'Request latency',
+    ['method', 'endpoint', 'status']
+)
+REDIS_OPERATIONS = Counter(
+    'ngfg_redis_operations_total',
+    'Redis operations, result is hit or miss for reads',
+    ['namespace', 'operation', 'result']
+)
+REDIS_LATENCY = Histogram(
+    'ngfg_redis_duration_seconds',
+    'Redis operation latency',
+    ['namespace', 'operation'],
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1)
+)
+DB_QUERIES = Counter(
+    'ngfg_db_queries_total',
+    'SQL statements executed',
+    ['statement']
+)
+SHEETS_LATENCY = Histogram(
+    'ngfg_sheets_duration_seconds',
+    'Google Sheets API call latency',
+    ['method']
+)
+SHEETS_ERRORS = Counter(
+    'ngfg_sheets_errors_total',
+    'Google Sheets API errors',
+    ['method', 'status']
+)
+SHEETS_BACKOFFS = Counter(
+    'ngfg_sheets_backoffs_total',
+    'Google Sheets API calls delayed because of quota',
+    ['method']
+)
+CELERY_TASK_DURATION = Histogram(
+    'ngfg_celery_task_duration_seconds',
+    'Celery task duration',
+    ['queue', 'task'],
+    buckets=(.01, .05, .1, .5, 1, 2.5, 5, 10, 30, 60, 300)
+)
+
+
+class Metrics:
+    """
+    Class to record metrics which need more than one call of prometheus client
+    """
+
+    @staticmethod
+    def get_namespace(name):
+        """
+        Get namespace of Redis key, e.g. form_results for form_results:token_id:1.
+        Keys without namespace (e.g. cached tokens) are counted as other,
+        so their values don't become label values
+
+        :param name: Redis key
+        :return: str
+        """
+        name = str(name)
+        if ':' not in name:
+            return 'other'
+        return name.split(':', 1)[0]
+
+    @staticmethod
+    def start_request():
+        """
+        Remember request start time
+        """
+        g.metrics_start = time.perf_counter()
+
+    @staticmethod
+    def finish_request(response):
+        """
+        Observe request latency
+
+        :param response: flask response
+        :return: response
+        """
+        start = g.get('metrics_start')
+        if start is not None:
+            endpoint = request.url_rule.rule if request.url_rule else 'unknown'
+            REQUEST_LATENCY.labels(
+                request.method, endpoint, response.status_code
+            ).observe(time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def sheets_error(method, error):
+        """
+        Count failed Sheets API call
+
+        :param method: SheetManager method name
+        :param error: googleapiclient HttpError
+        """
+        status = getattr(getattr(error, 'resp', None), 'status', 'unknown')
+        SHEETS_ERRORS.labels(method, status).inc()
+
+    @staticmethod
+    def get_queues():
+        """
+        Get celery queues from CELERY_ROUTES
+
+        :return: set of queue names
+        """
+        return {route['queue'] for route in APP.config['CELERY_ROUTES'].values()}
+
+
+def redis_metric(operation):
+    """
+    Count Redis operation and observe its latency by key namespace.
+    First argument of decorated function must be Redis key
+
+    :param operation: operation name
+    :return: decorator
+    """
+    def decorator(func):
+        """
+        Metric decorator
+
+        :param func: function to decorate
+        :return: function wrapper
+        """
+        @functools.wraps(func)
+        def wrapper(name, *args, **kwargs):
+            """
+            Function decorator
+
+            :param name: Redis key
+            :param *args: args
+            :param **kwargs: kwargs
+            """
+            namespace = Metrics.get_namespace(name)
+            start = time.perf_counter()
+            result = func(name, *args, **kwargs)
+            REDIS_LATENCY.labels(namespace, operation).observe(time.perf_counter() - start)
+
+            if operation == 'get':
+                REDIS_OPERATIONS.labels(namespace, operation,
+                                        'miss' if result is None else 'hit').inc()
+            else:
+                REDIS_OPERATIONS.labels(namespace, operation, 'ok').inc()
+            return result
+        return wrapper
+    return decorator
+
+
+def sheets_metric(func):
+    """
+    Observe latency of Sheets API call
+
+    :param func: function to decorate
+    :return: function wrapper
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """
+        Function decorator
+
+        :param *args: args
+        :param **kwargs: kwargs
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            SHEETS_LATENCY.labels(func.__name__).observe(time.perf_counter() - start)
+    return wrapper
+
+
+class StateCollector:
+    """
+    Collector of values read at scrape time: DB pool usage and celery queue depth
+    """
+
+    def describe(self):  # pylint: disable=no-self-use
+        """
+        Describe metrics without collecting them, otherwise registry
+        calls collect on register and connects to broker at import
+
+        :return: empty list
+        """
+        return []
+
+    def collect(self):  # pylint: disable=no-self-use
+        """
+        Collect metrics
+
+        :return: generator of metric families
+        """
+        pool = GaugeMetricFamily('ngfg_db_pool_connections', 'DB pool connections',
+                                 labels=['state'])
+        status = get_pool_status(DB.engine)
+        for state in ('size', 'checkedIn', 'checkedOut', 'overflow'):
+            if state in status:
+                pool.add_metric([state], status[state])
+        yield pool
+
+        depth = GaugeMetricFamily('ngfg_celery_queue_depth', 'Messages waiting in celery queue',
+                                  labels=['queue'])
+        try:
+            with CELERY.connection_or_acquire() as connection:
+                channel = connection.default_channel
+                for queue in sorted(Metrics.get_queues()):
+                    declared = channel.queue_declare(queue=queue, passive=True)
+                    depth.add_metric([queue], declared.message_count)
+        except Exception as ex:  # pylint: disable=broad-except
+            # missing queue or unavailable broker shouldn't break whole scrape
+            LOGGER.warning('Cannot get celery queue depth: %s', ex)
+        yield depth
+
+
+def count_query(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=too-many-arguments, unused-argument
+    """
+    Count executed SQL statement by its type
+    """
+    DB_QUERIES.labels(statement.lstrip().split(' ', 1)[0].upper()).inc()
+
+
+@task_prerun.connect
+def task_started(task_id, task, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remember celery task start time
+    """
+    task.metrics_start = time.perf_counter()
+
+
+@task_postrun.connect
+def task_finished(task_id, task, **kwargs):  # pylint: disable=unused-argument
+    """
+    Observe celery task duration
+    """
+    start = getattr(task, 'metrics_start', None)
+    if start is None:
+        return
+    queue = (task.request.delivery_info or {}).get('routing_key') or 'unknown'
+    CELERY_TASK_DURATION.labels(queue, task.name).observe(time.perf_counter() - start)
+
+
+@worker_ready.connect
+def start_worker_metrics(**kwargs):  # pylint: disable=unused-argument
+    """
+    Serve metrics of celery worker on its own port, tasks don't run in web app process.
+    Prefork children write metrics to prometheus_multiproc_dir if it is set
+    """
+    registry = REGISTRY
+    if 'prometheus_multiproc_dir' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(APP.config['CELERY_METRICS_PORT'], registry=registry)
+
+
+@worker_process_shutdown.connect
+def worker_process_stopped(pid, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove live metrics of stopped prefork child
+    """
+    if 'prometheus_multiproc_dir' in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+def init_metrics(app):
+    """
+    Register request hooks, query listener and state collector
+
+    :param app: Flask object (flask application)
+    """
+    app.before_request(Metrics.start_request)
+    app.after_request(Metrics.finish_request)
+    event.listen(Engine, 'after_cursor_execute', count_query)
+    REGISTRY.register(StateCollector())
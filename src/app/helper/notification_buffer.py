@@ -0,0 +1,69 @@
+"""
+Notification buffer module
+"""
+
+import time
+
+from app import APP, REDIS
+
+
+class NotificationBuffer:
+    """
+    Class to coalesce notifications of socket room in Redis.
+    Messages added within NOTIFICATION_WINDOW are deduplicated
+    and emitted in one batch by whichever node flushes the room
+    """
+
+    @staticmethod
+    def get_key(room):
+        """
+        Get key of buffered messages of room
+
+        :param room: socket room, user email
+        :return: str
+        """
+        return f'notifications:{room}'
+
+    @staticmethod
+    def get_window_key(room):
+        """
+        Get key that exists while window of room is open
+
+        :param room: socket room, user email
+        :return: str
+        """
+        return f'notifications_window:{room}'
+
+    @staticmethod
+    def add(room, message):
+        """
+        Buffer message, the same message buffered twice is kept once
+
+        :param room: socket room, user email
+        :param message: str
+        :return: True if message opened new window, so room has to be flushed after it
+        """
+        window = APP.config['NOTIFICATION_WINDOW']
+        key = NotificationBuffer.get_key(room)
+        pipeline = REDIS.pipeline()
+        # buffer has no expiry: if flush is lost, next message after window reopens
+        # it and schedules flush of everything buffered, nothing is dropped
+        pipeline.zadd(key, {message: time.time()}, nx=True)
+        pipeline.set(NotificationBuffer.get_window_key(room), 1, nx=True, ex=window)
+        return bool(pipeline.execute()[-1])
+
+    @staticmethod
+    def pop(room):
+        """
+        Get buffered messages in order they were added and close window
+
+        :param room: socket room, user email
+        :return: list of str
+        """
+        key = NotificationBuffer.get_key(room)
+        pipeline = REDIS.pipeline()
+        pipeline.zrange(key, 0, -1)
+        pipeline.delete(key, NotificationBuffer.get_window_key(room))
+        messages, _ = pipeline.execute()
+        return [message.decode() if isinstance(message, bytes) else message
+                for message in messages]
@@ -0,0 +1,99 @@
+"""
+Partition manager module
+"""
+
+from datetime import date
+
+from app import DB
+from app.helper.decorators import transaction_decorator
+
+
+class PartitionManager:
+    """
+    Class to manage monthly range partitions of tables partitioned by created
+    """
+
+    @staticmethod
+    def month_start(day, months=0):
+        """
+        Get first day of month shifted by given amount of months
+
+        :param day: date inside of month
+        :param months: int | amount of months to shift
+        :return: date
+        """
+        month_index = day.year * 12 + day.month - 1 + months
+        return date(month_index // 12, month_index % 12 + 1, 1)
+
+    @staticmethod
+    def partition_name(table, month):
+        """
+        Generate partition name, e.g. form_results_y2020m04
+
+        :param table: partitioned table name
+        :param month: first day of month
+        :return: generated string
+        """
+        return f'{table}_y{month.year}m{month.month:02d}'
+
+    @staticmethod
+    def partition_exists(name):
+        """
+        Check whether table exists
+
+        :param name: table name
+        :return: bool
+        """
+        return DB.session.execute('SELECT to_regclass(:name)', {'name': name}).scalar() is not None
+
+    @staticmethod
+    def create_partition(table, month):
+        """
+        Create partition of table for one month if it doesn't exist.
+        Rows of the month already inserted into default partition are moved to new one,
+        PostgreSQL refuses to create partition while default one has rows of its range
+
+        :param table: partitioned table name
+        :param month: first day of month
+        :return: partition name
+        """
+        name = PartitionManager.partition_name(table, month)
+        if PartitionManager.partition_exists(name):
+            return name
+
+        start = month.isoformat()
+        end = PartitionManager.month_start(month, 1).isoformat()
+        create = (f'CREATE TABLE {name} PARTITION OF {table} '
+                  f"FOR VALUES FROM ('{start}') TO ('{end}')")
+        default = f'{table}_default'
+        condition = f"created >= '{start}' AND created < '{end}'"
+        has_rows = PartitionManager.partition_exists(default) and DB.session.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {default} WHERE {condition})'
+        ).scalar()
+        if not has_rows:
+            DB.session.execute(create)
+            return name
+
+        DB.session.execute(f'ALTER TABLE {table} DETACH PARTITION {default}')
+        DB.session.execute(create)
+        DB.session.execute(f'INSERT INTO {name} SELECT * FROM {default} WHERE {condition}')
+        DB.session.execute(f'DELETE FROM {default} WHERE {condition}')
+        DB.session.execute(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT')
+        return name
+
+    @staticmethod
+    @transaction_decorator
+    def create_partitions(table, months_ahead, today=None):
+        """
+        Create partitions for current month and months ahead
+
+        :param table: partitioned table name
+        :param months_ahead: int | amount of future months to create
+        :param today: date to count months from, current date by default
+        :return: list of partition names or None if partitions can't be created
+        """
+        today = today or date.today()
+        return [
+            PartitionManager.create_partition(table, PartitionManager.month_start(today, months))
+            for months in range(months_ahead + 1)
+        ]
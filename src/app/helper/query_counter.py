@@ -0,0 +1,140 @@
+"""
+Query counter module
+"""
+
+import functools
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import APP, LOGGER
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when function executes more SQL statements than allowed
+    """
+
+
+class QueryCounter:
+    """
+    Context manager that collects SQL statements executed inside it
+
+    with QueryCounter() as counter:
+        FieldService.get_shared_fields(user_id=1)
+    assert counter.count <= 1
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(Engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *args):
+        event.remove(Engine, 'before_cursor_execute', self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):  # pylint: disable=too-many-arguments, unused-argument
+        """
+        Save executed statement
+        """
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        """
+        Amount of executed statements
+        """
+        return len(self.statements)
+
+    def repeated(self, threshold=2):
+        """
+        Get statements executed at least threshold times, usually N+1 queries
+
+        :param threshold: int
+        :return: dict {statement: times}
+        """
+        return {statement: times
+                for statement, times in Counter(self.statements).items()
+                if times >= threshold}
+
+
+def query_budget(max_queries):
+    """
+    Fail if decorated function executes more than max_queries SQL statements
+
+    :param max_queries: int | allowed amount of statements
+    :return: decorator
+    """
+    def decorator(func):
+        """
+        Budget decorator
+
+        :param func: function to decorate
+        :return: function wrapper
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Function decorator
+
+            :param *args: args
+            :param **kwargs: kwargs
+            """
+            with QueryCounter() as counter:
+                result = func(*args, **kwargs)
+            if counter.count > max_queries:
+                raise QueryBudgetExceeded(
+                    f'{func.__name__} executed {counter.count} queries, '
+                    f'budget is {max_queries}:\n' + '\n'.join(counter.statements)
+                )
+            return result
+        return wrapper
+    return decorator
+
+
+def record_request_query(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=too-many-arguments, unused-argument
+    """
+    Save statement executed while handling request
+    """
+    if has_request_context() and g.get('query_statements') is not None:
+        g.query_statements.append(statement)
+
+
+def start_request_queries():
+    """
+    Start collecting statements of request
+    """
+    g.query_statements = []
+
+
+def log_repeated_queries(response):
+    """
+    Log statements repeated within request at least QUERY_REPEAT_THRESHOLD times
+
+    :param response: flask response
+    :return: response
+    """
+    statements = g.get('query_statements') or []
+    for statement, times in Counter(statements).items():
+        if times >= APP.config['QUERY_REPEAT_THRESHOLD']:
+            LOGGER.warning('Possible N+1: %s %s executed %s times: %s',
+                           request.method, request.path, times, statement)
+    return response
+
+
+def init_query_logging(app):
+    """
+    Log repeated statements of every request in dev mode
+
+    :param app: Flask object (flask application)
+    """
+    if not app.config['QUERY_LOGGING']:
+        return
+
+    app.before_request(start_request_queries)
+    app.after_request(log_repeated_queries)
+    event.listen(Engine, 'before_cursor_execute', record_request_query)
@@ -0,0 +1,142 @@
+"""
+Rate limiter module
+"""
+
+import functools
+import math
+import threading
+import time
+
+from flask import request
+from redis import RedisError
+from werkzeug.exceptions import TooManyRequests
+
+from app import APP, LOGGER, REDIS
+
+# Token bucket refilled with `rate` tokens per second up to `capacity`.
+# Returns 0 if request is allowed, else seconds to wait for the next token
+TOKEN_BUCKET_SCRIPT = REDIS.register_script("""
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'timestamp')
+local tokens = tonumber(bucket[1]) or capacity
+local timestamp = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - timestamp) * rate)
+local retry_after = 0
+if tokens < 1 then
+    retry_after = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'timestamp', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+""")
+
+CONCURRENCY_SEMAPHORE = threading.BoundedSemaphore(APP.config['MAX_CONCURRENT_REQUESTS'])
+
+
+class RateLimitExceeded(TooManyRequests):
+    """
+    429 error with Retry-After header
+    """
+
+    def __init__(self, retry_after, description=None):
+        super().__init__(description=description)
+        self.retry_after = retry_after
+
+    def get_headers(self, environ=None):
+        """
+        Add Retry-After header to response headers
+        """
+        headers = super().get_headers(environ)
+        headers.append(('Retry-After', str(self.retry_after)))
+        return headers
+
+
+class RateLimiter:
+    """
+    Class to limit requests rate with token buckets stored in Redis,
+    so limits are shared by all processes
+    """
+
+    @staticmethod
+    def consume(name, rate, capacity):
+        """
+        Take one token from bucket
+
+        :param name: bucket name
+        :param rate: tokens added per second
+        :param capacity: max amount of tokens in bucket
+        :return: 0 if allowed, else seconds to wait
+        """
+        retry_after = TOKEN_BUCKET_SCRIPT(
+            keys=[f'rate_limit:{name}'],
+            args=[rate, capacity, time.time()]
+        )
+        return float(retry_after)
+
+    @staticmethod
+    def check(**scopes):
+        """
+        Take one token from bucket of every given scope.
+        Scope limit is taken from RATE_LIMIT_<SCOPE> config.
+        If Redis is unavailable request is allowed, limiting is only protection
+
+        :param scopes: scope name and value, e.g. token='...', form_id=1
+        :raise RateLimitExceeded: if any bucket is empty
+        """
+        if not APP.config['RATE_LIMIT_ENABLED']:
+            return
+
+        for scope, value in scopes.items():
+            limit_name = scope.replace('_id', '').upper()
+            rate, capacity = APP.config[f'RATE_LIMIT_{limit_name}']
+            try:
+                retry_after = RateLimiter.consume(f'{scope}:{value}', rate, capacity)
+            except RedisError as error:
+                LOGGER.warning('Rate limit is not checked: %s', error)
+                return
+            if retry_after:
+                raise RateLimitExceeded(
+                    retry_after=math.ceil(retry_after),
+                    description=f'Too many requests per {scope}, try again later'
+                )
+
+
+def rate_limit(func):
+    """
+    Limit requests per IP, per IP and token and per token (if method has token argument)
+    and amount of such requests processed at the same time
+
+    :param func: function to decorate
+    :return: function wrapper
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """
+        Function decorator
+
+        :param *args: args
+        :param **kwargs: kwargs
+        """
+        if not APP.config['RATE_LIMIT_ENABLED']:
+            return func(*args, **kwargs)
+
+        scopes = {'ip': request.remote_addr}
+        if kwargs.get('token') is not None:
+            scopes['ip_token'] = f"{request.remote_addr}:{kwargs['token']}"
+            scopes['token'] = kwargs['token']
+        RateLimiter.check(**scopes)
+
+        if not CONCURRENCY_SEMAPHORE.acquire(blocking=False):
+            raise RateLimitExceeded(
+                retry_after=APP.config['CONCURRENCY_RETRY_AFTER'],
+                description='Server is busy, try again later'
+            )
+        try:
+            return func(*args, **kwargs)
+        finally:
+            CONCURRENCY_SEMAPHORE.release()
+    return wrapper
@@ -3,8 +3,13 @@ Redis manager module
 """
 
 import pickle
+
+from flask import g, has_app_context
+
 from app import REDIS
 from app.config import REDIS_EXPIRE_TIME
+from app.helper.metrics import redis_metric
+from app.helper.timing import timed
 
 
 class RedisManager:
@@ -13,6 +18,8 @@ class RedisManager:
     """
 
     @staticmethod
+    @timed('redis')
+    @redis_metric('get')
     def get(name, key):
         """
         Get object from Redis by name and key
@@ -27,18 +34,27 @@ class RedisManager:
         return result
 
     @staticmethod
-    def set(name, instance):
+    @timed('redis')
+    @redis_metric('set')
+    def set(name, instance, expire_time=REDIS_EXPIRE_TIME):
         """
-        Save object to Redis by name
+        Save object to Redis by name.
+        Objects read from lagging replica aren't saved,
+        they would stay cached after primary changed and cache was cleared
 
         :param name:
         :param instance:
+        :param expire_time: seconds to keep object
         :return:
         """
+        if has_app_context() and g.get('use_replica'):
+            return
         REDIS.hset(name, 'data', pickle.dumps(instance))
-        REDIS.expire(name, REDIS_EXPIRE_TIME)
+        REDIS.expire(name, expire_time)
 
     @staticmethod
+    @timed('redis')
+    @redis_metric('delete')
     def delete(name):
         """
         Delete object from Redis by name
@@ -48,6 +64,34 @@ class RedisManager:
         """
         return REDIS.delete(name)
 
+    @staticmethod
+    @timed('redis')
+    @redis_metric('add_to_index')
+    def add_to_index(name, *values):
+        """
+        Add values to Redis set by name
+
+        :param name:
+        :param values:
+        :return:
+        """
+        REDIS.sadd(name, *values)
+        REDIS.expire(name, REDIS_EXPIRE_TIME)
+
+    @staticmethod
+    @timed('redis')
+    @redis_metric('pop_index')
+    def pop_index(name):
+        """
+        Get all values of Redis set by name and delete it
+
+        :param name:
+        :return: list of values
+        """
+        values = REDIS.smembers(name)
+        REDIS.delete(name)
+        return [value.decode('utf-8') for value in values]
+
     @staticmethod
     def generate_key(basic_name, hash_dict):
         """
@@ -3,36 +3,32 @@ Google Sheet manager
 """
 from urllib.parse import urlparse
 
-import apiclient.discovery  # pylint: disable=import-error
 import googleapiclient
-import httplib2
+from gevent.pool import Pool
 
-from oauth2client.service_account import ServiceAccountCredentials
-
-from app import SHEET_LOGGER
+from app import APP, SHEET_LOGGER
+from app.helper.metrics import Metrics, sheets_metric
+from app.helper.sheets_backend import SheetsService
+from app.helper.sheets_quota import SheetsQuota
+from app.helper.timing import timed
 
 
 class SheetManager():
     """
     Google sheet manager.
     Can get data from the sheet, append data to the sheet and pretty print data.
+    Sheets backend is chosen by SHEETS_BACKEND config
 
     IMPORTANT:
     User must share google sheet with ngfg-account@ngfg-268019.iam.gserviceaccount.com
     Or give editing access url
 
     """
-    credentials_file = 'app/ngfg-сredentials.json'
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(
-        credentials_file,
-        [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'])
-
-    httpAuth = credentials.authorize(httplib2.Http())
-    service = apiclient.discovery.build('sheets', 'v4', http=httpAuth)
+    service = SheetsService()
 
     @staticmethod
+    @timed('sheets')
+    @sheets_metric
     def get_data_with_range(spreadsheet_id, from_row, to_row):
         """
         Get data from google sheet by sheet id with range
@@ -46,11 +42,12 @@ class SheetManager():
         """
         try:
             ranges = f'{from_row}:{to_row}'
-            values = SheetManager.service.spreadsheets().values().get(  # pylint: disable=no-member
+            request = SheetManager.service.spreadsheets().values().get(  # pylint: disable=no-member
                 spreadsheetId=spreadsheet_id,
                 range=ranges,
                 majorDimension='ROWS'
-            ).execute()
+            )
+            values = SheetsQuota.execute('get_data_with_range', 'read', request)
 
             data = values.get('values')
 
@@ -61,9 +58,12 @@ class SheetManager():
 
         except googleapiclient.errors.HttpError as error:
             SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('get_data_with_range', error)
             return None
 
     @staticmethod
+    @timed('sheets')
+    @sheets_metric
     def get_all_data(spreadsheet_id):
         """
         Get all data from google sheet by sheet id
@@ -74,11 +74,12 @@ class SheetManager():
         :return: list of lists or None
         """
         try:
-            values = SheetManager.service.spreadsheets().values().get(  # pylint: disable=no-member
+            request = SheetManager.service.spreadsheets().values().get(  # pylint: disable=no-member
                 spreadsheetId=spreadsheet_id,
                 range='A:ZZZ',
                 majorDimension='ROWS'
-            ).execute()
+            )
+            values = SheetsQuota.execute('get_all_data', 'read', request)
 
             data = values.get('values')
 
@@ -87,9 +88,12 @@ class SheetManager():
             return data
         except googleapiclient.errors.HttpError as error:
             SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('get_all_data', error)
             return None
 
     @staticmethod
+    @timed('sheets')
+    @sheets_metric
     def append_data(spreadsheet_id, values: list):
         """
         Append data to google sheet by sheet id
@@ -115,19 +119,177 @@ class SheetManager():
                 "majorDimension": "COLUMNS",
                 "values": data
             }
-            SheetManager.service.spreadsheets().values().append(  # pylint: disable=no-member
+            request = SheetManager.service.spreadsheets().values().append(  # pylint: disable=no-member
                 spreadsheetId=spreadsheet_id,
                 range='A:A',
                 body=resource,
                 valueInputOption="USER_ENTERED"
-            ).execute()
+            )
+            SheetsQuota.execute('append_data', 'write', request)
+
+            return True
+
+        except googleapiclient.errors.HttpError as error:
+            SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('append_data', error)
+            return None
+
+    @staticmethod
+    @timed('sheets')
+    @sheets_metric
+    def get_rows(spreadsheet_id, start_row, end_row):
+        """
+        Get rows of google sheet without flattening them
+
+        :param spreadsheet_id: str | google sheet id, can be gotten from url
+        :param start_row: int | number of first row, starting from 1
+        :param end_row: int | number of last row
+        :return: list of lists or None
+        """
+        try:
+            request = SheetManager.service.spreadsheets().values().get(  # pylint: disable=no-member
+                spreadsheetId=spreadsheet_id,
+                range=f'A{start_row}:ZZZ{end_row}',
+                majorDimension='ROWS'
+            )
+            values = SheetsQuota.execute('get_rows', 'read', request)
+            return values.get('values', [])
+
+        except googleapiclient.errors.HttpError as error:
+            SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('get_rows', error)
+            return None
+
+    @staticmethod
+    @timed('sheets')
+    @sheets_metric
+    def append_rows(spreadsheet_id, rows):
+        """
+        Append many rows to google sheet with one request
 
+        :param spreadsheet_id: str | google sheet id, can be gotten from url
+        :param rows: list of lists | values of every row
+        :return: True or None
+        """
+        try:
+            rows = [[';'.join(value) if isinstance(value, list) else value for value in row]
+                    for row in rows]
+            request = SheetManager.service.spreadsheets().values().append(  # pylint: disable=no-member
+                spreadsheetId=spreadsheet_id,
+                range='A:A',
+                body={
+                    "majorDimension": "ROWS",
+                    "values": rows
+                },
+                valueInputOption="USER_ENTERED"
+            )
+            SheetsQuota.execute('append_rows', 'write', request)
             return True
 
         except googleapiclient.errors.HttpError as error:
             SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('append_rows', error)
             return None
 
+    @staticmethod
+    @timed('sheets')
+    @sheets_metric
+    def batch_get(spreadsheet_id, ranges):
+        """
+        Get data of several ranges of one google sheet with one request
+
+        :param spreadsheet_id: str | google sheet id, can be gotten from url
+        :param ranges: list of (from_row, to_row)
+        :return: list with list of values or None for every range, or None
+        """
+        try:
+            request = SheetManager.service.spreadsheets().values().batchGet(  # pylint: disable=no-member
+                spreadsheetId=spreadsheet_id,
+                ranges=[f'{from_row}:{to_row}' for from_row, to_row in ranges],
+                majorDimension='ROWS'
+            )
+            values = SheetsQuota.execute('batch_get', 'read', request)
+
+            return [SheetManager.lists_to_list(value_range.get('values'))
+                    for value_range in values.get('valueRanges', [])]
+
+        except googleapiclient.errors.HttpError as error:
+            SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('batch_get', error)
+            return None
+
+    @staticmethod
+    def get_ranges(ranges):
+        """
+        Get data of ranges of many sheets.
+        Ranges are grouped by sheet, so every sheet is read with one batchGet,
+        and different sheets are read concurrently
+
+        :param ranges: iterable of (spreadsheet_id, from_row, to_row)
+        :return: dict {(spreadsheet_id, from_row, to_row): list of values or None}
+        """
+        sheets = {}
+        for spreadsheet_id, from_row, to_row in ranges:
+            sheet_ranges = sheets.setdefault(spreadsheet_id, [])
+            if (from_row, to_row) not in sheet_ranges:
+                sheet_ranges.append((from_row, to_row))
+        if not sheets:
+            return {}
+
+        pool = Pool(APP.config['SHEETS_HTTP_POOL_SIZE'])
+        jobs = {spreadsheet_id: pool.spawn(SheetManager.batch_get, spreadsheet_id, sheet_ranges)
+                for spreadsheet_id, sheet_ranges in sheets.items()}
+        pool.join()
+
+        result = {}
+        for spreadsheet_id, sheet_ranges in sheets.items():
+            values = jobs[spreadsheet_id].value or []
+            for index, (from_row, to_row) in enumerate(sheet_ranges):
+                result[(spreadsheet_id, from_row, to_row)] = \
+                    values[index] if index < len(values) else None
+        return result
+
+    @staticmethod
+    @timed('sheets')
+    @sheets_metric
+    def get_modified_time(spreadsheet_id):
+        """
+        Get time google sheet was last modified at from Drive API.
+        Drive quota is separate from Sheets one, so it isn't taken from Sheets buckets
+
+        :param spreadsheet_id: str | google sheet id, can be gotten from url
+        :return: str | RFC 3339 time or None
+        """
+        try:
+            request = SheetManager.service.files().get(  # pylint: disable=no-member
+                fileId=spreadsheet_id,
+                fields='modifiedTime'
+            )
+            return request.execute().get('modifiedTime')
+
+        except googleapiclient.errors.HttpError as error:
+            SHEET_LOGGER.warning('Error, message: %s', error)
+            Metrics.sheets_error('get_modified_time', error)
+            return None
+
+    @staticmethod
+    def get_modified_times(spreadsheet_ids):
+        """
+        Get times many google sheets were last modified at, concurrently
+
+        :param spreadsheet_ids: iterable of google sheets ids
+        :return: dict {spreadsheet_id: RFC 3339 time or None}
+        """
+        spreadsheet_ids = set(spreadsheet_ids)
+        if not spreadsheet_ids:
+            return {}
+
+        pool = Pool(APP.config['SHEETS_HTTP_POOL_SIZE'])
+        jobs = {spreadsheet_id: pool.spawn(SheetManager.get_modified_time, spreadsheet_id)
+                for spreadsheet_id in spreadsheet_ids}
+        pool.join()
+        return {spreadsheet_id: job.value for spreadsheet_id, job in jobs.items()}
+
     @staticmethod
     def get_sheet_id_from_url(url: str):
         """
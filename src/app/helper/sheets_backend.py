@@ -0,0 +1,382 @@
+"""
+Google Sheets backends
+
+SheetManager talks to object with spreadsheets().values().get/batchGet/append
+and Drive files().get interface. Backend is chosen by SHEETS_BACKEND config:
+- google: real Sheets and Drive API services, requests are sent through
+  pool of authorized connections so greenlets don't share one httplib2.Http
+- fake: in-memory sheets with configurable latency and quota errors,
+  for offline tests and benchmarks
+"""
+
+import queue
+import random
+import re
+import threading
+import time
+
+from apiclient.discovery import build_from_document  # pylint: disable=import-error
+from flask import g, has_request_context
+import httplib2
+from googleapiclient.errors import HttpError
+from oauth2client.service_account import ServiceAccountCredentials
+
+from app import APP
+from app.discovery_config import get_drive_discovery, get_sheets_discovery
+
+ROWS_RANGE = re.compile(r'^[A-Z]+(\d+):[A-Z]+(\d+)$')
+SHEETS_SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+
+class HttpPool:
+    """
+    Bounded pool of keep-alive httplib2.Http connections.
+    httplib2.Http isn't safe for concurrent use, so every connection
+    is used by one greenlet at a time
+
+    :param factory: function creating new connection
+    :param size: max amount of connections
+    :param timeout: seconds to wait for free connection
+    """
+
+    def __init__(self, factory, size, timeout):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.created = 0
+        # LIFO keeps recently used connections with open sockets busy
+        self.idle = queue.LifoQueue()
+        self.lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """
+        Get idle connection, create new one if pool isn't full
+        or wait for connection returned by other greenlet
+
+        :param deadline: time.monotonic() value waiting must end by
+        :return: httplib2.Http
+        :raise HttpError: 503 if no connection is free in time,
+            so it is retried and handled like busy Sheets API
+        """
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.lock:
+            can_create = self.created < self.size
+            if can_create:
+                self.created += 1
+        if can_create:
+            try:
+                return self.factory()
+            except Exception:
+                with self.lock:
+                    self.created -= 1
+                raise
+
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = max(0, min(timeout, deadline - time.monotonic()))
+        try:
+            return self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise HttpError(
+                httplib2.Response({'status': 503, 'retry-after': '1'}),
+                b'No free Sheets connection'
+            )
+
+    def release(self, http):
+        """
+        Return connection to pool
+
+        :param http: httplib2.Http
+        """
+        self.idle.put(http)
+
+
+class PooledHttp:
+    """
+    httplib2.Http compatible object sending every request
+    through connection taken from pool
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def request(self, *args, **kwargs):
+        """
+        Send request with pooled connection
+
+        :return: (response, content)
+        """
+        # web request waits for connection only until its Sheets deadline
+        deadline = g.get('sheets_deadline') if has_request_context() else None
+        http = self.pool.acquire(deadline)
+        try:
+            return http.request(*args, **kwargs)
+        finally:
+            self.pool.release(http)
+
+
+class GoogleBackend:
+    """
+    Sheets and Drive API services sharing pool of connections
+    """
+
+    def __init__(self, sheets, drive):
+        self.sheets = sheets
+        self.drive = drive
+
+    def spreadsheets(self):
+        """
+        Get spreadsheets resource of Sheets API
+        """
+        return self.sheets.spreadsheets()
+
+    def files(self):
+        """
+        Get files resource of Drive API
+        """
+        return self.drive.files()
+
+
+def build_google_service():
+    """
+    Build Sheets and Drive API services authorized with service account credentials.
+    Discovery documents are taken from disk cache instead of fetched by every process
+
+    :return: GoogleBackend object
+    """
+    credentials = ServiceAccountCredentials.from_json_keyfile_name(
+        APP.config['SHEETS_CREDENTIALS_FILE'],
+        SHEETS_SCOPES
+    )
+    pool = HttpPool(
+        factory=lambda: credentials.authorize(
+            httplib2.Http(timeout=APP.config['SHEETS_HTTP_TIMEOUT'])
+        ),
+        size=APP.config['SHEETS_HTTP_POOL_SIZE'],
+        timeout=APP.config['SHEETS_HTTP_POOL_TIMEOUT']
+    )
+    http = PooledHttp(pool)
+    return GoogleBackend(
+        sheets=build_from_document(get_sheets_discovery(), http=http),
+        drive=build_from_document(get_drive_discovery(), http=http)
+    )
+
+
+class FakeRequest:
+    """
+    Mimics googleapiclient HttpRequest
+    """
+
+    def __init__(self, backend, handler):
+        self.backend = backend
+        self.handler = handler
+
+    def execute(self):
+        """
+        Wait configured latency, fail with quota error
+        at configured rate or return result of handler
+        """
+        if self.backend.latency:
+            time.sleep(self.backend.latency)
+        if self.backend.error_rate and random.random() < self.backend.error_rate:
+            raise HttpError(httplib2.Response({'status': 429}), b'Quota exceeded (fake)')
+        return self.handler()
+
+
+class FakeValues:
+    """
+    Mimics spreadsheets().values() resource
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, spreadsheetId, range, majorDimension='ROWS'):  # pylint: disable=invalid-name, redefined-builtin, unused-argument
+        """
+        Get rows of sheet, only row numbers of range like A10:ZZZ20 are taken into account
+        """
+        def handler():
+            rows = self.backend.get_rows(spreadsheetId)
+            match = ROWS_RANGE.match(range)
+            if match:
+                rows = rows[int(match.group(1)) - 1:int(match.group(2))]
+            return {'range': range, 'majorDimension': majorDimension, 'values': rows}
+        return FakeRequest(self.backend, handler)
+
+    def batchGet(self, spreadsheetId, ranges, majorDimension='ROWS'):  # pylint: disable=invalid-name
+        """
+        Get rows of sheet for every range, ranges are ignored
+        """
+        return FakeRequest(self.backend, lambda: {
+            'spreadsheetId': spreadsheetId,
+            'valueRanges': [{
+                'range': sheet_range,
+                'majorDimension': majorDimension,
+                'values': self.backend.get_rows(spreadsheetId)
+            } for sheet_range in ranges]
+        })
+
+    def append(self, spreadsheetId, range, body, valueInputOption):  # pylint: disable=invalid-name, redefined-builtin, unused-argument
+        """
+        Append row, body values are columns or rows depending on majorDimension
+        """
+        values = body['values']
+        if body.get('majorDimension') == 'COLUMNS':
+            rows = [list(row) for row in zip(*values)]
+        else:
+            rows = values
+
+        def handler():
+            self.backend.append_rows(spreadsheetId, rows)
+            return {'updates': {'spreadsheetId': spreadsheetId, 'updatedRows': len(rows)}}
+        return FakeRequest(self.backend, handler)
+
+
+class FakeSpreadsheets:
+    """
+    Mimics spreadsheets() resource
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def values(self):
+        """
+        Get values resource
+        """
+        return FakeValues(self.backend)
+
+
+class FakeFiles:
+    """
+    Mimics Drive files() resource
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, fileId, fields=None):  # pylint: disable=invalid-name, unused-argument
+        """
+        Get file metadata, only modifiedTime is returned
+        """
+        return FakeRequest(self.backend, lambda: {
+            'modifiedTime': self.backend.get_modified_time(fileId)
+        })
+
+
+class FakeSheetsBackend:
+    """
+    In-memory Sheets and Drive backend
+
+    :param latency: seconds every call waits
+    :param error_rate: share of calls failed with 429 quota error
+    """
+
+    def __init__(self, latency=0, error_rate=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.sheets = {}
+        self.modified = {}
+        self.lock = threading.Lock()
+
+    def spreadsheets(self):
+        """
+        Get spreadsheets resource
+        """
+        return FakeSpreadsheets(self)
+
+    def files(self):
+        """
+        Get files resource
+        """
+        return FakeFiles(self)
+
+    def get_rows(self, spreadsheet_id):
+        """
+        Get copy of sheet rows
+
+        :param spreadsheet_id:
+        :return: list of lists
+        """
+        with self.lock:
+            return [list(row) for row in self.sheets.get(spreadsheet_id, [])]
+
+    def append_rows(self, spreadsheet_id, rows):
+        """
+        Append rows to sheet, sheet is created if it doesn't exist
+
+        :param spreadsheet_id:
+        :param rows: list of lists
+        """
+        with self.lock:
+            self.sheets.setdefault(spreadsheet_id, []).extend(rows)
+            self.modified[spreadsheet_id] = self.modified.get(spreadsheet_id, 0) + 1
+
+    def get_modified_time(self, spreadsheet_id):
+        """
+        Get version of sheet changed by every append, in place of Drive modifiedTime
+
+        :param spreadsheet_id:
+        :return: str
+        """
+        with self.lock:
+            return str(self.modified.get(spreadsheet_id, 0))
+
+
+def build_fake_backend():
+    """
+    Build fake backend configured by SHEETS_FAKE_LATENCY and SHEETS_FAKE_ERROR_RATE
+
+    :return: FakeSheetsBackend object
+    """
+    return FakeSheetsBackend(
+        latency=APP.config['SHEETS_FAKE_LATENCY'],
+        error_rate=APP.config['SHEETS_FAKE_ERROR_RATE']
+    )
+
+
+BACKENDS = {
+    'google': build_google_service,
+    'fake': build_fake_backend
+}
+
+
+class SheetsService:
+    """
+    Sheets service of backend chosen by SHEETS_BACKEND, built on first use
+    """
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        """
+        Get backend, build it if needed.
+        Concurrent greenlets wait for the first one instead of building their own
+        """
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = BACKENDS[APP.config['SHEETS_BACKEND']]()
+        return self._backend
+
+    def spreadsheets(self):
+        """
+        Get spreadsheets resource of backend
+        """
+        return self.backend.spreadsheets()
+
+    def files(self):
+        """
+        Get Drive files resource of backend
+        """
+        return self.backend.files()
@@ -0,0 +1,171 @@
+"""
+Google Sheets quota module
+"""
+
+import math
+import random
+import time
+
+from flask import g, has_request_context
+from googleapiclient.errors import HttpError
+from redis import RedisError
+from werkzeug.exceptions import ServiceUnavailable
+
+from app import APP, SHEET_LOGGER
+from app.helper.metrics import SHEETS_BACKOFFS
+from app.helper.rate_limiter import RateLimiter
+
+# quota errors and errors Google asks to retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class SheetsBusy(ServiceUnavailable):
+    """
+    503 error with Retry-After header, raised in web request
+    instead of waiting for Sheets quota longer than SHEETS_REQUEST_DEADLINE
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(description='Google Sheets is busy, try again later')
+        self.retry_after = retry_after
+
+    def get_headers(self, environ=None):
+        """
+        Add Retry-After header to response headers
+        """
+        headers = super().get_headers(environ)
+        headers.append(('Retry-After', str(self.retry_after)))
+        return headers
+
+
+class SheetsQuota:
+    """
+    Class to keep Sheets API calls of all processes within Google quotas.
+    Calls take tokens from Redis buckets of SHEETS_QUOTAS
+    and are retried with exponential backoff on quota and server errors.
+    Web requests give up after SHEETS_REQUEST_DEADLINE, celery tasks and consumers wait longer
+    """
+
+    @staticmethod
+    def get_deadline():
+        """
+        Get time waiting for Sheets must end by
+
+        :return: time.monotonic() value or None if caller isn't web request
+        """
+        if has_request_context():
+            return time.monotonic() + APP.config['SHEETS_REQUEST_DEADLINE']
+        return None
+
+    @staticmethod
+    def check_deadline(deadline, delay):
+        """
+        Fail fast if waiting delay seconds would pass deadline
+
+        :param deadline: time.monotonic() value or None
+        :param delay: seconds to wait
+        :raise SheetsBusy: if deadline would be passed
+        """
+        if deadline is not None and time.monotonic() + delay > deadline:
+            raise SheetsBusy(retry_after=math.ceil(delay))
+
+    @staticmethod
+    def get_status(error):
+        """
+        Get HTTP status of Sheets API error
+
+        :param error: HttpError
+        :return: int or None
+        """
+        status = getattr(getattr(error, 'resp', None), 'status', None)
+        try:
+            return int(status)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def get_delay(attempt, error=None):
+        """
+        Get seconds to wait before retry: Retry-After sent by Google
+        or exponential backoff with full jitter, both up to SHEETS_BACKOFF_MAX
+
+        :param attempt: number of failed attempt starting from 0
+        :param error: HttpError
+        :return: float
+        """
+        retry_after = getattr(getattr(error, 'resp', None), 'get', lambda key: None)('retry-after')
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), APP.config['SHEETS_BACKOFF_MAX'])
+            except ValueError:
+                pass
+        delay = min(APP.config['SHEETS_BACKOFF_MAX'],
+                    APP.config['SHEETS_BACKOFF_BASE'] * 2 ** attempt)
+        return random.uniform(0, delay)
+
+    @staticmethod
+    def acquire(kind, deadline=None):
+        """
+        Take token from every quota bucket of kind, waiting for them if needed.
+        Bucket refills so that burst and refill of any minute stay within quota.
+        Calls aren't blocked if Redis is unavailable
+
+        :param kind: read or write
+        :param deadline: time.monotonic() value waiting must end by
+        :return: seconds waited
+        :raise SheetsBusy: if waiting would pass deadline
+        """
+        waited = 0
+        capacity = APP.config['SHEETS_QUOTA_BURST']
+        for scope, per_minute in APP.config['SHEETS_QUOTAS'][kind].items():
+            rate = (per_minute - capacity) / 60
+            while True:
+                try:
+                    retry_after = RateLimiter.consume(f'sheets:{kind}:{scope}', rate, capacity)
+                except RedisError as error:
+                    SHEET_LOGGER.warning('Sheets quota is not checked: %s', error)
+                    return waited
+                if not retry_after:
+                    break
+                SheetsQuota.check_deadline(deadline, retry_after)
+                if waited + retry_after > APP.config['SHEETS_QUOTA_MAX_WAIT']:
+                    # let Google decide, backoff handles quota error
+                    return waited
+                time.sleep(retry_after)
+                waited += retry_after
+        return waited
+
+    @staticmethod
+    def execute(method, kind, request):
+        """
+        Execute Sheets API request within quota, retrying quota and server errors
+
+        :param method: SheetManager method name, for metrics
+        :param kind: read or write
+        :param request: googleapiclient HttpRequest
+        :return: response
+        :raise HttpError: if request failed SHEETS_MAX_RETRIES + 1 times
+        :raise SheetsBusy: if web request would wait past SHEETS_REQUEST_DEADLINE
+        """
+        deadline = SheetsQuota.get_deadline()
+        if deadline is not None:
+            # connection pool of google backend waits until deadline too
+            g.sheets_deadline = deadline
+        attempt = 0
+        while True:
+            if APP.config['SHEETS_QUOTA_ENABLED']:
+                if SheetsQuota.acquire(kind, deadline):
+                    SHEETS_BACKOFFS.labels(method).inc()
+            try:
+                return request.execute()
+            except HttpError as error:
+                if SheetsQuota.get_status(error) not in RETRY_STATUSES \
+                        or attempt >= APP.config['SHEETS_MAX_RETRIES']:
+                    raise
+                delay = SheetsQuota.get_delay(attempt, error)
+                SheetsQuota.check_deadline(deadline, delay)
+                SHEET_LOGGER.warning('%s failed with %s, retry in %.2f seconds',
+                                     method, SheetsQuota.get_status(error), delay)
+                SHEETS_BACKOFFS.labels(method).inc()
+                time.sleep(delay)
+                attempt += 1
@@ -10,6 +10,8 @@ from flask_socketio import (  # pylint: disable=redefined-builtin
 
 
 from app import CONNECTIONS_LOGGER, SOCKETIO
+from app.helper.form_events import FormEvents
+from app.models import Form
 
 
 @SOCKETIO.on('connect')
@@ -32,3 +34,46 @@ def disconnect():
     """
     leave_room(current_user.email)
     CONNECTIONS_LOGGER.info('Disconnected: %s', current_user.email)
+
+
+def get_own_form_id(data):
+    """
+    Get id of form from event data if current user owns the form
+
+    :param data: dict with formId
+    :return: int or None
+    """
+    form_id = (data or {}).get('formId')
+    if not isinstance(form_id, int) or current_user.is_anonymous:
+        return None
+    form = Form.query.get(form_id)
+    if form is None or form.owner_id != current_user.id:
+        return None
+    return form_id
+
+
+@SOCKETIO.on('subscribe_form')
+def subscribe_form(data):
+    """
+    Join room of form to receive its new results, only form owner can join
+
+    :param data: dict with formId
+    :return: acknowledgement with subscribed status
+    """
+    form_id = get_own_form_id(data)
+    if form_id is None:
+        return {'subscribed': False}
+    join_room(FormEvents.get_room(form_id))
+    return {'subscribed': True}
+
+
+@SOCKETIO.on('unsubscribe_form')
+def unsubscribe_form(data):
+    """
+    Leave room of form
+
+    :param data: dict with formId
+    """
+    form_id = (data or {}).get('formId')
+    if isinstance(form_id, int):
+        leave_room(FormEvents.get_room(form_id))
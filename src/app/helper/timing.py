@@ -0,0 +1,158 @@
+"""
+Request timing module
+"""
+
+import functools
+import json
+import random
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import APP, TIMING_LOGGER
+
+
+class RequestTimer:
+    """
+    Class to collect time spent in every stage of sampled requests,
+    send it in Server-Timing header and log it
+    """
+
+    @staticmethod
+    def start():
+        """
+        Start timing of request if it gets into sample
+        """
+        if random.random() < APP.config['TIMING_SAMPLE_RATE']:
+            g.timings = {}
+            g.timing_stages = set()
+            g.request_start = time.perf_counter()
+
+    @staticmethod
+    def is_enabled():
+        """
+        Check whether current request is timed
+
+        :return: bool
+        """
+        return has_request_context() and g.get('timings') is not None
+
+    @staticmethod
+    def record(stage, duration):
+        """
+        Add duration to stage of current request
+
+        :param stage: stage name
+        :param duration: seconds
+        """
+        if not RequestTimer.is_enabled():
+            return
+        total, count = g.timings.get(stage, (0, 0))
+        g.timings[stage] = (total + duration, count + 1)
+
+    @staticmethod
+    def get_stages():
+        """
+        Get stages of current request
+
+        :return: dict {stage: {'ms': float, 'count': int}}
+        """
+        return {
+            stage: {'ms': round(duration * 1000, 2), 'count': count}
+            for stage, (duration, count) in g.timings.items()
+        }
+
+    @staticmethod
+    def finish(response):
+        """
+        Add Server-Timing header to response and log stages
+
+        :param response: flask response
+        :return: response
+        """
+        if not RequestTimer.is_enabled():
+            return response
+
+        total = round((time.perf_counter() - g.request_start) * 1000, 2)
+        stages = RequestTimer.get_stages()
+
+        metrics = [f'{stage};dur={data["ms"]};desc="{data["count"]}x"'
+                   for stage, data in stages.items()]
+        metrics.append(f'total;dur={total}')
+        response.headers['Server-Timing'] = ', '.join(metrics)
+
+        TIMING_LOGGER.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': total,
+            'stages': stages
+        }))
+        return response
+
+
+def timed(stage):
+    """
+    Record time spent in function as stage of current request.
+    Nested calls of the same stage are counted once
+
+    :param stage: stage name, e.g. redis
+    :return: decorator
+    """
+    def decorator(func):
+        """
+        Timing decorator
+
+        :param func: function to decorate
+        :return: function wrapper
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            """
+            Function decorator
+
+            :param *args: args
+            :param **kwargs: kwargs
+            """
+            if not RequestTimer.is_enabled() or stage in g.timing_stages:
+                return func(*args, **kwargs)
+
+            g.timing_stages.add(stage)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                g.timing_stages.discard(stage)
+                RequestTimer.record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=too-many-arguments, unused-argument
+    """
+    Remember query start time
+    """
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=too-many-arguments, unused-argument
+    """
+    Record query time as db stage
+    """
+    start = conn.info['query_start_time'].pop()
+    RequestTimer.record('db', time.perf_counter() - start)
+
+
+def init_timing(app):
+    """
+    Register request hooks and query listeners
+
+    :param app: Flask object (flask application)
+    """
+    app.before_request(RequestTimer.start)
+    app.after_request(RequestTimer.finish)
+    event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
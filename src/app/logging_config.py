@@ -6,11 +6,17 @@ import os
 from logging.handlers import RotatingFileHandler
 
 
-def create_logger(log_dir, filename):
+def create_logger(log_dir, filename, name='logger', level=logging.WARNING):
     """
     Creates logger that saves logs to .logs file and outputs logs to console
+
+    :param log_dir: folder for log files
+    :param filename: log file name
+    :param name: logger name, loggers with the same name share handlers
+    :param level: minimal level of records saved to file
     """
-    logger = logging.getLogger('logger')
+    logger = logging.getLogger(name)
+    logger.setLevel(min(level, logging.WARNING))
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(filename)s - %(message)s')
 
     # Creates folder if don't exist
@@ -19,7 +25,7 @@ def create_logger(log_dir, filename):
 
     # Saves to file
     file_logger = RotatingFileHandler(filename=save_filename, maxBytes=1000000, backupCount=2)
-    file_logger.setLevel(logging.WARNING)
+    file_logger.setLevel(level)
     file_logger.setFormatter(formatter)
     logger.addHandler(file_logger)
 
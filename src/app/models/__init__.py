@@ -10,7 +10,11 @@ from .setting_autocomplete import SettingAutocomplete
 from .shared_field import SharedField
 from .range import Range
 from .form_result import FormResult
+from .form_result_user import FormResultUser
+from .form_result_submission import FormResultSubmission
 from .field_range import FieldRange
 from .group_user import GroupUser
 from .group import Group
 from .token import Token
+from .form_result_archive import FormResultArchive
+from .form_sheet_sync import FormSheetSync
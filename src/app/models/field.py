@@ -19,6 +19,8 @@ class Field(AbstractModel):
     __tablename__ = 'fields'
     __table_args__ = (
         DB.UniqueConstraint('name', 'owner_id', name='unique_name_owner'),
+        DB.Index('ix_fields_name_trgm', 'name', postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}),
     )
 
     name = DB.Column(DB.String, unique=False, nullable=False)
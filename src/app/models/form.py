@@ -21,6 +21,10 @@ class Form(AbstractModel):
     __tablename__ = 'forms'
     __table_args__ = (DB.UniqueConstraint('owner_id', 'name',
                                           name='owner_form_name'),
+                      DB.Index('ix_forms_name_trgm', 'name', postgresql_using='gin',
+                               postgresql_ops={'name': 'gin_trgm_ops'}),
+                      DB.Index('ix_forms_title_trgm', 'title', postgresql_using='gin',
+                               postgresql_ops={'title': 'gin_trgm_ops'}),
                       )
 
     owner_id = DB.Column(DB.Integer, DB.ForeignKey('users.id'),
@@ -33,3 +37,7 @@ class Form(AbstractModel):
 
     fields = DB.relationship('FormField', backref='form', cascade='all,delete')
     tokens = DB.relationship('Token', backref='form', cascade='all,delete')
+    results_archive = DB.relationship('FormResultArchive', backref='form',
+                                      cascade='all,delete', uselist=False)
+    sheet_sync = DB.relationship('FormSheetSync', backref='form',
+                                 cascade='all,delete', uselist=False)
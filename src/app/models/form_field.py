@@ -10,6 +10,8 @@ class FormField(AbstractModel):
     __tablename__ = "form_fields"
     __table_args__ = (
         DB.UniqueConstraint('form_id', 'position', name='unique_form_position'),
+        DB.Index('ix_form_fields_question_trgm', 'question', postgresql_using='gin',
+                 postgresql_ops={'question': 'gin_trgm_ops'}),
     )
 
     form_id = DB.Column(DB.Integer, DB.ForeignKey('forms.id'), nullable=False)
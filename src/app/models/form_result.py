@@ -10,15 +10,19 @@ from .abstract_model import AbstractModel
 class FormResult(AbstractModel):
     """
     FormResult model class
+    Table is partitioned by month of created in migration, where created is part
+    of table primary key too. Rows are still identified by id thanks to sequence.
+    Filter by created whenever possible to let PostgreSQL skip old partitions
     :param user_id: user who answered to field
     :param answer: json {position: answer_id}
     :param token_id: id to table Tokens
     """
     __tablename__ = 'form_results'
     __table_args__ = (
-        DB.UniqueConstraint('user_id', 'token_id', name='unique_user_token'),
+        DB.Index('ix_form_results_token_id_user_id', 'token_id', 'user_id'),
     )
 
+    id = DB.Column(DB.Integer, primary_key=True, autoincrement=True)
     user_id = DB.Column(DB.Integer, DB.ForeignKey('users.id'), nullable=True)
     answers = DB.Column(DB.JSON, nullable=False)
     token_id = DB.Column(DB.Integer, DB.ForeignKey('tokens.id'), nullable=False)
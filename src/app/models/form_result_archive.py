@@ -0,0 +1,24 @@
+"""
+FormResultArchive model
+"""
+from sqlalchemy import func
+
+from app import DB
+from .abstract_model import AbstractModel
+
+
+class FormResultArchive(AbstractModel):
+    """
+    Manifest of form results moved from form_results table to archive file
+
+    :param form_id: form archived results belong to
+    :param path: path to compressed archive file
+    :param results_count: amount of results in archive
+    """
+
+    __tablename__ = 'form_result_archives'
+
+    form_id = DB.Column(DB.Integer, DB.ForeignKey('forms.id'), unique=True, nullable=False)
+    path = DB.Column(DB.Text, nullable=False)
+    results_count = DB.Column(DB.Integer, nullable=False)
+    created = DB.Column(DB.TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
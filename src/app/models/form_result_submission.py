@@ -0,0 +1,24 @@
+"""
+FormResultSubmission model
+"""
+from sqlalchemy import func
+
+from app import DB
+from .abstract_model import AbstractModel
+
+
+class FormResultSubmission(AbstractModel):
+    """
+    Submission queued in batch mode that is already inserted,
+    so submission read from stream again after crash isn't inserted twice
+
+    :param submission_id: id of queued submission
+    :param result_id: id of created FormResult
+    """
+
+    __tablename__ = 'form_result_submissions'
+
+    submission_id = DB.Column(DB.String(32), unique=True, nullable=False)
+    result_id = DB.Column(DB.Integer, nullable=False)
+    created = DB.Column(DB.TIMESTAMP(timezone=True), server_default=func.now(),
+                        nullable=False, index=True)
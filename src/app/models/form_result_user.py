@@ -0,0 +1,25 @@
+"""
+FormResultUser model
+"""
+
+from app import DB
+from .abstract_model import AbstractModel
+
+
+class FormResultUser(AbstractModel):
+    """
+    User who answered form by token, one row per user and token.
+    Partitioned form_results can't have unique constraint without created,
+    so this table keeps users from answering twice
+
+    :param user_id: user who answered form
+    :param token_id: token form was answered by
+    """
+
+    __tablename__ = 'form_result_users'
+    __table_args__ = (
+        DB.UniqueConstraint('user_id', 'token_id', name='unique_user_token'),
+    )
+
+    user_id = DB.Column(DB.Integer, DB.ForeignKey('users.id', ondelete="CASCADE"), nullable=False)
+    token_id = DB.Column(DB.Integer, DB.ForeignKey('tokens.id', ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,26 @@
+"""
+FormSheetSync model
+"""
+from sqlalchemy import func
+
+from app import DB
+from .abstract_model import AbstractModel
+
+
+class FormSheetSync(AbstractModel):
+    """
+    High-water marks of reconciliation of form results with form sheet
+
+    :param form_id: reconciled form
+    :param result_id_mark: all results with id up to it are in sheet
+    :param row_mark: amount of sheet rows that don't have to be read again
+    """
+
+    __tablename__ = 'form_sheet_syncs'
+
+    form_id = DB.Column(DB.Integer, DB.ForeignKey('forms.id', ondelete='CASCADE'),
+                        unique=True, nullable=False)
+    result_id_mark = DB.Column(DB.Integer, nullable=False, default=0)
+    row_mark = DB.Column(DB.Integer, nullable=False, default=0)
+    updated = DB.Column(DB.TIMESTAMP(timezone=True), server_default=func.now(),
+                        onupdate=func.now(), nullable=False)
@@ -15,7 +15,7 @@ from flask_restx import Resource
 from werkzeug.exceptions import Forbidden, BadRequest
 
 from app import APP, GOOGLE_CLIENT, API
-from app.config import GOOGLE_PROVIDER_CONFIG
+from app.discovery_config import get_google_provider_config
 from app.services import UserService
 
 APP.secret_key = os.environ.get("APP_SECRET_KEY")
@@ -108,7 +108,7 @@ def callback(response):
         raise Forbidden("Not access to Google Service")
 
     userinfo = requests.get(
-        GOOGLE_PROVIDER_CONFIG['userinfo_endpoint'],
+        get_google_provider_config()['userinfo_endpoint'],
         params={
             'access_token': response['access_token']
         }
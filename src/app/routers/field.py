@@ -4,12 +4,13 @@ Field router.
 from flask import request, jsonify, Response
 from flask_restx import fields, Resource
 from flask_login import current_user, login_required
+from marshmallow import ValidationError
 from werkzeug.exceptions import BadRequest, Forbidden
-from app.schemas import BasicField
+from app.schemas import BasicField, FieldLibraryQuerySchema
 
 from app import API
 from app.helper.enums import FieldType
-from app.services import FieldService, UserService
+from app.services import FieldLibraryService, FieldService, UserService
 
 FIELDS_NS = API.namespace('fields', description='Field APIs')
 
@@ -194,6 +195,58 @@ class FieldsAPI(Resource):
         return jsonify({"fields": response})
 
 
+@FIELDS_NS.route("/library/")
+class FieldLibraryAPI(Resource):
+    """
+    Field library API
+
+    url: '/fields/library'
+    methods: GET
+    """
+
+    @API.doc(
+        responses={
+            200: 'OK',
+            400: 'Invalid data',
+            401: 'Unauthorized'
+        },
+        params={
+            'page': 'Page number, 1 by default',
+            'perPage': 'Amount of fields on page, 50 by default, 200 at most',
+            'fieldType': 'Return only fields of this type',
+            'name': 'Return only fields which name contains it'
+        }
+    )
+    @login_required
+    # pylint: disable=no-self-use
+    def get(self):
+        """
+        Get page of user fields and fields shared to user.
+        Values of autocomplete fields aren't included, get them with field GET
+
+        :return: json
+        """
+        try:
+            args = FieldLibraryQuerySchema().load(request.args)
+        except ValidationError as error:
+            raise BadRequest(error.messages)
+
+        field_list, total = FieldLibraryService.get_library(
+            user_id=current_user.id,
+            page=args['page'],
+            per_page=args['per_page'],
+            field_type=args['field_type'],
+            name=args['name']
+        )
+
+        return jsonify({
+            "fields": field_list,
+            "page": args['page'],
+            "perPage": args['per_page'],
+            "total": total
+        })
+
+
 @FIELDS_NS.route("/<int:field_id>/")
 class FieldAPI(Resource):
     """
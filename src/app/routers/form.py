@@ -8,7 +8,7 @@ from werkzeug.exceptions import BadRequest, Forbidden
 from flask_login import current_user, login_required
 
 from app import API
-from app.services import FormService
+from app.services import FormService, FormResultArchiveService, TokenService
 
 
 FORM_NS = API.namespace('forms', description='Form APIs')
@@ -198,8 +198,12 @@ class FormAPI(Resource):
         if form.owner != current_user:
             raise Forbidden("Deleting form is forbidden")
 
+        archive = FormResultArchiveService.get_by_form_id(form_id)
         is_deleted = FormService.delete(form_id)
         if is_deleted is None:
             raise BadRequest("Couldn't delete form")
+        TokenService.invalidate_resolutions(form_id=form_id)
+        if archive is not None:
+            FormResultArchiveService.remove(archive)
 
         return Response(status=204)
@@ -8,8 +8,17 @@ from flask_restx import Resource, fields
 from flask_login import current_user, login_required
 from werkzeug.exceptions import BadRequest
 
-from app import API
-from app.services import FormService, FormResultService, TokenService
+from app import API, APP
+from app.services import (
+    FormService,
+    FormResultService,
+    FormResultArchiveService,
+    SheetReconciliationService,
+    TokenService
+)
+from app.helper.form_events import FormEvents
+from app.helper.idempotency_manager import IdempotencyManager
+from app.helper.rate_limiter import RateLimiter, rate_limit
 from app.helper.sheet_manager import SheetManager
 
 
@@ -58,6 +67,7 @@ class AnswersAPI(Resource):
 
         :param form_id:
         :return: All answers for form if owner, else answer of current user.
+        Archived answers are included too
         """
         form = FormService.get_by_id(form_id)
         answers = []
@@ -66,17 +76,33 @@ class AnswersAPI(Resource):
         if form.owner_id == current_user.id:
             tokens = TokenService.filter(form_id=form.id)
             for token in tokens:
-                result = FormResultService.filter(token_id=token.id)
+                result = FormResultService.filter(token_id=token.id, form_created=form.created)
                 answers.append(FormResultService.to_json(result, many=True))
 
             answers = list(chain(*answers))
+            archived = FormResultArchiveService.read(
+                form.id,
+                live_ids=[answer['id'] for answer in answers]
+            )
+            answers.extend(FormResultService.to_json(archived, many=True))
         else:
             tokens = TokenService.filter(form_id=form.id)
             for token in tokens:
-                result = FormResultService.filter(user_id=current_user.id, token_id=token.id)
+                result = FormResultService.filter(
+                    user_id=current_user.id,
+                    token_id=token.id,
+                    form_created=form.created
+                )
                 if result:
                     answers.append(FormResultService.to_json(result[0], many=False))
 
+            archived = FormResultArchiveService.read(
+                form.id,
+                user_id=current_user.id,
+                live_ids=[answer['id'] for answer in answers]
+            )
+            answers.extend(FormResultService.to_json(archived, many=True))
+
         return jsonify({"formAnswers": answers})
 
 
@@ -131,34 +157,61 @@ class FormTokenAnswersAPI(Resource):
     @API.doc(
         responses={
             201: 'Created',
+            202: 'Accepted to be created in batch',
             400: 'Invalid data',
-            403: 'Forbidden to create'}
+            403: 'Forbidden to create',
+            409: 'Request with this Idempotency-Key is in progress',
+            429: 'Too many requests'},
+        params={
+            'Idempotency-Key': {
+                'in': 'header',
+                'description': 'Unique key to safely retry submission'
+            }
+        }
     )
     @API.expect(MODEL)
+    @rate_limit
     # pylint: disable=no-self-use
     def post(self, token):
         """
-        Creates FormResult
+        Creates FormResult.
+        If Idempotency-Key header is sent, retries with the same key
+        return first response instead of creating FormResult again
 
         :param token:
         :return: created FormResult with answer id's instead of text answers of user
         """
-        # validate token
-        token_instance = TokenService.get_by_token(token)
-        if token_instance is None:
-            raise BadRequest('Wrong token')
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if idempotency_key is None:
+            return FormTokenAnswersAPI.create_result(token)
+
+        return IdempotencyManager.run(
+            token,
+            idempotency_key,
+            process=lambda: FormTokenAnswersAPI.create_result(token, idempotency_key),
+            replay=lambda record: FormTokenAnswersAPI.replay_result(
+                token,
+                idempotency_key,
+                record
+            )
+        )
 
-        token_data = TokenService.decode_token_for_check(token)
-        if token_data is None:
-            raise BadRequest('Wrong token')
+    @staticmethod
+    def validate_result(token):
+        """
+        Resolve token and validate answers of request
 
-        form = FormService.get_by_id(token_data.get('form_id'))
-        if form is None:
+        :param token:
+        :return: resolved token data, validated result
+        """
+        token_data = TokenService.resolve(token)
+        if token_data is None:
             raise BadRequest('Wrong token')
+        form_id = token_data['form_id']
+        RateLimiter.check(form_id=form_id)
 
-        # validate data
         result = request.get_json()
-        result['form_id'] = form.id
+        result['form_id'] = form_id
         passed, errors = FormResultService.validate_schema(result)
         if not passed:
             raise BadRequest(errors)
@@ -166,40 +219,205 @@ class FormTokenAnswersAPI(Resource):
         if not passed:
             raise BadRequest(errors)
 
-        if not current_user.is_anonymous:
-            result['user_id'] = current_user.id
-        else:
-            result['user_id'] = None
-        result['answers'] = FormResultService.create_answers_dict(form.id, result['answers'])
+        result['user_id'] = None if current_user.is_anonymous else current_user.id
+        FormTokenAnswersAPI.check_user_can_answer(token_data['token_id'])
+        result['answers'] = FormResultService.create_answers_dict(form_id, result['answers'])
+        return token_data, result
+
+    @staticmethod
+    def check_user_can_answer(token_id):
+        """
+        Check that logged in user hasn't passed form with this token yet
+
+        :param token_id:
+        """
+        if current_user.is_anonymous:
+            return
+        user_can_answer = FormResultService.check_whether_user_passed_form(
+            user_id=current_user.id,
+            token_id=token_id
+        )
+        if not user_can_answer:
+            raise BadRequest("You have already passed this form using this token")
+
+    @staticmethod
+    def create_result(token, idempotency_key=None):
+        """
+        Validate answers, save FormResult in db and sheet
+
+        :param token:
+        :param idempotency_key: key to save response by
+        :return: response with created FormResult
+        """
+        token_data, result = FormTokenAnswersAPI.validate_result(token)
+        form_id = token_data['form_id']
 
         values = []
         for answer in result['answers'].values():
             values.append(answer)
         values.append(token)
 
+        form_url = FormService.get_form_result_url(form_id)
+        if form_url is None:
+            raise BadRequest("Cannot create result instance")
+
+        sheet_id = SheetManager.get_sheet_id_from_url(form_url)
+        if sheet_id is None:
+            raise BadRequest("Cannot create result instance")
+
+        if APP.config['FORM_RESULTS_BATCH_MODE']:
+            return FormTokenAnswersAPI.enqueue_result(
+                token,
+                token_data['token_id'],
+                result,
+                sheet_id,
+                values,
+                idempotency_key
+            )
+
         # save result in db and sheet
         result = FormResultService.create(
             user_id=result['user_id'],
-            token_id=token_instance.id,
+            token_id=token_data['token_id'],
             answers=result['answers']
         )
         if result is None:
+            # concurrent submission of the same user could be saved first
+            FormTokenAnswersAPI.check_user_can_answer(token_data['token_id'])
             raise BadRequest("Cannot create result instance")
-
-        form_url = FormService.get_form_result_url(form.id)
-        if form_url is None:
-            raise BadRequest("Cannot create result instance")
-
-        sheet_id = SheetManager.get_sheet_id_from_url(form_url)
-        if sheet_id is None:
-            raise BadRequest("Cannot create result instance")
+        # result id lets reconciliation find rows missing in sheet
+        values.append(result.id)
+
+        record = {
+            'result': FormResultService.to_json(result, many=False),
+            'sheet_id': sheet_id,
+            'values': list(values),
+            'form_id': form_id,
+            'is_appended': False
+        }
+        if idempotency_key is not None:
+            IdempotencyManager.save(token, idempotency_key, record)
 
         is_added = SheetManager.append_data(sheet_id, values)
         if is_added is None:
             raise BadRequest("Cannot create result instance")
 
-        result_json = FormResultService.to_json(result, many=False)
+        record['is_appended'] = True
+        if idempotency_key is not None:
+            IdempotencyManager.save(token, idempotency_key, record)
+        # owner sees result only when it's in sheet too
+        FormEvents.publish_results(form_id, [record['result']])
 
-        response = jsonify(result_json)
+        response = jsonify(record['result'])
         response.status_code = 201
         return response
+
+    @staticmethod
+    def enqueue_result(  # pylint: disable=too-many-arguments
+            token,
+            token_id,
+            result,
+            sheet_id,
+            values,
+            idempotency_key=None):
+        """
+        Queue validated FormResult to be saved in db and sheet in batch
+
+        :param token:
+        :param token_id:
+        :param result: validated result
+        :param sheet_id: sheet to append values to
+        :param values: row to append to sheet
+        :param idempotency_key: key to save response by
+        :return: response with submission id
+        """
+        submission_id = FormResultService.enqueue(
+            form_id=result['form_id'],
+            user_id=result['user_id'],
+            token_id=token_id,
+            answers=result['answers'],
+            token=token,
+            sheet_id=sheet_id,
+            values=values
+        )
+
+        record = {
+            'result': {'submissionId': submission_id, 'status': 'pending'},
+            'is_appended': True,
+            'status_code': 202
+        }
+        if idempotency_key is not None:
+            IdempotencyManager.save(token, idempotency_key, record)
+
+        response = jsonify(record['result'])
+        response.status_code = 202
+        return response
+
+    @staticmethod
+    def replay_result(token, idempotency_key, record):
+        """
+        Return stored response of already processed request.
+        If result was saved in db but not in sheet, only append it to sheet and publish it.
+        Result reconciliation appended already isn't appended again
+
+        :param token:
+        :param idempotency_key:
+        :param record: stored record
+        :return: response with created FormResult
+        """
+        if not record['is_appended']:
+            # record lives longer than reconciliation delay, row may be appended already
+            is_reconciled = record.get('form_id') is not None and \
+                SheetReconciliationService.is_reconciled(record['form_id'], record['result']['id'])
+            if not is_reconciled:
+                is_added = SheetManager.append_data(record['sheet_id'], list(record['values']))
+                if is_added is None:
+                    raise BadRequest("Cannot create result instance")
+
+            record['is_appended'] = True
+            IdempotencyManager.save(token, idempotency_key, record)
+            if record.get('form_id') is not None:
+                FormEvents.publish_results(record['form_id'], [record['result']])
+
+        response = jsonify(record['result'])
+        response.status_code = record.get('status_code', 201)
+        return response
+
+
+@TOKEN_ANSWER_NS.route("/<string:submission_id>")
+class FormTokenAnswerStatusAPI(Resource):
+    """
+
+    url: /tokens/{token}/answers/{submission_id}
+    methods: get
+    """
+
+    @API.doc(
+        responses={
+            200: 'OK',
+            400: 'Invalid data'
+        },
+        params={
+            'token': 'Token submission was sent with',
+            'submission_id': 'Submission id returned on creation in batch mode'
+        }
+    )
+    # pylint: disable=no-self-use
+    def get(self, token, submission_id):
+        """
+        Get status of FormResult created in batch mode
+
+        :param token:
+        :param submission_id:
+        :return: status ('pending', 'created', 'failed'), created FormResult and errors
+        """
+        submission = FormResultService.get_submission_status(submission_id)
+        if submission is None or submission['token'] != token:
+            raise BadRequest("No such submission")
+
+        return jsonify({
+            'submissionId': submission_id,
+            'status': submission['status'],
+            'result': submission['result'],
+            'errors': submission['errors']
+        })
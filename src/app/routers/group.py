@@ -8,7 +8,7 @@ from flask_login import current_user, login_required
 from werkzeug.exceptions import BadRequest, Forbidden
 
 from app import API
-from app.services import GroupService
+from app.services import GroupService, TokenService
 
 GROUP_NS = API.namespace('groups', description='Group APIs')
 GROUP_MODEL = API.model('Group', {
@@ -214,5 +214,6 @@ class GroupAPI(Resource):
         is_deleted = bool(GroupService.delete(group_id))
         if not is_deleted:
             raise BadRequest("Couldn't delete group")
+        TokenService.invalidate_resolutions(group_id=group_id)
 
         return Response(status=204)
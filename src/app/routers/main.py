@@ -1,11 +1,18 @@
 """
 Base router view.
 """
+import hmac
+
 import jwt
+from flask import jsonify, request, Response
+from flask_login import current_user
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from werkzeug.exceptions import Forbidden
 
-from app import APP
+from app import APP, DB
 from app.celery_tasks.share_field import call_share_field_task
 from app.config import SECRET_KEY
+from app.db_config import get_pool_status
 from app.helper.constants import JWT_ALGORITHM
 from app.services import FieldService
 
@@ -21,6 +28,42 @@ def hello_world():
     return 'Hello, World!'
 
 
+def check_internal_access():
+    """
+    Allow internal state to Prometheus sending METRICS_TOKEN
+    as bearer token and to logged in users from ADMIN_EMAILS
+    """
+    token = APP.config['METRICS_TOKEN']
+    authorization = request.headers.get('Authorization', '')
+    if token and hmac.compare_digest(authorization, f'Bearer {token}'):
+        return
+    if current_user.is_authenticated and current_user.email in APP.config['ADMIN_EMAILS']:
+        return
+    raise Forbidden('Only admins can see internal state')
+
+
+@APP.route('/db_pool')
+def db_pool():
+    """
+    Database connection pool usage, see check_internal_access
+
+    :return: json
+    """
+    check_internal_access()
+    return jsonify(get_pool_status(DB.engine))
+
+
+@APP.route('/metrics')
+def metrics():
+    """
+    Prometheus metrics, see check_internal_access
+
+    :return: metrics in Prometheus text format
+    """
+    check_internal_access()
+    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+
 @APP.route('/receive_field/<token>')
 def receive_field(token):
     """
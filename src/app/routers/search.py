@@ -0,0 +1,67 @@
+"""
+Search router.
+"""
+from flask import request, jsonify
+from flask_restx import Resource
+from flask_login import current_user, login_required
+from marshmallow import ValidationError
+from werkzeug.exceptions import BadRequest
+
+from app import API
+from app.helper.constants import SEARCH_KINDS
+from app.schemas import SearchQuerySchema
+from app.services import SearchService
+
+SEARCH_NS = API.namespace('search', description='Search APIs')
+
+
+@SEARCH_NS.route("/")
+class SearchAPI(Resource):
+    """
+    Search API
+
+    url: '/search'
+    methods: GET
+    """
+
+    @API.doc(
+        responses={
+            200: 'OK',
+            400: 'Invalid data',
+            401: 'Unauthorized'
+        },
+        params={
+            'q': 'Search text, at least 2 characters',
+            'kind': 'Search only field, form or question',
+            'page': 'Page number, 1 by default',
+            'perPage': 'Amount of results on page, 20 by default, 100 at most'
+        }
+    )
+    @login_required
+    # pylint: disable=no-self-use
+    def get(self):
+        """
+        Search user fields, shared fields, forms and questions of forms.
+        Results are ordered by relevance
+
+        :return: json
+        """
+        try:
+            args = SearchQuerySchema().load(request.args)
+        except ValidationError as error:
+            raise BadRequest(error.messages)
+
+        results, total = SearchService.search(
+            user_id=current_user.id,
+            text=args['q'].strip(),
+            page=args['page'],
+            per_page=args['per_page'],
+            kinds=(args['kind'],) if args['kind'] else SEARCH_KINDS
+        )
+
+        return jsonify({
+            "results": results,
+            "page": args['page'],
+            "perPage": args['per_page'],
+            "total": total
+        })
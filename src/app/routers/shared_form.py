@@ -71,70 +71,47 @@ class SharedFormAPI(Resource):
         if errors:
             raise BadRequest(errors)
 
-        payload = SharedFormService.get_token_initial_payload(
+        # resolve all groups and their members at once
+        groups = GroupService.get_groups_emails(groups_ids)
+
+        # sign tokens for users_emails and every group in a batch
+        users_emails = request.json.get('users_emails')
+        tokens = SharedFormService.create_tokens(
             form_id=form_id,
+            groups_ids=list(groups),
+            with_users_token=bool(users_emails),
             exp=request.json.get('exp'),
             nbf=request.json.get('nbf')
         )
+        if tokens is None:
+            raise BadRequest("Cannot create token instances")
+        users_token, groups_tokens = tokens
 
-        response = {
-            'groupsTokens': {},
-            'usersToken': None
-        }
-
-        # handling users_emails
-        users_emails = request.json.get('users_emails')
-        if users_emails:
-            token = generate_token(payload)
-            token_instance = TokenService.create(
-                token=token,
-                form_id=form_id
-            )
-
-            response['usersToken'] = token_instance.token if token_instance else None
-
-            # send emails with token to users_emails
+        # send emails with token to users_emails
+        if users_token is not None:
             call_share_form_to_users_task(
                 users_emails,
                 form.title,
-                token
-            )
-
-        # handling groups_ids
-        for group_id in groups_ids:
-            group = GroupService.get_by_id(group_id)
-            if group is None:
-                response['groupsTokens'][str(group_id)] = None
-                continue
-
-            users = GroupService.get_users_by_group(group_id)
-            if users is None:
-                response['groupsTokens'][str(group_id)] = None
-                continue
-            users_emails = list(map(lambda user: user['email'], users))
-
-            group_payload = dict(payload)
-            group_payload['group_id'] = group_id
-            token = generate_token(group_payload)
-
-            token_instance = TokenService.create(
-                token=token,
-                form_id=form_id
+                users_token
             )
-            if token_instance is None:
-                response['groupsTokens'][str(group_id)] = None
-                continue
 
-            response['groupsTokens'][str(group_id)] = token_instance.token
-
-            # send emails with token to group_users_emails
+        # send emails with token to group_users_emails
+        for group_id, token in groups_tokens.items():
+            group = groups[group_id]
             call_share_form_to_group_task(
-                users_emails,
-                group.name,
+                group['emails'],
+                group['name'],
                 form.title,
                 token
             )
 
+        response = {
+            'groupsTokens': {
+                str(group_id): groups_tokens.get(group_id)
+                for group_id in groups_ids
+            },
+            'usersToken': users_token
+        }
         response = jsonify(response)
         response.status_code = 201
         return response
@@ -3,17 +3,13 @@ TokenCheck API
 """
 
 from werkzeug.exceptions import BadRequest
-from flask import Response
+from flask import Response, jsonify
 from flask_restx import Resource
 from flask_login import current_user
 
 from app import API
-from app.services import (
-    FormService,
-    TokenService,
-    GroupService,
-    FormResultService
-)
+from app.helper.rate_limiter import RateLimiter, rate_limit
+from app.services import TokenService, FormService, FormResultService
 
 
 TOKEN_CHECK_NS = API.namespace('tokens/<string:token>', description='TokenCheck APIs')
@@ -31,12 +27,14 @@ class TokenCheckAPI(Resource):
     @API.doc(
         responses={
             204: 'No Content',
-            400: 'Invalid data'
+            400: 'Invalid data',
+            429: 'Too many requests'
         },
         params={
             'token': 'token to check'
         }
     )
+    @rate_limit
     #pylint: disable=no-self-use
     def get(self, token):
         """
@@ -44,28 +42,10 @@ class TokenCheckAPI(Resource):
 
         :param token: token to check
         """
-        token_instance = TokenService.get_by_token(token)
-        if token_instance is None:
-            raise BadRequest('Wrong token')
-
-        token_data = TokenService.decode_token_for_check(token)
+        token_data = TokenService.resolve(token)
         if token_data is None:
-            raise BadRequest('Wrong token') # Not enough token segments
-
-        is_correct, _ = TokenService.validate_data(token_data)
-        if not is_correct:
-            raise BadRequest('Wrong token') # Token isn't valid
-
-        form_id = token_data.get('form_id')
-        form = FormService.get_by_id(form_id)
-        if form is None:
-            raise BadRequest('Wrong token') # Form doesn't exist
-
-        group_id = token_data.get('group_id')
-        if group_id is not None:
-            group = GroupService.get_by_id(group_id)
-            if group is None:
-                raise BadRequest('Wrong token') # Group doesn't exist
+            raise BadRequest('Wrong token')
+        RateLimiter.check(form_id=token_data['form_id'])
 
         return Response(status=204)
 
@@ -82,28 +62,82 @@ class TokenUserCheckAPI(Resource):
     @API.doc(
         responses={
             204: 'No Content',
-            400: 'Invalid data'
+            400: 'Invalid data',
+            429: 'Too many requests'
         },
         params={
             'token': 'token to form'
         }
     )
+    @rate_limit
     #pylint: disable=no-self-use
     def get(self, token):
         """
         Check whether user can answer to form by using this token
         :param token: token to check
         """
-        token_instance = TokenService.get_by_token(token)
-        if token_instance is None:
+        token_data = TokenService.resolve(token)
+        if token_data is None:
             raise BadRequest("Token doesn't exist")
+        RateLimiter.check(form_id=token_data['form_id'])
 
         if current_user.is_authenticated:
             user_can_answer = FormResultService.check_whether_user_passed_form(
                 user_id=current_user.id,
-                token_id=token_instance.id,
+                token_id=token_data['token_id']
             )
             if not user_can_answer:
                 raise BadRequest("You have already passed this form using this token")
 
         return Response(status=204)
+
+
+@TOKEN_CHECK_NS.route("/form")
+class TokenFormAPI(Resource):
+    """
+    TokenForm API
+
+    url: '/tokens/{token}/form'
+    methods: get
+    """
+
+    @API.doc(
+        responses={
+            200: 'OK',
+            400: 'Invalid data',
+            429: 'Too many requests'
+        },
+        params={
+            'token': 'token to form'
+        }
+    )
+    @rate_limit
+    #pylint: disable=no-self-use
+    def get(self, token):
+        """
+        Get everything respondent needs to open shared form in one request:
+        whether token is valid, whether user can answer and form definition
+
+        :param token: token to form
+        """
+        token_data = TokenService.resolve(token)
+        if token_data is None:
+            raise BadRequest('Wrong token')
+        RateLimiter.check(form_id=token_data['form_id'])
+
+        user_can_answer = True
+        if current_user.is_authenticated:
+            user_can_answer = FormResultService.check_whether_user_passed_form(
+                user_id=current_user.id,
+                token_id=token_data['token_id']
+            )
+
+        form = FormService.get_definition(token_data['form_id'])
+        if form is None:
+            raise BadRequest('Wrong token')
+
+        return jsonify({
+            'isValid': True,
+            'canAnswer': user_can_answer,
+            'form': form
+        })
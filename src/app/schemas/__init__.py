@@ -15,7 +15,8 @@ from .field import (
     FieldCheckboxPutSchema,
     FieldTextAreaPutSchema,
     FieldPutSchema,
-    BasicField
+    BasicField,
+    FieldLibraryQuerySchema
 )
 from .form_field import FormFieldSchema, FormFieldResponseSchema
 from .setting_autocomplete import SettingAutocompleteSchema
@@ -25,3 +26,4 @@ from .group import BaseGroupSchema, GroupPutSchema, GroupPostSchema
 from .shared_field import SharedFieldPostSchema, SharedFieldResponseSchema
 from .shared_form import SharedFormFlagsSchema, SharedFormPostSchema
 from .token import TokenSchema
+from .search import SearchQuerySchema
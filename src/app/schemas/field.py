@@ -1,7 +1,7 @@
 """
 Field schemas
 """
-from marshmallow import fields, validates_schema, ValidationError
+from marshmallow import fields, validate, validates_schema, ValidationError
 
 from app import MA
 from app.helper.choice_options_validator import (
@@ -9,7 +9,12 @@ from app.helper.choice_options_validator import (
     validate_repeats_of_choice_options
 )
 from app.helper.range_validator import validate_range_checkbox, validate_range_text
-from app.helper.constants import MAX_FIELD_TYPE, MIN_FIELD_TYPE
+from app.helper.constants import (
+    LIBRARY_PER_PAGE,
+    MAX_FIELD_TYPE,
+    MAX_LIBRARY_PER_PAGE,
+    MIN_FIELD_TYPE
+)
 from app.helper.enums import FieldType
 from app.schemas.range import RangeSchema
 from app.schemas.setting_autocomplete import SettingAutocompleteSchema
@@ -403,3 +408,28 @@ class FieldTextAreaPutSchema(BasicField):
         fields = ("updated_name",)
 
     updated_name = fields.Str(required=False, data_key="updatedName")
+
+
+class FieldLibraryQuerySchema(MA.Schema):
+    """
+    Schema of query parameters of field library page
+    """
+
+    class Meta:
+        """
+        Fields of field library query schema
+        """
+        fields = ("page", "per_page", "field_type", "name")
+
+    page = fields.Integer(missing=1, validate=validate.Range(min=1))
+    per_page = fields.Integer(
+        missing=LIBRARY_PER_PAGE,
+        validate=validate.Range(min=1, max=MAX_LIBRARY_PER_PAGE),
+        data_key="perPage"
+    )
+    field_type = fields.Integer(
+        missing=None,
+        validate=validate.OneOf([field_type.value for field_type in FieldType]),
+        data_key="fieldType"
+    )
+    name = fields.Str(missing=None)
@@ -0,0 +1,28 @@
+"""
+Search schemas
+"""
+from marshmallow import fields, validate
+
+from app import MA
+from app.helper.constants import MAX_SEARCH_PER_PAGE, SEARCH_KINDS, SEARCH_PER_PAGE
+
+
+class SearchQuerySchema(MA.Schema):
+    """
+    Schema of search query parameters
+    """
+
+    class Meta:
+        """
+        Fields of search query schema
+        """
+        fields = ("q", "kind", "page", "per_page")
+
+    q = fields.Str(required=True, validate=validate.Length(min=2, max=255))
+    kind = fields.Str(missing=None, validate=validate.OneOf(SEARCH_KINDS))
+    page = fields.Integer(missing=1, validate=validate.Range(min=1))
+    per_page = fields.Integer(
+        missing=SEARCH_PER_PAGE,
+        validate=validate.Range(min=1, max=MAX_SEARCH_PER_PAGE),
+        data_key="perPage"
+    )
@@ -3,12 +3,14 @@ Services init module
 """
 
 from .form_result import FormResultService
+from .autocomplete_mirror import AutocompleteMirrorService
 from .field_range import FieldRangeService
 from .shared_field import SharedFieldService
 from .user import UserService
 from .setting_autocomplete import SettingAutocompleteService
 from .range import RangeService
 from .field import FieldService
+from .field_library import FieldLibraryService
 from .form import FormService
 from .form_field import FormFieldService
 from .choice_option import ChoiceOptionService
@@ -16,3 +18,6 @@ from .group import GroupService
 from .group_user import GroupUserService
 from .token import TokenService
 from .shared_form import SharedFormService
+from .form_result_archive import FormResultArchiveService
+from .sheet_reconciliation import SheetReconciliationService
+from .search import SearchService
@@ -0,0 +1,246 @@
+"""
+Autocomplete mirror operations.
+"""
+
+import hashlib
+import json
+import time
+
+from app import APP, LOGGER
+from app.helper.redis_manager import RedisManager
+from app.helper.sheet_manager import SheetManager
+from app.models import SettingAutocomplete
+from app.services.form_field import FormFieldService
+
+
+class AutocompleteMirrorService:
+    """
+    Class with operations on Redis mirror of autocomplete sheet ranges.
+    Mirror is refreshed by celery beat, so respondents don't read sheets
+    and sheets traffic depends on how often they are synced, not on traffic
+    """
+
+    @staticmethod
+    def get_key(field_id):
+        """
+        Get Redis key of field mirror
+
+        :param field_id:
+        :return: str
+        """
+        return f'autocomplete_mirror:field_id:{field_id}'
+
+    @staticmethod
+    def get_range(setting):
+        """
+        Get sheet range of autocomplete setting
+
+        :param setting: SettingAutocomplete object
+        :return: (spreadsheet_id, from_row, to_row)
+        """
+        return (
+            SheetManager.get_sheet_id_from_url(setting.data_url),
+            setting.from_row,
+            setting.to_row
+        )
+
+    @staticmethod
+    def get_hash(values):
+        """
+        Get content hash of sheet values
+
+        :param values: list
+        :return: str
+        """
+        return hashlib.sha256(json.dumps(values).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get(setting):
+        """
+        Get fresh mirror of setting range.
+        Mirror of other range (setting was updated) or older than
+        AUTOCOMPLETE_MIRROR_MAX_AGE isn't returned
+
+        :param setting: SettingAutocomplete object
+        :return: dict {'values', 'hash', 'range', 'synced', 'changed'} or None
+        """
+        mirror = RedisManager.get(AutocompleteMirrorService.get_key(setting.field_id), 'data')
+        if mirror is None or mirror['range'] != AutocompleteMirrorService.get_range(setting):
+            return None
+        if time.time() - mirror['synced'] > APP.config['AUTOCOMPLETE_MIRROR_MAX_AGE']:
+            return None
+        return mirror
+
+    @staticmethod
+    def save(setting, values, previous=None, modified=None):
+        """
+        Save values read from sheet to mirror
+
+        :param setting: SettingAutocomplete object
+        :param values: list of values
+        :param previous: mirror saved before
+        :param modified: Drive modifiedTime of sheet got before values were read
+        :return: True if values changed since previous mirror
+        """
+        now = time.time()
+        content_hash = AutocompleteMirrorService.get_hash(values)
+        sheet_range = AutocompleteMirrorService.get_range(setting)
+        changed = previous is None or previous['hash'] != content_hash \
+            or previous['range'] != sheet_range
+        RedisManager.set(
+            AutocompleteMirrorService.get_key(setting.field_id),
+            {
+                'values': values,
+                'hash': content_hash,
+                'range': sheet_range,
+                'synced': now,
+                'changed': now if changed else previous['changed'],
+                'modified': modified
+            },
+            expire_time=APP.config['AUTOCOMPLETE_MIRROR_EXPIRE_TIME']
+        )
+        return changed
+
+    @staticmethod
+    def get_field_values(setting):
+        """
+        Get values of setting from mirror, read them from sheet if mirror is missing or stale
+
+        :param setting: SettingAutocomplete object
+        :return: (list of values or None, synced timestamp or None)
+        """
+        mirror = AutocompleteMirrorService.get(setting)
+        if mirror is not None:
+            return mirror['values'], mirror['synced']
+
+        spreadsheet_id, from_row, to_row = AutocompleteMirrorService.get_range(setting)
+        values = SheetManager.get_data_with_range(
+            spreadsheet_id=spreadsheet_id,
+            from_row=from_row,
+            to_row=to_row
+        )
+        if values is None:
+            return None, None
+        AutocompleteMirrorService.save(setting, values)
+        return values, time.time()
+
+    @staticmethod
+    def get_values(settings):
+        """
+        Get values of settings from mirror, missing and stale ones
+        are read from sheets at once and saved to mirror
+
+        :param settings: list of SettingAutocomplete objects
+        :return: dict {field_id: (list of values or None, synced timestamp or None)}
+        """
+        result = {}
+        missing = []
+        for setting in settings:
+            mirror = AutocompleteMirrorService.get(setting)
+            if mirror is not None:
+                result[setting.field_id] = (mirror['values'], mirror['synced'])
+            else:
+                missing.append(setting)
+
+        if missing:
+            sheet_values = SheetManager.get_ranges(
+                AutocompleteMirrorService.get_range(setting) for setting in missing
+            )
+            for setting in missing:
+                values = sheet_values.get(AutocompleteMirrorService.get_range(setting))
+                if values is None:
+                    result[setting.field_id] = (None, None)
+                    continue
+                AutocompleteMirrorService.save(setting, values)
+                result[setting.field_id] = (values, time.time())
+        return result
+
+    @staticmethod
+    def get_fields_values(fields_ids):
+        """
+        Get values of autocomplete fields from mirror,
+        missing ones are read with one batchGet per sheet
+
+        :param fields_ids: ids of autocomplete fields
+        :return: dict {field_id: (list of values or None, synced timestamp or None)}
+        """
+        if not fields_ids:
+            return {}
+
+        settings = SettingAutocomplete.query.filter(
+            SettingAutocomplete.field_id.in_(fields_ids)
+        ).all()
+        return AutocompleteMirrorService.get_values(settings)
+
+    @staticmethod
+    def is_modified(setting, previous, modified):
+        """
+        Check whether range should be read again: its sheet was modified
+        since previous mirror was read, or it is unknown
+
+        :param setting: SettingAutocomplete object
+        :param previous: mirror saved before or None
+        :param modified: Drive modifiedTime of sheet or None
+        :return: bool
+        """
+        return previous is None or modified is None \
+            or previous['range'] != AutocompleteMirrorService.get_range(setting) \
+            or previous.get('modified') != modified
+
+    @staticmethod
+    def sync():
+        """
+        Update mirror of all autocomplete ranges. Ranges of sheets not modified
+        since they were read, according to Drive modifiedTime, are only marked synced.
+        Other ranges are read with one batchGet per sheet.
+        Definitions of forms are invalidated only for fields which values changed,
+        mirror of range that couldn't be read is kept
+
+        :return: dict with amount of changed, unchanged, skipped and failed fields
+        """
+        settings = SettingAutocomplete.query.all()
+        mirrors = {
+            setting.field_id: RedisManager.get(
+                AutocompleteMirrorService.get_key(setting.field_id), 'data'
+            )
+            for setting in settings
+        }
+        modified = {}
+        if APP.config['AUTOCOMPLETE_CHECK_MODIFIED']:
+            modified = SheetManager.get_modified_times(
+                AutocompleteMirrorService.get_range(setting)[0] for setting in settings
+            )
+
+        skipped, settings_to_read = [], []
+        for setting in settings:
+            previous = mirrors[setting.field_id]
+            sheet_modified = modified.get(AutocompleteMirrorService.get_range(setting)[0])
+            if AutocompleteMirrorService.is_modified(setting, previous, sheet_modified):
+                settings_to_read.append(setting)
+            else:
+                AutocompleteMirrorService.save(setting, previous['values'], previous,
+                                               sheet_modified)
+                skipped.append(setting.field_id)
+
+        sheet_values = SheetManager.get_ranges(
+            AutocompleteMirrorService.get_range(setting) for setting in settings_to_read
+        )
+        changed, unchanged, failed = [], [], []
+        for setting in settings_to_read:
+            sheet_range = AutocompleteMirrorService.get_range(setting)
+            values = sheet_values.get(sheet_range)
+            if values is None:
+                failed.append(setting.field_id)
+            elif AutocompleteMirrorService.save(setting, values, mirrors[setting.field_id],
+                                                modified.get(sheet_range[0])):
+                changed.append(setting.field_id)
+            else:
+                unchanged.append(setting.field_id)
+
+        if changed:
+            FormFieldService.invalidate_definitions(changed)
+        if failed:
+            LOGGER.warning('Could not sync autocomplete values of fields %s', failed)
+
+        return {'changed': len(changed), 'unchanged': len(unchanged),
+                'skipped': len(skipped), 'failed': len(failed)}
@@ -5,6 +5,7 @@ from app import DB
 from app.models import ChoiceOption
 from app.helper.decorators import transaction_decorator
 from app.helper.errors import ChoiceOptionNotExist
+from app.services.form_field import FormFieldService
 
 
 class ChoiceOptionService:
@@ -27,6 +28,7 @@ class ChoiceOptionService:
         if options:
             return options[0]
         DB.session.add(instance)
+        FormFieldService.invalidate_definitions([field_id])
         return instance
 
     @staticmethod
@@ -81,6 +83,7 @@ class ChoiceOptionService:
         if option_text is not None:
             instance.option_text = option_text
         DB.session.merge(instance)
+        FormFieldService.invalidate_definitions({instance.field_id, field_id} - {None})
         return instance
 
     @staticmethod
@@ -96,6 +99,7 @@ class ChoiceOptionService:
         if instance is None:
             raise ChoiceOptionNotExist()
         DB.session.delete(instance)
+        FormFieldService.invalidate_definitions([instance.field_id])
         return True
 
     @staticmethod
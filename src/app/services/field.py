@@ -14,9 +14,8 @@ from app.helper.errors import (
     FieldRangeNotDeleted,
     ChoiceOptionNotExist
 )
-from app.helper.sheet_manager import SheetManager
 from app.helper.range_validator import validate_range_text
-from app.models import Field
+from app.models import Field, SharedField
 from app.schemas import (
     BasicField,
     FieldPostSchema,
@@ -31,7 +30,7 @@ from app.schemas import (
     FieldAutocompletePutSchema,
     FieldTextAreaPutSchema
 )
-from app.services.shared_field import SharedFieldService
+from app.services.autocomplete_mirror import AutocompleteMirrorService
 from app.services.choice_option import ChoiceOptionService
 from app.services.field_range import FieldRangeService
 from app.services.range import RangeService
@@ -140,6 +139,7 @@ class FieldService:
         if is_strict is not None:
             instance.is_strict = is_strict
         DB.session.merge(instance)
+        FormFieldService.invalidate_definitions([field_id])
         return instance
 
     @staticmethod
@@ -674,11 +674,13 @@ class FieldService:
         return data
 
     @staticmethod
-    def _get_autocomplete_additional_options(field_id):
+    def _get_autocomplete_additional_options(field_id, autocomplete_values=None):
         """
         Check for autocomplete additional options
 
         :param field_id:
+        :param autocomplete_values: dict got with AutocompleteMirrorService.get_fields_values,
+            values are taken from mirror if field isn't in it
         :return: dict
         """
         data = {}
@@ -694,23 +696,25 @@ class FieldService:
             'toRow': settings_autocomplete.to_row
         }
 
-        # add hashing later
-        sheet_id = SheetManager.get_sheet_id_from_url(settings_autocomplete.data_url)
-        data['values'] = SheetManager.get_data_with_range(
-            spreadsheet_id=sheet_id,
-            from_row=settings_autocomplete.from_row,
-            to_row=settings_autocomplete.to_row
-        )
+        if autocomplete_values is not None and field_id in autocomplete_values:
+            values, synced = autocomplete_values[field_id]
+        else:
+            values, synced = AutocompleteMirrorService.get_field_values(settings_autocomplete)
+        data['values'] = values
+        # values may be stale by AUTOCOMPLETE_SYNC_INTERVAL
+        data['valuesSyncedAt'] = synced
 
         return data
 
     @staticmethod
-    def get_additional_options(field_id, field_type):
+    def get_additional_options(field_id, field_type, autocomplete_values=None):
         """
         Check if field has other additional options
 
         :param field_id:
         :param field_type:
+        :param autocomplete_values: dict got with AutocompleteMirrorService.get_fields_values
+            for many fields
         :return: dict of options
         E.G. data = {'range' = {'min' : 0, 'max' : 100}
              data = {'choice_options' = ['man', 'woman']}
@@ -728,7 +732,9 @@ class FieldService:
                 data = FieldService._get_choice_additional_options(field_id)
 
             elif field_type == FieldType.Autocomplete.value:
-                data = FieldService._get_autocomplete_additional_options(field_id)
+                data = FieldService._get_autocomplete_additional_options(
+                    field_id, autocomplete_values
+                )
 
         except FieldNotExist:
             LOGGER.error('Could not GET additional options')
@@ -988,9 +994,6 @@ class FieldService:
         :param user_id:
         :return:
         """
-        result = []
-        shared_fields = SharedFieldService.filter(user_id=user_id)
-        for shared_field in shared_fields:
-            field = FieldService.get_by_id(shared_field.field_id)
-            result.append(field)
-        return result
+        return Field.query.join(
+            SharedField, SharedField.field_id == Field.id
+        ).filter(SharedField.user_id == user_id).all()
@@ -0,0 +1,142 @@
+"""
+Field library operations.
+"""
+
+from sqlalchemy import and_, or_
+
+from app import DB
+from app.helper.enums import FieldType
+from app.models import (
+    ChoiceOption,
+    Field,
+    FieldRange,
+    Range,
+    SettingAutocomplete,
+    SharedField,
+    User
+)
+from app.services.field import FieldService
+from app.services.search import SearchService
+from app.services.user import UserService
+
+
+class FieldLibraryService:
+    """
+    Class with operations over library of fields owned by user and shared to him
+    """
+
+    @staticmethod
+    def get_library(user_id, page, per_page, field_type=None, name=None):
+        """
+        Get page of fields owned by or shared to user with their options and owners.
+        Options of all fields on page are loaded at once, so amount of queries
+        doesn't depend on page size. Autocomplete values aren't fetched from sheets,
+        they can be got with field GET
+
+        :param user_id:
+        :param page: page number starting from 1
+        :param per_page: amount of fields on page
+        :param field_type: return only fields of this type
+        :param name: return only fields which name contains it
+        :return: list of fields json, total amount of fields
+        """
+        query = Field.query.outerjoin(
+            SharedField,
+            and_(SharedField.field_id == Field.id, SharedField.user_id == user_id)
+        ).filter(or_(Field.owner_id == user_id, SharedField.id.isnot(None)))
+        if field_type is not None:
+            query = query.filter(Field.field_type == field_type)
+        if name:
+            query = query.filter(
+                Field.name.ilike(f'%{SearchService.escape_like(name)}%', escape='\\')
+            )
+
+        pagination = query.order_by(Field.created.desc(), Field.id.desc()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        fields = pagination.items
+        if not fields:
+            return [], pagination.total
+
+        options = FieldLibraryService._get_options([field.id for field in fields])
+        owners = {
+            owner.id: owner
+            for owner in User.query.filter(
+                User.id.in_({field.owner_id for field in fields})
+            ).all()
+        }
+
+        result = []
+        for field in fields:
+            field_json = FieldLibraryService._to_json(field, options)
+            field_json['owner'] = UserService.to_json(owners.get(field.owner_id))
+            if field.owner_id == user_id:
+                field_json['owner']['current'] = True
+            result.append(field_json)
+
+        return result, pagination.total
+
+    @staticmethod
+    def _get_options(fields_ids):
+        """
+        Get ranges, choice options and autocomplete settings of fields at once
+
+        :param fields_ids: list of ids of fields
+        :return: dict {'range': {field_id: Range}, 'choiceOptions': {field_id: list of texts},
+            'settingAutocomplete': {field_id: SettingAutocomplete}}
+        """
+        ranges = dict(DB.session.query(FieldRange.field_id, Range).join(
+            Range, Range.id == FieldRange.range_id
+        ).filter(FieldRange.field_id.in_(fields_ids)).all())
+
+        choice_options = {}
+        for option in ChoiceOption.query.filter(
+                ChoiceOption.field_id.in_(fields_ids)
+        ).order_by(ChoiceOption.id).all():
+            choice_options.setdefault(option.field_id, []).append(option.option_text)
+
+        settings = {
+            setting.field_id: setting
+            for setting in SettingAutocomplete.query.filter(
+                SettingAutocomplete.field_id.in_(fields_ids)
+            ).all()
+        }
+
+        return {
+            'range': ranges,
+            'choiceOptions': choice_options,
+            'settingAutocomplete': settings
+        }
+
+    @staticmethod
+    def _to_json(field, options):
+        """
+        Get json of library field with its options
+
+        :param field: Field object
+        :param options: dict got with _get_options
+        :return: dict
+        """
+        field_json = FieldService.field_to_json(field)
+
+        if field.field_type in (FieldType.Number.value, FieldType.Text.value) \
+                and field.is_strict:
+            field_json['isStrict'] = True
+        if field.id in options['range']:
+            field_range = options['range'][field.id]
+            field_json['range'] = {
+                'min': field_range.min,
+                'max': field_range.max
+            }
+        if field.id in options['choiceOptions']:
+            field_json['choiceOptions'] = options['choiceOptions'][field.id]
+        if field.id in options['settingAutocomplete']:
+            setting = options['settingAutocomplete'][field.id]
+            field_json['settingAutocomplete'] = {
+                'dataUrl': setting.data_url,
+                'sheet': setting.sheet,
+                'fromRow': setting.from_row,
+                'toRow': setting.to_row
+            }
+
+        return field_json
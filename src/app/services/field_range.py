@@ -6,6 +6,7 @@ from app.models.field_range import FieldRange
 from app import DB
 from app.helper.decorators import transaction_decorator
 from app.helper.errors import FieldRangeNotExist
+from app.services.form_field import FormFieldService
 
 
 class FieldRangeService:
@@ -25,6 +26,7 @@ class FieldRangeService:
         """
         field_range = FieldRange(field_id=field_id, range_id=range_id)
         DB.session.add(field_range)
+        FormFieldService.invalidate_definitions([field_id])
         return field_range
 
     @staticmethod
@@ -65,6 +67,7 @@ class FieldRangeService:
         if range_id is not None:
             field_range.range_id = range_id
         DB.session.merge(field_range)
+        FormFieldService.invalidate_definitions([field_id])
         return field_range
 
     @staticmethod
@@ -80,4 +83,5 @@ class FieldRangeService:
         if field_range is None:
             raise FieldRangeNotExist()
         DB.session.delete(field_range)
+        FormFieldService.invalidate_definitions([field_id])
         return True
@@ -3,10 +3,15 @@ Form operations.
 """
 
 from app import DB, LOGGER
+from app.helper.enums import FieldType
 from app.helper.errors import FormNotExist
+from app.helper.redis_manager import RedisManager
 from app.models import Form
 from app.schemas import FormSchema
-from app.helper.decorators import transaction_decorator
+from app.helper.decorators import read_only, transaction_decorator
+from app.services.autocomplete_mirror import AutocompleteMirrorService
+from app.services.field import FieldService
+from app.services.form_field import FormFieldService
 
 
 class FormService:
@@ -83,6 +88,7 @@ class FormService:
             form.is_published = is_published
 
         DB.session.merge(form)
+        RedisManager.delete(f'form_definition:form_id:{form_id}')
         return form
 
     @staticmethod
@@ -100,9 +106,11 @@ class FormService:
             raise FormNotExist()
 
         DB.session.delete(form)
+        RedisManager.delete(f'form_definition:form_id:{form_id}')
         return True
 
     @staticmethod
+    @read_only
     @transaction_decorator
     def filter(form_id=None,  # pylint: disable=too-many-arguments
                owner_id=None,
@@ -193,3 +201,45 @@ class FormService:
             return None
 
         return form.result_url
+
+    @staticmethod
+    def get_definition(form_id):
+        """
+        Get form with all its fields and fields options in json format.
+        Definition is cached, so respondents render form without
+        rebuilding it on every request
+
+        :param form_id:
+        :return: dict or None
+        """
+        key = f'form_definition:form_id:{form_id}'
+        definition = RedisManager.get(key, 'data')
+        if definition is not None:
+            return definition
+
+        form = FormService.get_by_id(form_id)
+        if form is None:
+            return None
+
+        definition = FormService.to_json(form, many=False)
+        definition['formFields'] = []
+        form_fields = [(form_field, FieldService.get_by_id(form_field.field_id))
+                       for form_field in FormFieldService.filter(form_id=form_id)]
+        # values of all autocomplete fields are read with one request per sheet
+        autocomplete_values = AutocompleteMirrorService.get_fields_values([
+            field.id for _, field in form_fields
+            if field.field_type == FieldType.Autocomplete.value
+        ])
+        for form_field, field in form_fields:
+            field_json = FieldService.field_to_json(field, many=False)
+            field_extra_options = FieldService.get_additional_options(
+                field.id, field.field_type, autocomplete_values
+            )
+            if field_extra_options:
+                field_json.update(field_extra_options)
+            form_field_json = FormFieldService.response_to_json(form_field, many=False)
+            form_field_json['field'] = field_json
+            definition['formFields'].append(form_field_json)
+
+        RedisManager.set(key, definition)
+        return definition
@@ -39,6 +39,11 @@ class FormFieldService:
         if result is not None:
             RedisManager.delete(key)
 
+        key = f'form_definition:form_id:{form_id}'
+        result = RedisManager.get(key, 'data')
+        if result is not None:
+            RedisManager.delete(key)
+
         return instance
 
     @staticmethod
@@ -129,6 +134,12 @@ class FormFieldService:
         if result is not None:
             RedisManager.delete(key)
 
+        # delete form definition cache with this object
+        key = f'form_definition:form_id:{instance.form_id}'
+        result = RedisManager.get(key, 'data')
+        if result is not None:
+            RedisManager.delete(key)
+
         return instance
 
     @staticmethod
@@ -145,13 +156,32 @@ class FormFieldService:
             raise FormFieldNotExist()
         DB.session.delete(instance)
 
-        key = f'form_fields:form_id:{form_field_id}'
+        key = f'form_fields:form_id:{instance.form_id}'
+        result = RedisManager.get(key, 'data')
+        if result is not None:
+            RedisManager.delete(key)
+
+        key = f'form_definition:form_id:{instance.form_id}'
         result = RedisManager.get(key, 'data')
         if result is not None:
             RedisManager.delete(key)
 
         return True
 
+    @staticmethod
+    def invalidate_definitions(field_ids):
+        """
+        Delete cached definitions of forms with fields,
+        so they are rebuilt after fields or their options are changed
+
+        :param field_ids: list of field ids or query selecting them
+        """
+        form_ids = {form_field.form_id for form_field in FormField.query.filter(
+            FormField.field_id.in_(field_ids)
+        ).all()}
+        for form_id in form_ids:
+            RedisManager.delete(f'form_definition:form_id:{form_id}')
+
     @staticmethod
     def to_json(data, many=False):
         """
@@ -2,14 +2,21 @@
 FormResult service
 """
 
+from collections import defaultdict
+
 from app.helper.answer_validation import is_numeric
 from app.helper.constants import MAX_TEXT_LENGTH, MIN_POSTGRES_INT, MAX_POSTGRES_INT
 from app.helper.enums import FieldType
+from app.helper.form_events import FormEvents
+from app.helper.form_result_stream import FormResultStream
 from app.helper.redis_manager import RedisManager
-from app.models import FormResult, Range
+from app.helper.sheet_manager import SheetManager
+from app.helper.timing import timed
+from app.models import FormResult, FormResultSubmission, FormResultUser, Range
 from app import DB
 from app.helper.decorators import transaction_decorator
 from app.schemas import FormResultPostSchema, FormResultGetSchema
+from app.services.autocomplete_mirror import AutocompleteMirrorService
 from app.services.field import FieldService
 from app.services.form_field import FormFieldService
 
@@ -20,10 +27,13 @@ class FormResultService:
     """
 
     @staticmethod
+    @timed('create_result')
     @transaction_decorator
     def create(user_id, token_id, answers):
         """
-        Create FormResult model
+        Create FormResult model.
+        Result of user is saved with FormResultUser in one transaction,
+        so unique_user_token rejects second result of user by the same token
 
         :param user_id:
         :param token_id:
@@ -38,6 +48,8 @@ class FormResultService:
         )
 
         DB.session.add(form_result)
+        if user_id is not None:
+            DB.session.add(FormResultUser(user_id=user_id, token_id=token_id))
 
         key = f'form_results:user_id:{user_id}token_id:{token_id}'
         result = RedisManager.get(key, 'data')
@@ -51,6 +63,228 @@ class FormResultService:
 
         return form_result
 
+    @staticmethod
+    @transaction_decorator
+    def create_many(submissions):
+        """
+        Create FormResult models with one multi-row INSERT.
+        Batch with second result of user by the same token fails as a whole.
+        Ids of queued submissions are saved with results in the same transaction
+
+        :param submissions: list of dicts with user_id, token_id, answers
+            and optional submission_id
+        :return: list of created FormResult json in the same order or None
+        """
+        users = [{'user_id': submission['user_id'], 'token_id': submission['token_id']}
+                 for submission in submissions if submission['user_id'] is not None]
+        if users:
+            DB.session.execute(
+                FormResultUser.__table__.insert().values(users)  # pylint: disable=no-member
+            )
+
+        table = FormResult.__table__  # pylint: disable=no-member
+        rows = DB.session.execute(
+            table.insert().values([
+                {
+                    'user_id': submission['user_id'],
+                    'token_id': submission['token_id'],
+                    'answers': submission['answers']
+                }
+                for submission in submissions
+            ]).returning(
+                table.c.id,
+                table.c.user_id,
+                table.c.token_id,
+                table.c.answers,
+                table.c.created
+            )
+        ).fetchall()
+
+        queued = [{'submission_id': submission['submission_id'], 'result_id': row['id']}
+                  for submission, row in zip(submissions, rows)
+                  if submission.get('submission_id') is not None]
+        if queued:
+            DB.session.execute(
+                FormResultSubmission.__table__.insert().values(queued)  # pylint: disable=no-member
+            )
+
+        for submission in submissions:
+            RedisManager.delete(
+                f'form_results:user_id:{submission["user_id"]}token_id:{submission["token_id"]}'
+            )
+            RedisManager.delete(f'form_results:token_id:{submission["token_id"]}')
+
+        return [FormResultService.to_json(dict(row), many=False) for row in rows]
+
+    @staticmethod
+    def enqueue(  # pylint: disable=too-many-arguments
+            user_id,
+            token_id,
+            answers,
+            token,
+            sheet_id,
+            values,
+            form_id=None):
+        """
+        Queue validated submission to be inserted in batch
+
+        :param user_id:
+        :param token_id:
+        :param answers:
+        :param token: token submission was sent with
+        :param sheet_id: sheet to append values to
+        :param values: row to append to sheet
+        :param form_id: form to publish created result to
+        :return: submission id
+        """
+        return FormResultStream.publish({
+            'form_id': form_id,
+            'user_id': user_id,
+            'token_id': token_id,
+            'answers': answers,
+            'token': token,
+            'sheet_id': sheet_id,
+            'values': values
+        })
+
+    @staticmethod
+    def get_inserted(submission_ids):
+        """
+        Get results of queued submissions that are already inserted
+
+        :param submission_ids: list of submission ids
+        :return: dict {submission_id: created FormResult json}
+        """
+        rows = DB.session.query(FormResultSubmission.submission_id, FormResult).join(
+            FormResult, FormResult.id == FormResultSubmission.result_id
+        ).filter(FormResultSubmission.submission_id.in_(submission_ids)).all()
+        return {submission_id: FormResultService.to_json(result, many=False)
+                for submission_id, result in rows}
+
+    @staticmethod
+    @transaction_decorator
+    def delete_inserted(before):
+        """
+        Delete ids of submissions inserted before given time,
+        stream doesn't return them anymore
+
+        :param before: datetime
+        :return: amount of deleted ids
+        """
+        return FormResultSubmission.query.filter(
+            FormResultSubmission.created < before
+        ).delete(synchronize_session=False)
+
+    @staticmethod
+    def insert_queued(submissions):
+        """
+        Insert submissions in one batch,
+        submissions that can't be inserted are isolated by inserting one by one
+
+        :param submissions: list of queued submissions
+        :return: list of created FormResult json or None in the same order
+        """
+        if not submissions:
+            return []
+        results = FormResultService.create_many(submissions)
+        if results is None:
+            results = []
+            for submission in submissions:
+                result = FormResultService.create_many([submission])
+                results.append(result[0] if result else None)
+        return results
+
+    @staticmethod
+    def process_queued(count, block):
+        """
+        Insert one micro-batch of queued submissions, append them to sheets
+        with one request per sheet and save status of every submission.
+        Only results appended to sheet are published to form room.
+        Submission read again after crash isn't inserted twice and isn't appended again,
+        reconciliation appends it if it's missing in sheet
+
+        :param count: max amount of submissions in batch
+        :param block: milliseconds to wait for submissions
+        :return: amount of processed submissions
+        """
+        messages = FormResultStream.read(count=count, block=block)
+        if not messages:
+            return 0
+
+        submissions = [submission for _, submission in messages]
+        inserted = FormResultService.get_inserted(
+            [submission['submission_id'] for submission in submissions]
+        )
+        new = [submission for submission in submissions
+               if submission['submission_id'] not in inserted]
+
+        by_sheet = defaultdict(list)
+        for submission, result in zip(new, FormResultService.insert_queued(new)):
+            if result is None:
+                FormResultStream.set_status(
+                    submission['submission_id'],
+                    submission['token'],
+                    'failed',
+                    errors='Cannot create result instance'
+                )
+            else:
+                by_sheet[submission['sheet_id']].append((submission, result))
+
+        for submission in submissions:
+            if submission['submission_id'] in inserted:
+                FormResultStream.set_status(
+                    submission['submission_id'],
+                    submission['token'],
+                    'created',
+                    result=inserted[submission['submission_id']]
+                )
+
+        appended = FormResultService.append_queued(by_sheet)
+
+        FormResultStream.ack([message_id for message_id, _ in messages])
+        for form_id, form_results in appended.items():
+            FormEvents.publish_results(form_id, form_results)
+        return len(messages)
+
+    @staticmethod
+    def append_queued(by_sheet):
+        """
+        Append inserted submissions to sheets with one request per sheet
+        and save their status
+
+        :param by_sheet: dict {sheet_id: list of (submission, result json)}
+        :return: dict {form_id: list of result json appended to sheet}
+        """
+        appended = defaultdict(list)
+        for sheet_id, sheet_results in by_sheet.items():
+            rows = [list(submission['values']) + [result['id']]
+                    for submission, result in sheet_results]
+            errors = None
+            if SheetManager.append_rows(sheet_id, rows) is None:
+                errors = 'Cannot append result to sheet'
+            for submission, result in sheet_results:
+                FormResultStream.set_status(
+                    submission['submission_id'],
+                    submission['token'],
+                    'created',
+                    result=result,
+                    errors=errors
+                )
+                # results missing in sheet are published by nobody until appended
+                if errors is None and submission.get('form_id') is not None:
+                    appended[submission['form_id']].append(result)
+        return appended
+
+    @staticmethod
+    def get_submission_status(submission_id):
+        """
+        Get status of submission queued in batch mode
+
+        :param submission_id:
+        :return: dict with token, status, result, errors or None
+        """
+        return FormResultStream.get_status(submission_id)
+
     @staticmethod
     def get_by_id(form_result_id):
         """
@@ -69,7 +303,13 @@ class FormResultService:
         return result
 
     @staticmethod
-    def filter(form_result_id=None, user_id=None, token_id=None, answers=None, created=None):
+    def filter(  # pylint: disable=too-many-arguments
+            form_result_id=None,
+            user_id=None,
+            token_id=None,
+            answers=None,
+            created=None,
+            form_created=None):
         """
         FormResult filter method
 
@@ -78,6 +318,8 @@ class FormResultService:
         :param token_id:
         :param answers:
         :param created:
+        :param form_created: creation time of form results belong to,
+        lets PostgreSQL skip partitions older than form
         :return: list of FormResult objects or empty list
         """
         filter_data = {}
@@ -97,7 +339,11 @@ class FormResultService:
         result = RedisManager.get(key, 'data')
 
         if result is None:
-            result = FormResult.query.filter_by(**filter_data).all()
+            query = FormResult.query.filter_by(**filter_data)
+            if form_created is not None:
+                # doesn't change result, so it isn't part of cache key
+                query = query.filter(FormResult.created >= form_created)
+            result = query.all()
             RedisManager.set(key, result)
 
         return result
@@ -139,14 +385,24 @@ class FormResultService:
         """
         errors = {}
         form_fields = FormFieldService.filter(form_id=form_result["form_id"])
+        fields = {}
         for answer in form_result["answers"]:
             field_id = [form_field.field_id
                         for form_field in form_fields
                         if form_field.position == answer["position"]][0]
-            field = FieldService.get_by_id(field_id)
+            fields[answer["position"]] = FieldService.get_by_id(field_id)
+        # values of all autocomplete fields are read with one request per sheet
+        autocomplete_values = AutocompleteMirrorService.get_fields_values([
+            field.id for field in fields.values()
+            if field.field_type == FieldType.Autocomplete.value
+        ])
+
+        for answer in form_result["answers"]:
+            field = fields[answer["position"]]
             options = FieldService.get_additional_options(
                 field.id,
-                field.field_type
+                field.field_type,
+                autocomplete_values
             )
 
             if field.field_type == FieldType.Number.value:
@@ -314,6 +570,7 @@ class FormResultService:
         return True
 
     @staticmethod
+    @timed('validate')
     def validate_data(form_result):
         """
 
@@ -356,15 +613,16 @@ class FormResultService:
     @staticmethod
     def check_whether_user_passed_form(user_id, token_id):
         """
-        Check whether user already passed form by token
+        Check whether user already passed form by token.
+        Reads primary without cache, stale answer would let user answer twice
 
         :param user_id: id of user
         :param token_id: if of token
         :return: boolean variable whether user can answer
         """
-        form_results = FormResultService.filter(
+        passed = DB.session.query(FormResultUser.id).filter_by(
             user_id=user_id,
             token_id=token_id
-        )
-        user_can_answer = not bool(form_results)
+        ).first()
+        user_can_answer = passed is None
         return user_can_answer
@@ -0,0 +1,235 @@
+"""
+FormResultArchive service
+"""
+
+import gzip
+import json
+import os
+
+from app import APP, DB
+from app.helper.decorators import transaction_decorator
+from app.helper.redis_manager import RedisManager
+from app.models import FormResult, FormResultArchive, Token
+from app.services.form import FormService
+from app.services.token import TokenService
+
+ARCHIVE_COLUMNS = ('id', 'user_id', 'token_id', 'answers', 'created')
+
+
+class FormResultArchiveService:
+    """
+    Class to move results of inactive forms from form_results table
+    to compressed files and read them back
+    """
+
+    @staticmethod
+    def get_by_form_id(form_id):
+        """
+        Get archive manifest of form.
+        Forms without archive are cached too, so answers don't cost a query for them
+
+        :param form_id:
+        :return: FormResultArchive object or None
+        """
+        key = f'form_result_archive:form_id:{form_id}'
+        result = RedisManager.get(key, 'data')
+
+        if result is None:
+            result = FormResultArchive.query.filter_by(form_id=form_id).first()
+            # False marks form without archive, None means not cached
+            RedisManager.set(key, result if result is not None else False)
+
+        return result or None
+
+    @staticmethod
+    def is_form_inactive(form_id):
+        """
+        Check whether all tokens of form have expired
+
+        :param form_id:
+        :return: True if form has tokens and none of them can be used anymore
+        """
+        tokens = TokenService.filter(form_id=form_id)
+        if not tokens:
+            return False
+
+        for token in tokens:
+            token_data = TokenService.decode_token_for_check(token.token)
+            if token_data is None:
+                continue
+            # token that is not active yet still can be used later
+            if TokenService.is_active({'exp': token_data.get('exp'), 'nbf': None}):
+                return False
+        return True
+
+    @staticmethod
+    def get_forms_with_results():
+        """
+        Get ids of forms which still have results in form_results table
+
+        :return: list of form ids
+        """
+        rows = DB.session.query(Token.form_id).join(
+            FormResult, FormResult.token_id == Token.id
+        ).distinct().all()
+        return [row.form_id for row in rows]
+
+    @staticmethod
+    def archive_inactive_forms():
+        """
+        Archive results of every form whose tokens have all expired
+
+        :return: list of archived form ids
+        """
+        archived = []
+        for form_id in FormResultArchiveService.get_forms_with_results():
+            if not FormResultArchiveService.is_form_inactive(form_id):
+                continue
+            if FormResultArchiveService.archive_form(form_id) is not None:
+                archived.append(form_id)
+        return archived
+
+    @staticmethod
+    def archive_form(form_id):
+        """
+        Move results of form to archive file and save manifest.
+        Cache is cleared after commit, so concurrent reads can't cache state before it
+
+        :param form_id:
+        :return: FormResultArchive object or None
+        """
+        moved = FormResultArchiveService.move_results(form_id)
+        if moved is None:
+            return None
+
+        archive, results, tokens = moved
+        for result in results:
+            RedisManager.delete(f'form_result:{result.id}')
+            RedisManager.delete(
+                f'form_results:user_id:{result.user_id}token_id:{result.token_id}'
+            )
+        for token in tokens:
+            RedisManager.delete(f'form_results:token_id:{token.id}')
+        RedisManager.delete(f'form_result_archive:form_id:{form_id}')
+
+        return archive
+
+    @staticmethod
+    @transaction_decorator
+    def move_results(form_id):
+        """
+        Write results of form to archive file and delete them from form_results.
+        Results archived earlier are kept in the new file too.
+        File is replaced before rows are deleted, so if transaction fails archive
+        holds results that are still live: merge and read skip them by id
+
+        :param form_id:
+        :return: (FormResultArchive object, archived FormResult objects, tokens of form)
+            or None
+        """
+        form = FormService.get_by_id(form_id)
+        if form is None:
+            return None
+
+        tokens = TokenService.filter(form_id=form_id)
+        results = FormResult.query.filter(
+            FormResult.token_id.in_([token.id for token in tokens]),
+            FormResult.created >= form.created
+        ).all()
+        if not results:
+            return None
+
+        live_ids = {result.id for result in results}
+        archive = FormResultArchive.query.filter_by(form_id=form_id).first()
+        rows = FormResultArchiveService.read_file(archive.path) if archive else []
+        rows = [row for row in rows if row['id'] not in live_ids]
+        rows.extend(
+            {
+                'id': result.id,
+                'user_id': result.user_id,
+                'token_id': result.token_id,
+                'answers': result.answers,
+                'created': result.created.isoformat()
+            }
+            for result in results
+        )
+
+        path = os.path.join(APP.config['ARCHIVE_DIR'], 'form_results', f'form_{form_id}.json.gz')
+        FormResultArchiveService.write_file(path, rows)
+
+        if archive is None:
+            archive = FormResultArchive(form_id=form_id, path=path, results_count=len(rows))
+            DB.session.add(archive)
+        else:
+            archive.path = path
+            archive.results_count = len(rows)
+
+        FormResult.query.filter(
+            FormResult.id.in_(live_ids)
+        ).delete(synchronize_session=False)
+
+        return archive, results, tokens
+
+    @staticmethod
+    def read(form_id, user_id=None, live_ids=()):
+        """
+        Read archived results of form
+
+        :param form_id:
+        :param user_id: return only results of this user if passed
+        :param live_ids: ids of results still in form_results,
+            they are in archive only if archiving failed after file was written
+        :return: list of result dicts or empty list
+        """
+        archive = FormResultArchiveService.get_by_form_id(form_id)
+        if archive is None:
+            return []
+
+        live_ids = set(live_ids)
+        rows = [row for row in FormResultArchiveService.read_file(archive.path)
+                if row['id'] not in live_ids]
+        if user_id is not None:
+            rows = [row for row in rows if row['user_id'] == user_id]
+        return rows
+
+    @staticmethod
+    def write_file(path, rows):
+        """
+        Write rows to gzip compressed JSON file, column by column,
+        so repeating keys aren't stored for every row
+
+        :param path: file path
+        :param rows: list of result dicts
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        columns = {column: [row[column] for row in rows] for column in ARCHIVE_COLUMNS}
+
+        # write to temporary file first, so readers never see half-written archive
+        tmp_path = f'{path}.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as archive_file:
+            json.dump(columns, archive_file)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read_file(path):
+        """
+        Read rows from archive file
+
+        :param path: file path
+        :return: list of result dicts
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as archive_file:
+            columns = json.load(archive_file)
+        return [dict(zip(ARCHIVE_COLUMNS, values))
+                for values in zip(*(columns[column] for column in ARCHIVE_COLUMNS))]
+
+    @staticmethod
+    def remove(archive):
+        """
+        Remove archive file and cached manifest after form is deleted
+
+        :param archive: FormResultArchive object
+        """
+        if os.path.exists(archive.path):
+            os.remove(archive.path)
+        RedisManager.delete(f'form_result_archive:form_id:{archive.form_id}')
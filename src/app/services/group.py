@@ -3,11 +3,11 @@ Group service
 """
 
 from app import DB, LOGGER
-from app.models import Group
+from app.models import Group, GroupUser, User
 from app.schemas import BaseGroupSchema, GroupPostSchema, GroupPutSchema
 from app.services.group_user import GroupUserService
 from app.services.user import UserService
-from app.helper.decorators import transaction_decorator
+from app.helper.decorators import read_only, transaction_decorator
 from app.helper.errors import (
     GroupNotExist,
     GroupNotCreated,
@@ -91,6 +91,7 @@ class GroupService:
         return group
 
     @staticmethod
+    @read_only
     def filter(group_id=None, name=None, owner_id=None):
         """
         Group filter method
@@ -113,6 +114,7 @@ class GroupService:
         return result
 
     @staticmethod
+    @read_only
     def get_users_by_group(group_id):
         """
         Get all users in group by group_id
@@ -125,13 +127,63 @@ class GroupService:
             LOGGER.error('error occured %s', GroupNotExist())
             return None
 
-        users = []
+        return GroupService.get_users_by_groups([group_id])[group_id]
 
-        for group_user in group.groups_users:
-            users.append(UserService.to_json(group_user.user))
+    @staticmethod
+    def get_by_ids(groups_ids):
+        """
+        Get Group models by list of ids in one query
+
+        :param groups_ids: list of groups ids
+        :return: dict {group_id: Group object}
+        """
+        if not groups_ids:
+            return {}
+
+        groups = Group.query.filter(Group.id.in_(groups_ids)).all()
+        return {group.id: group for group in groups}
+
+    @staticmethod
+    @read_only
+    def get_users_by_groups(groups_ids):
+        """
+        Get all users of several groups in one query
+
+        :param groups_ids: list of groups ids
+        :return: dict {group_id: list of Users json}
+        """
+        users = {group_id: [] for group_id in groups_ids}
+        if not groups_ids:
+            return users
+
+        rows = DB.session.query(GroupUser.group_id, User).join(
+            User, GroupUser.user_id == User.id
+        ).filter(GroupUser.group_id.in_(groups_ids)).all()
+
+        for group_id, user in rows:
+            users[group_id].append(UserService.to_json(user))
 
         return users
 
+    @staticmethod
+    def get_groups_emails(groups_ids):
+        """
+        Get names and users emails of several groups at once
+
+        :param groups_ids: list of groups ids
+        :return: dict {group_id: {'name': group name, 'emails': list of users emails}},
+            groups that don't exist are skipped
+        """
+        groups = GroupService.get_by_ids(groups_ids)
+        groups_users = GroupService.get_users_by_groups(list(groups))
+        return {
+            group_id: {
+                'name': group.name,
+                'emails': [user['email'] for user in groups_users[group_id]]
+            }
+            for group_id, group in groups.items()
+        }
+
     @staticmethod
     def to_json(data, many=False):
         """
@@ -150,8 +202,9 @@ class GroupService:
         if not isinstance(result, list):
             result = [result]
 
+        users = GroupService.get_users_by_groups([group['id'] for group in result])
         for group in result:
-            group['users'] = GroupService.get_users_by_group(group['id'])
+            group['users'] = users[group['id']]
 
         return result
 
@@ -319,10 +372,10 @@ class GroupService:
         :param groups_ids: ids of groups that will be checked
         """
         errors = []
+        groups = GroupService.get_by_ids(groups_ids)
 
         for group_id in groups_ids:
-            group = GroupService.get_by_id(group_id)
-            if group is None:
+            if group_id not in groups:
                 errors.append(f"Group {group_id} doesn't exist")
 
         return errors
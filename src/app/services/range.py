@@ -4,7 +4,8 @@ Range service
 from app import DB
 from app.helper.decorators import transaction_decorator
 from app.helper.errors import RangeNotExist
-from app.models import Range
+from app.models import FieldRange, Range
+from app.services.form_field import FormFieldService
 
 
 class RangeService:
@@ -50,6 +51,9 @@ class RangeService:
         if range_max is not None:
             instance.max = range_max
         DB.session.merge(instance)
+        FormFieldService.invalidate_definitions(
+            DB.session.query(FieldRange.field_id).filter_by(range_id=range_id)
+        )
         return instance
 
     @staticmethod
@@ -0,0 +1,172 @@
+"""
+Search operations.
+"""
+
+from sqlalchemy import and_, case, func, literal, or_, select, String, union_all
+
+from app import DB
+from app.helper.constants import SEARCH_KINDS, SEARCH_TEXT_CONFIG
+from app.helper.decorators import read_only
+from app.models import Field, Form, FormField, SharedField
+
+
+class SearchService:
+    """
+    Class with search operations over fields, forms and questions.
+    Rows are matched by pg_trgm similarity or substring, both served by
+    trigram GIN indexes, and ranked by similarity and full-text rank
+    """
+
+    @staticmethod
+    def escape_like(text):
+        """
+        Escape LIKE wildcards of user input
+
+        :param text: str
+        :return: str
+        """
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def match(column, text):
+        """
+        Condition of column being similar to text or containing it
+
+        :param column: text column
+        :param text: search text
+        :return: SQL expression
+        """
+        return or_(
+            column.op('%')(text),
+            column.ilike(f'%{SearchService.escape_like(text)}%', escape='\\')
+        )
+
+    @staticmethod
+    def rank(column, text):
+        """
+        Rank of column against text: trigram similarity
+        with full-text rank added for whole word matches
+
+        :param column: text column
+        :param text: search text
+        :return: SQL expression
+        """
+        return func.similarity(column, text) + func.ts_rank(
+            func.to_tsvector(SEARCH_TEXT_CONFIG, column),
+            func.plainto_tsquery(SEARCH_TEXT_CONFIG, text)
+        )
+
+    @staticmethod
+    def fields_select(user_id, text):
+        """
+        Select fields owned by or shared to user matching text
+
+        :param user_id:
+        :param text: search text
+        :return: Select
+        """
+        return select([
+            literal('field', String).label('kind'),
+            Field.id.label('id'),
+            literal(None, DB.Integer).label('form_id'),
+            Field.name.label('text'),
+            SearchService.rank(Field.name, text).label('rank')
+        ]).select_from(
+            Field.__table__.outerjoin(
+                SharedField.__table__,
+                and_(SharedField.field_id == Field.id, SharedField.user_id == user_id)
+            )
+        ).where(and_(
+            or_(Field.owner_id == user_id, SharedField.id.isnot(None)),
+            SearchService.match(Field.name, text)
+        ))
+
+    @staticmethod
+    def forms_select(user_id, text):
+        """
+        Select user forms which name or title match text
+
+        :param user_id:
+        :param text: search text
+        :return: Select
+        """
+        name_rank = SearchService.rank(Form.name, text)
+        title_rank = SearchService.rank(Form.title, text)
+        return select([
+            literal('form', String).label('kind'),
+            Form.id.label('id'),
+            Form.id.label('form_id'),
+            case([(title_rank > name_rank, Form.title)], else_=Form.name).label('text'),
+            func.greatest(name_rank, title_rank).label('rank')
+        ]).where(and_(
+            Form.owner_id == user_id,
+            or_(SearchService.match(Form.name, text), SearchService.match(Form.title, text))
+        ))
+
+    @staticmethod
+    def questions_select(user_id, text):
+        """
+        Select questions of user forms matching text
+
+        :param user_id:
+        :param text: search text
+        :return: Select
+        """
+        return select([
+            literal('question', String).label('kind'),
+            FormField.id.label('id'),
+            FormField.form_id.label('form_id'),
+            FormField.question.label('text'),
+            SearchService.rank(FormField.question, text).label('rank')
+        ]).select_from(
+            FormField.__table__.join(Form.__table__, Form.id == FormField.form_id)
+        ).where(and_(
+            Form.owner_id == user_id,
+            SearchService.match(FormField.question, text)
+        ))
+
+    @staticmethod
+    def build_query(user_id, text, kinds=SEARCH_KINDS):
+        """
+        Build union of selects of requested kinds
+
+        :param user_id:
+        :param text: search text
+        :param kinds: iterable of SEARCH_KINDS
+        :return: Alias of union
+        """
+        selects = {
+            'field': SearchService.fields_select,
+            'form': SearchService.forms_select,
+            'question': SearchService.questions_select
+        }
+        return union_all(
+            *[selects[kind](user_id, text) for kind in SEARCH_KINDS if kind in kinds]
+        ).alias('search_results')
+
+    @staticmethod
+    @read_only
+    def search(user_id, text, page, per_page, kinds=SEARCH_KINDS):  # pylint: disable=too-many-arguments
+        """
+        Search fields, forms and questions of user ordered by rank
+
+        :param user_id:
+        :param text: search text
+        :param page: page number starting from 1
+        :param per_page: amount of results on page
+        :param kinds: iterable of SEARCH_KINDS
+        :return: list of results json, total amount of results
+        """
+        results = SearchService.build_query(user_id, text, kinds)
+        total = DB.session.query(func.count()).select_from(results).scalar()
+        rows = DB.session.query(results).order_by(
+            results.c.rank.desc(), results.c.kind, results.c.id
+        ).limit(per_page).offset((page - 1) * per_page).all()
+
+        return [{
+            'kind': row.kind,
+            'id': row.id,
+            'formId': row.form_id,
+            'text': row.text,
+            'rank': round(float(row.rank), 4)
+        } for row in rows], total
@@ -6,6 +6,7 @@ from app.models import SettingAutocomplete
 from app import DB
 from app.helper.decorators import transaction_decorator
 from app.helper.errors import SettingAutocompleteNotExist
+from app.services.form_field import FormFieldService
 
 
 class SettingAutocompleteService:
@@ -34,6 +35,7 @@ class SettingAutocompleteService:
             field_id=field_id
         )
         DB.session.add(setting_autocomplete)
+        FormFieldService.invalidate_definitions([field_id])
         return setting_autocomplete
 
     @staticmethod
@@ -72,6 +74,9 @@ class SettingAutocompleteService:
             setting_autocomplete.field_id = field_id
 
         DB.session.merge(setting_autocomplete)
+        FormFieldService.invalidate_definitions(
+            {setting_autocomplete.field_id, field_id} - {None}
+        )
 
         return setting_autocomplete
 
@@ -89,6 +94,7 @@ class SettingAutocompleteService:
         if setting_autocomplete is None:
             raise SettingAutocompleteNotExist()
         DB.session.delete(setting_autocomplete)
+        FormFieldService.invalidate_definitions([setting_autocomplete.field_id])
 
         return True
 
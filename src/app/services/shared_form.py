@@ -4,6 +4,9 @@ SharedField service
 
 from datetime import datetime
 
+from app.helper.jwt_helper import generate_token
+from app.services.token import TokenService
+
 
 class SharedFormService:
     """
@@ -59,3 +62,40 @@ class SharedFormService:
             payload['nbf'] = nbf
 
         return payload
+
+    @staticmethod
+    def create_tokens(form_id, groups_ids, with_users_token, exp=None, nbf=None):
+        """
+        Sign token for users emails and every group, save them in one INSERT
+
+        :param form_id: id of form that will be shared
+        :param groups_ids: ids of groups form is shared to
+        :param with_users_token: whether token for users emails is needed
+        :param exp: token exp string
+        :param nbf: token nbf string
+        :return: (users token or None, dict {group_id: token}) of saved tokens or None
+        """
+        payload = SharedFormService.get_token_initial_payload(form_id=form_id, exp=exp, nbf=nbf)
+        users_token = generate_token(payload) if with_users_token else None
+
+        groups_tokens = {}
+        for group_id in groups_ids:
+            group_payload = dict(payload)
+            group_payload['group_id'] = group_id
+            groups_tokens[group_id] = generate_token(group_payload)
+
+        tokens = list(groups_tokens.values())
+        if users_token is not None:
+            tokens.append(users_token)
+        token_instances = TokenService.create_many(tokens=tokens, form_id=form_id)
+        if token_instances is None:
+            return None
+
+        if users_token not in token_instances:
+            users_token = None
+        groups_tokens = {
+            group_id: token
+            for group_id, token in groups_tokens.items()
+            if token in token_instances
+        }
+        return users_token, groups_tokens
@@ -0,0 +1,262 @@
+"""
+Sheet reconciliation operations.
+"""
+
+import datetime
+from collections import Counter
+
+from app import APP, DB, LOGGER
+from app.helper.decorators import transaction_decorator
+from app.helper.sheet_manager import SheetManager
+from app.models import Form, FormResult, FormSheetSync, Token
+
+
+class SheetReconciliationService:
+    """
+    Class to append results saved in db but missing in form sheet.
+    Every row appended on submission has token and result id after answers,
+    owner can add own columns after them.
+    Rows and results are read from per-form high-water marks,
+    so every run handles only what was added since the previous one
+    """
+
+    @staticmethod
+    def parse_result_id(cell):
+        """
+        Get result id from sheet cell
+
+        :param cell: cell value
+        :return: int or None
+        """
+        try:
+            return int(str(cell).replace(',', '').strip())
+        except ValueError:
+            return None
+
+    @staticmethod
+    def parse_row(row, tokens):
+        """
+        Get token and result id of sheet row: the last cell holding token of form
+        and the cell after it, so columns owner added after them are skipped
+
+        :param row: list of cells
+        :param tokens: set of tokens of form
+        :return: (token, result id or None for rows appended without it)
+            or None if row has no token of form
+        """
+        for index in range(len(row) - 1, -1, -1):
+            token = str(row[index])
+            if token in tokens:
+                result_id = None
+                if index + 1 < len(row):
+                    result_id = SheetReconciliationService.parse_result_id(row[index + 1])
+                return token, result_id
+        return None
+
+    @staticmethod
+    def get_tokens(form_id):
+        """
+        Get all tokens form was shared with
+
+        :param form_id:
+        :return: set of token strings
+        """
+        return {token for token, in DB.session.query(Token.token).filter_by(form_id=form_id)}
+
+    @staticmethod
+    def get_state(form_id):
+        """
+        Get reconciliation marks of form, new marks start from the beginning
+
+        :param form_id:
+        :return: FormSheetSync object
+        """
+        state = FormSheetSync.query.filter_by(form_id=form_id).first()
+        if state is None:
+            state = FormSheetSync(form_id=form_id, result_id_mark=0, row_mark=0)
+        return state
+
+    @staticmethod
+    def is_reconciled(form_id, result_id):
+        """
+        Check whether result is in sheet already because reconciliation appended it
+
+        :param form_id:
+        :param result_id:
+        :return: bool
+        """
+        mark = DB.session.query(FormSheetSync.result_id_mark).filter_by(form_id=form_id).scalar()
+        return mark is not None and result_id <= mark
+
+    @staticmethod
+    @transaction_decorator
+    def save_state(state, result_id_mark, row_mark):
+        """
+        Save reconciliation marks
+
+        :param state: FormSheetSync object
+        :param result_id_mark: all results with id up to it are in sheet
+        :param row_mark: amount of rows that don't have to be read again
+        :return: FormSheetSync object
+        """
+        state.result_id_mark = result_id_mark
+        state.row_mark = row_mark
+        DB.session.add(state)
+        return state
+
+    @staticmethod
+    def scan_sheet(sheet_id, state, tokens):
+        """
+        Read sheet rows after row mark page by page
+
+        :param sheet_id:
+        :param state: FormSheetSync object
+        :param tokens: set of tokens of form
+        :return: (list of (row number, result id, token), Counter of tokens of rows without id,
+            number of last row) or None if sheet can't be read
+        """
+        page_size = APP.config['SHEET_RECONCILE_PAGE_SIZE']
+        row_ids, legacy_tokens = [], Counter()
+        row_number = state.row_mark
+        while True:
+            rows = SheetManager.get_rows(sheet_id, row_number + 1, row_number + page_size)
+            if rows is None:
+                return None
+            for offset, row in enumerate(rows, start=row_number + 1):
+                parsed = SheetReconciliationService.parse_row(row, tokens)
+                if parsed is None:
+                    continue
+                token, result_id = parsed
+                if result_id is not None:
+                    row_ids.append((offset, result_id, token))
+                else:
+                    legacy_tokens[token] += 1
+            row_number += len(rows)
+            if len(rows) < page_size:
+                return row_ids, legacy_tokens, row_number
+
+    @staticmethod
+    def get_results(form, after_id, before):
+        """
+        Get page of form results with their tokens ordered by id
+
+        :param form: Form object
+        :param after_id: return results with greater id
+        :param before: return results created earlier, so in-flight submissions are skipped
+        :return: list of (FormResult, token)
+        """
+        return DB.session.query(FormResult, Token.token).join(
+            Token, Token.id == FormResult.token_id
+        ).filter(
+            Token.form_id == form.id,
+            FormResult.id > after_id,
+            FormResult.created >= form.created,
+            FormResult.created < before
+        ).order_by(FormResult.id).limit(APP.config['SHEET_RECONCILE_PAGE_SIZE']).all()
+
+    @staticmethod
+    def to_row(result, token):
+        """
+        Build sheet row of result the same way it is appended on submission
+
+        :param result: FormResult object
+        :param token: token string
+        :return: list of cells
+        """
+        return list(result.answers.values()) + [token, result.id]
+
+    @staticmethod
+    def reconcile_form(form, now=None):  # pylint: disable=too-many-locals
+        """
+        Append results of form missing in its sheet and move marks forward
+
+        :param form: Form object
+        :param now: current time, for tests
+        :return: amount of appended rows or None if sheet can't be read or written
+        """
+        sheet_id = SheetManager.get_sheet_id_from_url(form.result_url or '')
+        if sheet_id is None:
+            return None
+
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        before = now - datetime.timedelta(seconds=APP.config['SHEET_RECONCILE_DELAY'])
+        state = SheetReconciliationService.get_state(form.id)
+        results = SheetReconciliationService.get_results(form, state.result_id_mark, before)
+        if not results:
+            # sheet isn't read while there are no new results
+            return 0
+
+        scanned = SheetReconciliationService.scan_sheet(
+            sheet_id, state, SheetReconciliationService.get_tokens(form.id)
+        )
+        if scanned is None:
+            return None
+        row_ids, legacy_tokens, last_row = scanned
+        # owner's number after token of row without id isn't taken for id of other result
+        seen = {(result_id, token) for _, result_id, token in row_ids
+                if result_id > state.result_id_mark}
+
+        mark, appended = state.result_id_mark, 0
+        while results:
+            missing = []
+            for result, token in results:
+                if (result.id, token) in seen:
+                    continue
+                if legacy_tokens[token] > 0:
+                    # row appended before rows got result id
+                    legacy_tokens[token] -= 1
+                    continue
+                missing.append(SheetReconciliationService.to_row(result, token))
+
+            batch_size = APP.config['SHEET_RECONCILE_BATCH_SIZE']
+            for index in range(0, len(missing), batch_size):
+                batch = missing[index:index + batch_size]
+                if SheetManager.append_rows(sheet_id, batch) is None:
+                    # keep marks before first row that isn't appended
+                    mark = max(mark, batch[0][-1] - 1)
+                    SheetReconciliationService.save_state(
+                        state,
+                        mark,
+                        SheetReconciliationService.get_row_mark(row_ids, last_row, mark)
+                    )
+                    return None
+                appended += len(batch)
+            mark = results[-1][0].id
+            results = SheetReconciliationService.get_results(form, mark, before)
+
+        SheetReconciliationService.save_state(
+            state, mark, SheetReconciliationService.get_row_mark(row_ids, last_row, mark)
+        )
+        if appended:
+            LOGGER.warning('Appended %s missing results to sheet of form %s', appended, form.id)
+        return appended
+
+    @staticmethod
+    def get_row_mark(row_ids, last_row, mark):
+        """
+        Get amount of rows that don't have to be read again:
+        rows before first row with result id greater than mark
+
+        :param row_ids: list of (row number, result id, token) read after previous row mark
+        :param last_row: number of last read row
+        :param mark: new result id mark
+        :return: int
+        """
+        for row_number, result_id, _ in row_ids:
+            if result_id > mark:
+                return row_number - 1
+        return last_row
+
+    @staticmethod
+    def reconcile_all():
+        """
+        Reconcile sheets of all forms with result url
+
+        :return: dict {form_id: amount of appended rows or None if failed}
+        """
+        report = {}
+        for form in Form.query.filter(Form.result_url.isnot(None)).all():
+            appended = SheetReconciliationService.reconcile_form(form)
+            if appended != 0:
+                report[form.id] = appended
+        return report
@@ -2,14 +2,20 @@
 Token service
 """
 
+import time
+
 from jwt import DecodeError
 
 from app import DB, LOGGER
+from app.config import REDIS_EXPIRE_TIME
 from app.models import Token
-from app.helper.decorators import transaction_decorator
+from app.helper.constants import LEEWAY_TIME
+from app.helper.decorators import read_only, transaction_decorator
 from app.helper.jwt_helper import decode_token
 from app.helper.redis_manager import RedisManager
 from app.schemas import TokenSchema
+from app.services.form import FormService
+from app.services.group import GroupService
 
 
 class TokenService:
@@ -35,6 +41,35 @@ class TokenService:
         DB.session.add(token)
         return token
 
+    @staticmethod
+    @transaction_decorator
+    def create_many(tokens, form_id):
+        """
+        Create Token models for the same form with one multi-row INSERT
+
+        :param tokens: list of generated tokens
+        :param form_id:
+        :return: dict {token: Token object} or None
+        """
+        tokens = list(dict.fromkeys(tokens))
+        if not tokens:
+            return {}
+
+        existing = TokenService.filter_by_tokens(tokens)
+        existing_tokens = {instance.token for instance in existing}
+        new_tokens = [token for token in tokens if token not in existing_tokens]
+
+        if new_tokens:
+            DB.session.execute(
+                Token.__table__.insert().values([  # pylint: disable=no-member
+                    {'token': token, 'form_id': form_id}
+                    for token in new_tokens
+                ])
+            )
+            existing = TokenService.filter_by_tokens(tokens)
+
+        return {instance.token: instance for instance in existing}
+
     @staticmethod
     def get_by_id(token_id):
         """
@@ -65,6 +100,7 @@ class TokenService:
         return token_instance
 
     @staticmethod
+    @read_only
     def filter(token_id=None, token=None, form_id=None):
         """
         Token filter method
@@ -86,6 +122,17 @@ class TokenService:
         result = Token.query.filter_by(**filter_data).all()
         return result
 
+    @staticmethod
+    def filter_by_tokens(tokens):
+        """
+        Get Token objects by list of tokens
+
+        :param tokens: list of tokens
+        :return: list of Token objects or empty list
+        """
+        result = Token.query.filter(Token.token.in_(tokens)).all()
+        return result
+
     @staticmethod
     def decode_token_for_check(token):
         """
@@ -109,3 +156,109 @@ class TokenService:
         """
         errors = TokenSchema().validate(data)
         return (not bool(errors), errors)
+
+    @staticmethod
+    def resolve(token):
+        """
+        Resolve token to the data token-gated endpoints need.
+        Resolution is cached in Redis until token expiration,
+        so repeated checks of the same token are a single cache hit
+
+        :param token: token to resolve
+        :return: dict {token_id, form_id, group_id, exp, nbf} or None
+        if token is wrong or isn't active at the moment
+        """
+        key = f'token_resolution:{token}'
+        data = RedisManager.get(key, 'data')
+
+        if data is None:
+            data = TokenService._resolve_token(token)
+            if data is None:
+                return None
+
+            expire_time = REDIS_EXPIRE_TIME
+            if data['exp'] is not None:
+                expire_time = min(expire_time, data['exp'] + LEEWAY_TIME - int(time.time()))
+            if expire_time > 0:
+                RedisManager.set(key, data, expire_time=expire_time)
+                RedisManager.add_to_index(f'token_resolution:form_id:{data["form_id"]}', token)
+                if data['group_id'] is not None:
+                    RedisManager.add_to_index(
+                        f'token_resolution:group_id:{data["group_id"]}',
+                        token
+                    )
+
+        if not TokenService.is_active(data):
+            return None
+
+        return data
+
+    @staticmethod
+    def _resolve_token(token):
+        """
+        Resolve token without cache
+
+        :param token: token to resolve
+        :return: dict or None if token is wrong
+        """
+        token_instance = TokenService.get_by_token(token)
+        if token_instance is None:
+            return None
+
+        token_data = TokenService.decode_token_for_check(token)
+        if token_data is None:
+            return None  # Not enough token segments
+
+        is_correct, _ = TokenService.validate_data(token_data)
+        if not is_correct:
+            return None  # Token isn't valid
+
+        form = FormService.get_by_id(token_data.get('form_id'))
+        if form is None:
+            return None  # Form doesn't exist
+
+        group_id = token_data.get('group_id')
+        if group_id is not None and GroupService.get_by_id(group_id) is None:
+            return None  # Group doesn't exist
+
+        return {
+            'token_id': token_instance.id,
+            'form_id': form.id,
+            'form_created': form.created,
+            'group_id': group_id,
+            'exp': token_data.get('exp'),
+            'nbf': token_data.get('nbf')
+        }
+
+    @staticmethod
+    def is_active(data):
+        """
+        Check token exp and nbf flags against current time
+
+        :param data: resolved token data
+        :return: True if token can be used now
+        """
+        now = time.time()
+        if data['exp'] is not None and now > data['exp'] + LEEWAY_TIME:
+            return False
+        if data['nbf'] is not None and now < data['nbf'] - LEEWAY_TIME:
+            return False
+        return True
+
+    @staticmethod
+    def invalidate_resolutions(form_id=None, group_id=None):
+        """
+        Delete cached resolutions of tokens of given form or group
+
+        :param form_id: id of deleted form
+        :param group_id: id of deleted group
+        """
+        tokens = []
+        if form_id is not None:
+            tokens.extend(RedisManager.pop_index(f'token_resolution:form_id:{form_id}'))
+        if group_id is not None:
+            tokens.extend(RedisManager.pop_index(f'token_resolution:group_id:{group_id}'))
+
+        for token in tokens:
+            RedisManager.delete(f'token_resolution:{token}')
+            RedisManager.delete(f'{token}')
@@ -0,0 +1,7 @@
+#!/bin/sh
+
+set -e
+sleep 1m
+
+# exactly one beat process sends CELERYBEAT_SCHEDULE tasks to worker queues
+celery -A app beat --loglevel=info --schedule /tmp/celerybeat-schedule
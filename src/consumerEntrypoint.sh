@@ -0,0 +1,7 @@
+#!/bin/sh
+
+set -e
+sleep 1m
+
+# inserts form results queued when FORM_RESULTS_BATCH_MODE is true
+python manage.py consume_form_results
@@ -0,0 +1,3 @@
+"""
+Load-test harness for form render, token check and answer submission
+"""
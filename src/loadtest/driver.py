@@ -0,0 +1,226 @@
+"""
+Gevent load driver for form render, token check and answer submission
+
+    python -m loadtest.driver --host http://localhost:8000 --scenario scenario.json \
+        --rps 50 --duration 60 --output run.json --compare previous_run.json
+"""
+from gevent import monkey
+monkey.patch_all()
+
+# pylint: disable=wrong-import-position, wrong-import-order, ungrouped-imports
+import argparse
+import json
+import random
+import re
+import time
+from collections import defaultdict
+
+import gevent
+import requests
+from gevent.pool import Pool
+
+API_PREFIX = '/api/v1'
+# share of every request type in generated load
+MIX = (
+    ('render', 0.5),
+    ('check', 0.2),
+    ('submit', 0.3)
+)
+DB_TIMING = re.compile(r'(?:^|,\s*)db;dur=[\d.]+;desc="(\d+)x"')
+
+
+def percentile(values, rank):
+    """
+    Get percentile of values with nearest-rank method
+
+    :param values: list of numbers
+    :param rank: percentile, e.g. 95
+    :return: number or None for empty list
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, int(round(rank / 100 * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def parse_query_count(server_timing):
+    """
+    Get amount of SQL queries from Server-Timing header
+
+    :param server_timing: header value or None
+    :return: int or None if request wasn't timed
+    """
+    if not server_timing:
+        return None
+    match = DB_TIMING.search(server_timing)
+    return int(match.group(1)) if match else 0
+
+
+class LoadDriver:
+    """
+    Send requests of MIX at target rate and collect their latency
+    """
+
+    def __init__(self, host, scenario, concurrency):
+        self.host = host.rstrip('/')
+        self.forms = scenario['forms']
+        self.pool = Pool(concurrency)
+        self.session = requests.Session()
+        self.samples = defaultdict(list)
+
+    def build_request(self, kind):
+        """
+        Build request of given kind for random form of scenario
+
+        :param kind: render, check or submit
+        :return: (method, url, json body)
+        """
+        form = random.choice(self.forms)
+        token = random.choice(form['tokens'])
+        base = f'{self.host}{API_PREFIX}/tokens/{token}'
+        if kind == 'render':
+            return 'GET', f'{base}/form', None
+        if kind == 'check':
+            return 'GET', f'{base}/check_token', None
+        return 'POST', f'{base}/answers', {'answers': form['answers']}
+
+    def send(self, kind):
+        """
+        Send one request and save its sample
+
+        :param kind: render, check or submit
+        """
+        method, url, body = self.build_request(kind)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, json=body, timeout=30)
+            status = response.status_code
+            queries = parse_query_count(response.headers.get('Server-Timing'))
+        except requests.RequestException:
+            status, queries = None, None
+        self.samples[kind].append({
+            'latency': time.perf_counter() - start,
+            'ok': status is not None and status < 400,
+            'queries': queries
+        })
+
+    def run(self, rps, duration):
+        """
+        Generate load for duration seconds
+
+        :param rps: target requests per second
+        :param duration: seconds
+        :return: elapsed seconds
+        """
+        kinds, weights = zip(*MIX)
+        interval = 1 / rps
+        start = time.perf_counter()
+        sent = 0
+        while time.perf_counter() - start < duration:
+            self.pool.spawn(self.send, random.choices(kinds, weights)[0])
+            sent += 1
+            # keep schedule even if spawning lags behind
+            gevent.sleep(max(0, start + sent * interval - time.perf_counter()))
+        self.pool.join()
+        return time.perf_counter() - start
+
+    def report(self, elapsed):
+        """
+        Summarize collected samples
+
+        :param elapsed: seconds load was generated for
+        :return: dict {kind: stats}
+        """
+        report = {}
+        for kind, samples in self.samples.items():
+            latencies = [sample['latency'] * 1000 for sample in samples if sample['ok']]
+            queries = [sample['queries'] for sample in samples if sample['queries'] is not None]
+            report[kind] = {
+                'requests': len(samples),
+                'errors': len(samples) - len(latencies),
+                'throughput': round(len(latencies) / elapsed, 2),
+                'p50': percentile(latencies, 50),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'queries': round(sum(queries) / len(queries), 2) if queries else None
+            }
+        return report
+
+
+def compare(current, previous):
+    """
+    Get relative change of every metric against previous run
+
+    :param current: report of this run
+    :param previous: report of previous run
+    :return: dict {kind: {metric: percent}}
+    """
+    changes = {}
+    for kind, stats in current.items():
+        previous_stats = previous.get(kind, {})
+        changes[kind] = {
+            metric: round((value - previous_stats[metric]) / previous_stats[metric] * 100, 1)
+            for metric, value in stats.items()
+            if value is not None and previous_stats.get(metric)
+        }
+    return changes
+
+
+def print_report(report, changes=None):
+    """
+    Print report as table
+
+    :param report: dict {kind: stats}
+    :param changes: dict {kind: {metric: percent}} or None
+    """
+    metrics = ('requests', 'errors', 'throughput', 'p50', 'p95', 'p99', 'queries')
+    print(f'{"":8}' + ''.join(f'{metric:>14}' for metric in metrics))
+    for kind, stats in report.items():
+        row = f'{kind:8}'
+        for metric in metrics:
+            value = stats[metric]
+            cell = '-' if value is None else f'{value:.1f}'
+            if changes and metric in changes.get(kind, {}):
+                cell += f' ({changes[kind][metric]:+.0f}%)'
+            row += f'{cell:>14}'
+        print(row)
+
+
+def main():
+    """
+    Run load test from command line
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='http://localhost:8000')
+    parser.add_argument('--scenario', required=True, help='json created by loadtest.server seed')
+    parser.add_argument('--rps', type=float, default=20)
+    parser.add_argument('--duration', type=float, default=60, help='seconds')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0, help='random seed of request mix')
+    parser.add_argument('--output', help='save report to json file')
+    parser.add_argument('--compare', help='report json of previous run')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with open(args.scenario) as scenario_file:
+        scenario = json.load(scenario_file)
+
+    driver = LoadDriver(args.host, scenario, args.concurrency)
+    elapsed = driver.run(args.rps, args.duration)
+    report = driver.report(elapsed)
+
+    changes = None
+    if args.compare:
+        with open(args.compare) as previous_file:
+            changes = compare(report, json.load(previous_file))
+    print_report(report, changes)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
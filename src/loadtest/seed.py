@@ -0,0 +1,210 @@
+"""
+Seed database with forms of realistic shape for load tests
+and save scenario for driver
+
+    python -m loadtest.seed --forms 10 --fields 2 --users 2000 --output scenario.json
+"""
+
+import argparse
+import json
+import time
+
+from app import APP, DB
+from app.helper.enums import FieldType
+from app.helper.jwt_helper import generate_token
+from app.models import (
+    ChoiceOption,
+    Field,
+    FieldRange,
+    Form,
+    FormField,
+    Group,
+    GroupUser,
+    Range,
+    SettingAutocomplete,
+    Token,
+    User
+)
+
+TOKEN_LIFETIME = 30 * 24 * 3600  # 30 days
+AUTOCOMPLETE_SHEET_ID = 'loadtest_autocomplete'
+AUTOCOMPLETE_VALUES = [f'value {index}' for index in range(500)]
+RADIO_OPTIONS = ['yes', 'no', 'maybe', 'never']
+CHECKBOX_OPTIONS = [f'option {index}' for index in range(5)]
+
+
+def create_fields(owner_id, prefix):
+    """
+    Create one field of every type with its options
+
+    :param owner_id: fields owner
+    :param prefix: unique prefix of field names
+    :return: list of (Field object, valid answer)
+    """
+    fields = {
+        field_type: Field(
+            name=f'{prefix} {field_type.name}',
+            owner_id=owner_id,
+            field_type=field_type.value,
+            is_strict=False
+        )
+        for field_type in FieldType
+    }
+    DB.session.add_all(fields.values())
+    DB.session.flush()
+
+    number_range = Range(min=0, max=100)
+    DB.session.add(number_range)
+    DB.session.flush()
+    DB.session.add(FieldRange(field_id=fields[FieldType.Number].id, range_id=number_range.id))
+
+    DB.session.add_all(
+        [ChoiceOption(field_id=fields[FieldType.Radio].id, option_text=option)
+         for option in RADIO_OPTIONS] +
+        [ChoiceOption(field_id=fields[FieldType.Checkbox].id, option_text=option)
+         for option in CHECKBOX_OPTIONS]
+    )
+    DB.session.add(SettingAutocomplete(
+        data_url=f'https://docs.google.com/spreadsheets/d/{AUTOCOMPLETE_SHEET_ID}/edit',
+        sheet='Sheet1',
+        from_row='A1',
+        to_row=f'A{len(AUTOCOMPLETE_VALUES)}',
+        field_id=fields[FieldType.Autocomplete].id
+    ))
+
+    answers = {
+        FieldType.Number: '42',
+        FieldType.Text: 'load test',
+        FieldType.TextArea: 'load test answer with a few more words',
+        FieldType.Radio: [RADIO_OPTIONS[0]],
+        FieldType.Autocomplete: AUTOCOMPLETE_VALUES[7],
+        FieldType.Checkbox: CHECKBOX_OPTIONS[:2]
+    }
+    return [(fields[field_type], answers[field_type]) for field_type in FieldType]
+
+
+def create_group(owner_id, name, users_count):
+    """
+    Create group with users_count new users
+
+    :param owner_id: group owner
+    :param name: group name, also used in users emails
+    :param users_count: amount of users in group
+    :return: Group object
+    """
+    group = Group(name=name, owner_id=owner_id)
+    DB.session.add(group)
+    users = [User(email=f'{name}.{index}@loadtest.ngfg', is_active=True)
+             for index in range(users_count)]
+    DB.session.add_all(users)
+    DB.session.flush()
+    DB.session.add_all([GroupUser(group_id=group.id, user_id=user.id) for user in users])
+    return group
+
+
+def create_token(form_id, group_id=None):
+    """
+    Create token to form valid for TOKEN_LIFETIME
+
+    :param form_id:
+    :param group_id:
+    :return: Token object
+    """
+    token = Token(
+        token=generate_token({
+            'form_id': form_id,
+            'group_id': group_id,
+            'exp': int(time.time()) + TOKEN_LIFETIME
+        }),
+        form_id=form_id
+    )
+    DB.session.add(token)
+    return token
+
+
+def seed(forms_count, fields_per_type, users_per_group, run_id=None):
+    """
+    Create forms with mixed field types, groups and tokens
+
+    :param forms_count: amount of forms
+    :param fields_per_type: amount of fields of every type in form
+    :param users_per_group: amount of users in group every form is shared to
+    :param run_id: unique suffix of names, current time by default
+    :return: scenario dict with tokens and answers to submit
+    """
+    run_id = run_id or str(int(time.time()))
+    scenario = {'runId': run_id, 'forms': []}
+
+    DB.session.begin(subtransactions=True)
+    owner = User(email=f'owner.{run_id}@loadtest.ngfg', is_active=True)
+    DB.session.add(owner)
+    DB.session.flush()
+
+    for form_index in range(forms_count):
+        form = Form(
+            owner_id=owner.id,
+            name=f'load test {run_id} {form_index}',
+            title=f'Load test form {form_index}',
+            result_url=(f'https://docs.google.com/spreadsheets/d/'
+                        f'loadtest_{run_id}_{form_index}/edit'),
+            is_published=True
+        )
+        DB.session.add(form)
+        DB.session.flush()
+
+        answers = []
+        position = 0
+        for copy in range(fields_per_type):
+            for field, answer in create_fields(owner.id, f'{run_id} {form_index} {copy}'):
+                DB.session.add(FormField(
+                    form_id=form.id,
+                    field_id=field.id,
+                    question=f'{field.name}?',
+                    position=position
+                ))
+                answers.append({'position': position, 'answer': answer})
+                position += 1
+
+        group = create_group(owner.id, f'loadtest{run_id}g{form_index}', users_per_group)
+        DB.session.flush()
+        tokens = [create_token(form.id), create_token(form.id, group.id)]
+
+        scenario['forms'].append({
+            'formId': form.id,
+            'tokens': [token.token for token in tokens],
+            'answers': answers
+        })
+    DB.session.commit()
+
+    return scenario
+
+
+def save_scenario(scenario, path):
+    """
+    Save scenario to json file for driver
+
+    :param scenario: dict returned by seed
+    :param path: file path
+    """
+    with open(path, 'w') as scenario_file:
+        json.dump(scenario, scenario_file, indent=2)
+
+
+def main():
+    """
+    Seed database and save scenario
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--forms', type=int, default=10)
+    parser.add_argument('--fields', type=int, default=2, help='fields of every type in form')
+    parser.add_argument('--users', type=int, default=2000, help='users in group of every form')
+    parser.add_argument('--output', default='scenario.json')
+    args = parser.parse_args()
+
+    with APP.app_context():
+        save_scenario(seed(args.forms, args.fields, args.users), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Run server for load tests: Google Sheets replaced with in-memory fake backend,
+every request timed so driver can report query counts, rate limits and Sheets quota off
+
+    SHEETS_FAKE_LATENCY=0.2 python -m loadtest.server --port 8000
+"""
+import argparse
+
+from app import APP, SOCKETIO
+from app.helper.sheet_manager import SheetManager
+from loadtest.seed import AUTOCOMPLETE_SHEET_ID, AUTOCOMPLETE_VALUES
+
+
+def main():
+    """
+    Configure and run server
+    """
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    APP.config['SHEETS_BACKEND'] = 'fake'
+    SheetManager.service.backend.append_rows(
+        AUTOCOMPLETE_SHEET_ID,
+        [[value] for value in AUTOCOMPLETE_VALUES]
+    )
+    APP.config['TIMING_SAMPLE_RATE'] = 1
+    APP.config['RATE_LIMIT_ENABLED'] = False
+    APP.config['SHEETS_QUOTA_ENABLED'] = False
+    APP.config['SERVER_NAME'] = None
+    SOCKETIO.run(APP, host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
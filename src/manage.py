@@ -1,8 +1,34 @@
 """
-    A module to handle DB migrations.
+    A module to handle DB migrations and management commands.
 """
 
-from app import MANAGER
+import time
+
+from app import APP, LOGGER, MANAGER
+from app.services import FormResultService
+
+
+@MANAGER.command
+def consume_form_results():
+    """
+    Insert form results queued in batch mode.
+    Failed batch isn't acked, so it is read again after wait
+    that doubles while errors repeat
+    """
+    delay = 0
+    while True:
+        try:
+            FormResultService.process_queued(
+                count=APP.config['FORM_RESULTS_BATCH_SIZE'],
+                block=APP.config['FORM_RESULTS_BATCH_BLOCK']
+            )
+            delay = 0
+        except Exception:  # pylint: disable=broad-except
+            delay = min(max(delay * 2, APP.config['FORM_RESULTS_CONSUMER_BACKOFF']),
+                        APP.config['FORM_RESULTS_CONSUMER_BACKOFF_MAX'])
+            LOGGER.exception('Cannot process queued form results, retry in %s s', delay)
+            time.sleep(delay)
+
 
 if __name__ == '__main__':
     MANAGER.run()
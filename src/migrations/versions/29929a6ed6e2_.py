@@ -0,0 +1,88 @@
+"""partition form_results by month of created
+
+Revision ID: 29929a6ed6e2
+Revises: 2e5cc55ef04e
+Create Date: 2026-10-19 10:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '29929a6ed6e2'
+down_revision = '2e5cc55ef04e'
+branch_labels = None
+depends_on = None
+
+PARTITIONS_AHEAD = 3  # months
+
+
+def upgrade():
+    op.rename_table('form_results', 'form_results_legacy')
+    op.execute('ALTER TABLE form_results_legacy RENAME CONSTRAINT form_results_pkey TO form_results_legacy_pkey')
+    op.drop_constraint('unique_user_token', 'form_results_legacy', type_='unique')
+
+    # primary key and unique constraints of partitioned table must include partition key
+    op.create_table('form_results',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('form_results_id_seq'::regclass)"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('answers', sa.JSON(), nullable=False),
+    sa.Column('token_id', sa.Integer(), nullable=False),
+    sa.Column('created', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['token_id'], ['tokens.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id', 'created'),
+    postgresql_partition_by='RANGE (created)'
+    )
+    op.execute('ALTER SEQUENCE form_results_id_seq OWNED BY form_results.id')
+    op.create_index('ix_form_results_token_id_user_id', 'form_results', ['token_id', 'user_id'])
+
+    # monthly partitions for existing rows and months ahead,
+    # later ones are created by create_form_results_partitions celery task
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month timestamptz := date_trunc(
+                'month', COALESCE((SELECT min(created) FROM form_results_legacy), now())
+            );
+        BEGIN
+            WHILE month <= date_trunc('month', now()) + interval '{PARTITIONS_AHEAD} months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF form_results FOR VALUES FROM (%L) TO (%L)',
+                    'form_results_' || to_char(month, '"y"YYYY"m"MM'),
+                    month::date,
+                    (month + interval '1 month')::date
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+    """)
+    op.execute('CREATE TABLE form_results_default PARTITION OF form_results DEFAULT')
+
+    op.execute('INSERT INTO form_results (id, user_id, answers, token_id, created) '
+               'SELECT id, user_id, answers, token_id, created FROM form_results_legacy')
+    op.drop_table('form_results_legacy')
+
+
+def downgrade():
+    op.rename_table('form_results', 'form_results_partitioned')
+    op.execute('ALTER TABLE form_results_partitioned RENAME CONSTRAINT form_results_pkey TO form_results_partitioned_pkey')
+    op.drop_index('ix_form_results_token_id_user_id', table_name='form_results_partitioned')
+
+    op.create_table('form_results',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('form_results_id_seq'::regclass)"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('answers', sa.JSON(), nullable=False),
+    sa.Column('token_id', sa.Integer(), nullable=False),
+    sa.Column('created', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['token_id'], ['tokens.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('ALTER SEQUENCE form_results_id_seq OWNED BY form_results.id')
+
+    op.execute('INSERT INTO form_results (id, user_id, answers, token_id, created) '
+               'SELECT id, user_id, answers, token_id, created FROM form_results_partitioned')
+    op.create_unique_constraint('unique_user_token', 'form_results', ['user_id', 'token_id'])
+    op.drop_table('form_results_partitioned')
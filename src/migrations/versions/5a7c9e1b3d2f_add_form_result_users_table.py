@@ -0,0 +1,36 @@
+"""add form_result_users table
+
+Revision ID: 5a7c9e1b3d2f
+Revises: 3f8d2a6c1e7b
+Create Date: 2026-10-20 10:05:17.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c9e1b3d2f'
+down_revision = '3f8d2a6c1e7b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # unique_user_token was dropped when form_results got partitioned,
+    # users who answered are kept in separate table to enforce it again
+    op.create_table('form_result_users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['token_id'], ['tokens.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'token_id', name='unique_user_token')
+    )
+    op.execute('INSERT INTO form_result_users (user_id, token_id) '
+               'SELECT DISTINCT user_id, token_id FROM form_results WHERE user_id IS NOT NULL')
+
+
+def downgrade():
+    op.drop_table('form_result_users')
@@ -0,0 +1,35 @@
+"""add trigram search indexes
+
+Revision ID: 6b1e2f3c9d4a
+Revises: 25131917b94f
+Create Date: 2026-10-19 14:21:40.118305
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1e2f3c9d4a'
+down_revision = '25131917b94f'
+branch_labels = None
+depends_on = None
+
+TRGM_INDEXES = (
+    ('ix_fields_name_trgm', 'fields', 'name'),
+    ('ix_forms_name_trgm', 'forms', 'name'),
+    ('ix_forms_title_trgm', 'forms', 'title'),
+    ('ix_form_fields_question_trgm', 'form_fields', 'question'),
+)
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRGM_INDEXES:
+        op.create_index(name, table, [column], unique=False,
+                        postgresql_using='gin',
+                        postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade():
+    for name, table, _ in TRGM_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,10 @@
+import mock
+
+from app.celery_tasks.archive import archive_inactive_forms
+
+
+@mock.patch('app.celery_tasks.archive.FormResultArchiveService.archive_inactive_forms')
+def test_archive_inactive_forms(archive_mock):
+    archive_mock.return_value = [1]
+
+    assert archive_inactive_forms() == [1]
@@ -0,0 +1,13 @@
+import mock
+
+from app.celery_tasks.partitions import create_form_results_partitions
+
+
+@mock.patch('app.celery_tasks.partitions.PartitionManager.create_partitions')
+def test_create_form_results_partitions(create_mock):
+    create_mock.return_value = ['form_results_y2020m04']
+
+    test_instance = create_form_results_partitions()
+
+    create_mock.assert_called_once_with('form_results', 3)
+    assert test_instance == ['form_results_y2020m04']
@@ -0,0 +1,59 @@
+import mock
+
+from app.celery_tasks.send_notification import flush_notifications, notify, send_notification
+
+
+@mock.patch('app.celery_tasks.send_notification.flush_notifications.apply_async')
+@mock.patch('app.celery_tasks.send_notification.NotificationBuffer.add')
+def test_send_notification_schedules_flush(add_mock, apply_mock):
+    add_mock.return_value = True
+
+    send_notification('Field sent', 'user@ngfg.com')
+
+    add_mock.assert_called_once_with('user@ngfg.com', 'Field sent')
+    apply_mock.assert_called_once_with(args=['user@ngfg.com'], countdown=2)
+
+
+@mock.patch('app.celery_tasks.send_notification.flush_notifications.apply_async')
+@mock.patch('app.celery_tasks.send_notification.NotificationBuffer.add')
+def test_send_notification_buffered(add_mock, apply_mock):
+    add_mock.return_value = False
+
+    send_notification('Field sent', 'user@ngfg.com')
+
+    apply_mock.assert_not_called()
+
+
+@mock.patch('app.celery_tasks.send_notification.flush_notifications.apply_async')
+@mock.patch('app.celery_tasks.send_notification.NotificationBuffer.add')
+def test_notify_in_open_window(add_mock, apply_mock):
+    add_mock.side_effect = [True, False, False]
+
+    for _ in range(3):
+        notify('Field sent', 'user@ngfg.com')
+
+    apply_mock.assert_called_once_with(args=['user@ngfg.com'], countdown=2)
+
+
+@mock.patch('app.celery_tasks.send_notification.SOCKETIO.emit')
+@mock.patch('app.celery_tasks.send_notification.NotificationBuffer.pop')
+def test_flush_notifications(pop_mock, emit_mock):
+    pop_mock.return_value = ['first', 'second']
+
+    assert flush_notifications('user@ngfg.com') == 2
+
+    emit_mock.assert_called_once_with(
+        'message',
+        {'notification': 'second', 'notifications': ['first', 'second']},
+        broadcast=False,
+        room='user@ngfg.com'
+    )
+
+
+@mock.patch('app.celery_tasks.send_notification.SOCKETIO.emit')
+@mock.patch('app.celery_tasks.send_notification.NotificationBuffer.pop')
+def test_flush_notifications_empty(pop_mock, emit_mock):
+    pop_mock.return_value = []
+
+    assert flush_notifications('user@ngfg.com') == 0
+    emit_mock.assert_not_called()
@@ -1,11 +1,14 @@
 import pytest
 import mock
+from flask import g
 from sqlalchemy.exc import (
     IntegrityError,
     ProgrammingError,
     SQLAlchemyError
 )
 
+from app import APP
+from app.helper.decorators import read_only
 from app.helper.errors import CustomException
 from app.services import FieldService
 
@@ -62,3 +65,30 @@ def test_decorator_sql_alchemy_error(db_mock, logger_mock):
 
     assert test_instance is None
     assert logger_mock.error.called is True
+
+
+def test_read_only_sets_replica_flag():
+    def func():
+        return g.get('use_replica')
+
+    with APP.test_request_context():
+        assert read_only(func)() is True
+        assert g.use_replica is False
+
+
+def test_read_only_without_app_context():
+    func = mock.MagicMock(return_value=1)
+
+    assert read_only(func)(1, key=2) == 1
+    func.assert_called_once_with(1, key=2)
+
+
+@mock.patch('app.helper.decorators.DB')
+def test_read_only_inside_transaction(db_mock):
+    db_mock.session.return_value.transaction = mock.MagicMock()
+
+    def func():
+        return g.get('use_replica')
+
+    with APP.test_request_context():
+        assert read_only(func)() is None
@@ -0,0 +1,54 @@
+"""
+Test FormEvents
+"""
+
+import mock
+
+from app import APP
+from app.helper.form_events import FormEvents, NEW_RESULTS_KEY
+
+
+@mock.patch('app.REDIS.hincrby')
+@mock.patch('app.SOCKETIO.emit')
+def test_publish_results(emit_mock, hincrby_mock):
+    FormEvents.publish_results(1, [{'id': 1}, {'id': 2}])
+
+    emit_mock.assert_called_once_with(
+        'form_results',
+        {'formId': 1, 'results': [{'id': 1}, {'id': 2}]},
+        room='form:1'
+    )
+    hincrby_mock.assert_called_once_with(NEW_RESULTS_KEY, 1, 2)
+
+
+@mock.patch('app.REDIS.hincrby')
+@mock.patch('app.SOCKETIO.emit')
+def test_publish_results_disabled(emit_mock, hincrby_mock):
+    with mock.patch.dict(APP.config, {'FORM_EVENTS_ENABLED': False}):
+        FormEvents.publish_results(1, [{'id': 1}])
+
+    emit_mock.assert_not_called()
+    hincrby_mock.assert_not_called()
+
+
+@mock.patch('app.LOGGER.warning')
+@mock.patch('app.SOCKETIO.emit')
+def test_publish_results_failed(emit_mock, warning_mock):
+    emit_mock.side_effect = ConnectionError
+
+    FormEvents.publish_results(1, [{'id': 1}])
+
+    warning_mock.assert_called_once()
+
+
+@mock.patch('app.SOCKETIO.emit')
+@mock.patch('app.REDIS.pipeline')
+def test_emit_new_results(pipeline_mock, emit_mock):
+    pipeline_mock.return_value.execute.return_value = [{b'1': b'3', b'2': b'1'}, 1]
+
+    assert FormEvents.emit_new_results() == {1: 3, 2: 1}
+
+    pipeline_mock.return_value.delete.assert_called_once_with(NEW_RESULTS_KEY)
+    emit_mock.assert_any_call('form_results_count', {'formId': 1, 'newResults': 3},
+                              room='form:1')
+    assert emit_mock.call_count == 2
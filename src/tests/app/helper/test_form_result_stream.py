@@ -0,0 +1,73 @@
+"""
+Test FormResultStream
+"""
+
+import pickle
+
+import mock
+
+from app.helper.form_result_stream import FormResultStream
+
+
+@mock.patch('app.REDIS.xadd')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+def test_publish(status_mock, xadd_mock):
+    submission_id = FormResultStream.publish({'token': 'token', 'token_id': 1})
+
+    status_mock.assert_called_once_with(submission_id, 'token', 'pending')
+    data = pickle.loads(xadd_mock.call_args[0][1]['data'])
+    assert data['submission_id'] == submission_id
+    assert data['token_id'] == 1
+
+
+@mock.patch('app.REDIS.xreadgroup')
+@mock.patch('app.helper.form_result_stream.FormResultStream.create_group')
+def test_read_pending(group_mock, xreadgroup_mock):
+    submission = {'submission_id': 'submission'}
+    xreadgroup_mock.return_value = [
+        (b'stream', [(b'1-0', {b'data': pickle.dumps(submission)})])
+    ]
+
+    result = FormResultStream.read(count=10, block=0)
+
+    assert result == [(b'1-0', submission)]
+    assert xreadgroup_mock.call_count == 1
+
+
+@mock.patch('app.REDIS.xreadgroup')
+@mock.patch('app.helper.form_result_stream.FormResultStream.create_group')
+def test_read_new(group_mock, xreadgroup_mock):
+    submission = {'submission_id': 'submission'}
+    xreadgroup_mock.side_effect = [
+        [(b'stream', [])],
+        [(b'stream', [(b'2-0', {b'data': pickle.dumps(submission)})])]
+    ]
+
+    result = FormResultStream.read(count=10, block=0)
+
+    assert result == [(b'2-0', submission)]
+    assert xreadgroup_mock.call_count == 2
+
+
+@mock.patch('app.REDIS.xdel')
+@mock.patch('app.REDIS.xack')
+def test_ack(xack_mock, xdel_mock):
+    FormResultStream.ack([b'1-0'])
+
+    assert xack_mock.call_count == 1
+    assert xdel_mock.call_count == 1
+
+
+@mock.patch('app.REDIS.xack')
+def test_ack_empty(xack_mock):
+    FormResultStream.ack([])
+
+    xack_mock.assert_not_called()
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_get_status(get_mock):
+    get_mock.return_value = {'status': 'pending'}
+
+    assert FormResultStream.get_status('submission') == {'status': 'pending'}
+    get_mock.assert_called_once_with('form_result_submission:submission', 'data')
@@ -0,0 +1,92 @@
+"""
+Test IdempotencyManager
+"""
+
+import pickle
+
+import mock
+import pytest
+from werkzeug.exceptions import Conflict
+
+from app.helper.idempotency_manager import IdempotencyManager
+
+
+def test_generate_key():
+    assert IdempotencyManager.generate_key('token', 'key') == 'idempotency:token:key'
+
+
+@mock.patch('app.REDIS.get')
+def test_get(get_mock):
+    record = {'result': {'id': 1}, 'is_appended': True}
+    get_mock.return_value = pickle.dumps(record)
+
+    assert IdempotencyManager.get('token', 'key') == record
+    get_mock.assert_called_once_with('idempotency:token:key')
+
+
+@mock.patch('app.REDIS.get')
+def test_get_not_saved(get_mock):
+    get_mock.return_value = None
+
+    assert IdempotencyManager.get('token', 'key') is None
+
+
+@mock.patch('app.REDIS.set')
+def test_save(set_mock):
+    record = {'result': {'id': 1}, 'is_appended': False}
+
+    IdempotencyManager.save('token', 'key', record)
+
+    name, value = set_mock.call_args[0]
+    assert name == 'idempotency:token:key'
+    assert pickle.loads(value) == record
+
+
+@mock.patch('app.REDIS.set')
+def test_acquire(set_mock):
+    set_mock.return_value = True
+
+    lock = IdempotencyManager.acquire('token', 'key')
+
+    assert lock is not None
+    assert set_mock.call_args[0] == ('idempotency:token:key:lock', lock)
+    assert set_mock.call_args[1]['nx'] is True
+
+
+@mock.patch('app.REDIS.set')
+def test_acquire_locked(set_mock):
+    set_mock.return_value = None
+
+    assert IdempotencyManager.acquire('token', 'key') is None
+
+
+@mock.patch('app.helper.idempotency_manager.RELEASE_SCRIPT')
+def test_release(script_mock):
+    IdempotencyManager.release('token', 'key', 'lock')
+
+    script_mock.assert_called_once_with(keys=['idempotency:token:key:lock'], args=['lock'])
+
+
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.release')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.acquire')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.get')
+def test_run_processes_once(get_mock, acquire_mock, release_mock):
+    get_mock.return_value = None
+    acquire_mock.return_value = 'lock'
+    process, replay = mock.Mock(return_value='created'), mock.Mock()
+
+    assert IdempotencyManager.run('token', 'key', process, replay) == 'created'
+    replay.assert_not_called()
+    release_mock.assert_called_once_with('token', 'key', 'lock')
+
+
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.acquire')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.get')
+def test_run_in_progress(get_mock, acquire_mock):
+    get_mock.return_value = None
+    acquire_mock.return_value = None
+    process = mock.Mock()
+
+    with pytest.raises(Conflict):
+        IdempotencyManager.run('token', 'key', process, mock.Mock())
+    process.assert_not_called()
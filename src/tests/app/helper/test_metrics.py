@@ -0,0 +1,52 @@
+import mock
+from prometheus_client import CollectorRegistry, REGISTRY
+
+from app.helper.metrics import Metrics, StateCollector, redis_metric, start_worker_metrics
+
+
+def sample(operation, result):
+    return REGISTRY.get_sample_value(
+        'ngfg_redis_operations_total',
+        {'namespace': 'test_namespace', 'operation': operation, 'result': result}
+    ) or 0
+
+
+def test_get_namespace():
+    assert Metrics.get_namespace('form_results:token_id:1') == 'form_results'
+    assert Metrics.get_namespace('eyJhbGciOiJIUzI1NiJ9.eyJmb3JtX2lkIjoxfQ.sig') == 'other'
+
+
+def test_redis_metric_hit_and_miss():
+    get = redis_metric('get')(lambda name, value: value)
+    hits, misses = sample('get', 'hit'), sample('get', 'miss')
+
+    get('test_namespace:1', 'cached')
+    get('test_namespace:2', None)
+
+    assert sample('get', 'hit') == hits + 1
+    assert sample('get', 'miss') == misses + 1
+
+
+def test_get_queues():
+    with mock.patch.dict('app.APP.config', {'CELERY_ROUTES': {
+            'task.a': {'queue': 'first_queue'},
+            'task.b.*': {'queue': 'first_queue'},
+            'task.c': {'queue': 'second_queue'}}}):
+        assert Metrics.get_queues() == {'first_queue', 'second_queue'}
+
+
+@mock.patch('app.helper.metrics.start_http_server')
+def test_start_worker_metrics(server_mock):
+    with mock.patch.dict('app.APP.config', {'CELERY_METRICS_PORT': 9100}), \
+            mock.patch.dict('os.environ', clear=False) as environ:
+        environ.pop('prometheus_multiproc_dir', None)
+        start_worker_metrics()
+
+    server_mock.assert_called_once_with(9100, registry=REGISTRY)
+
+
+@mock.patch('app.helper.metrics.StateCollector.collect')
+def test_state_collector_not_collected_on_register(collect_mock):
+    CollectorRegistry().register(StateCollector())
+
+    collect_mock.assert_not_called()
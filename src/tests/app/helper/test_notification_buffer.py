@@ -0,0 +1,37 @@
+"""
+Test NotificationBuffer
+"""
+
+import mock
+
+from app.helper.notification_buffer import NotificationBuffer
+
+
+@mock.patch('app.REDIS.pipeline')
+def test_add_opens_window(pipeline_mock):
+    pipeline_mock.return_value.execute.return_value = [1, True]
+
+    assert NotificationBuffer.add('user@ngfg.com', 'Field sent') is True
+
+    pipeline = pipeline_mock.return_value
+    assert pipeline.zadd.call_args[0][0] == 'notifications:user@ngfg.com'
+    assert pipeline.zadd.call_args[1] == {'nx': True}
+    pipeline.set.assert_called_once_with('notifications_window:user@ngfg.com', 1, nx=True, ex=2)
+    pipeline.expire.assert_not_called()
+
+
+@mock.patch('app.REDIS.pipeline')
+def test_add_to_open_window(pipeline_mock):
+    pipeline_mock.return_value.execute.return_value = [0, None]
+
+    assert NotificationBuffer.add('user@ngfg.com', 'Field sent') is False
+
+
+@mock.patch('app.REDIS.pipeline')
+def test_pop(pipeline_mock):
+    pipeline_mock.return_value.execute.return_value = [[b'first', b'second'], 2]
+
+    assert NotificationBuffer.pop('user@ngfg.com') == ['first', 'second']
+    pipeline_mock.return_value.delete.assert_called_once_with(
+        'notifications:user@ngfg.com', 'notifications_window:user@ngfg.com'
+    )
@@ -0,0 +1,78 @@
+from datetime import date
+
+import mock
+
+from app.helper.partition_manager import PartitionManager
+
+
+def test_month_start():
+    assert PartitionManager.month_start(date(2020, 4, 15)) == date(2020, 4, 1)
+    assert PartitionManager.month_start(date(2020, 11, 30), 3) == date(2021, 2, 1)
+
+
+def test_partition_name():
+    test_instance = PartitionManager.partition_name('form_results', date(2020, 4, 1))
+
+    assert test_instance == 'form_results_y2020m04'
+
+
+@mock.patch('app.DB.session.execute')
+def test_create_partition(execute_mock):
+    # partition and default partition don't exist
+    execute_mock.return_value.scalar.return_value = None
+
+    test_instance = PartitionManager.create_partition('form_results', date(2020, 12, 1))
+
+    assert test_instance == 'form_results_y2020m12'
+    execute_mock.assert_called_with(
+        'CREATE TABLE form_results_y2020m12 PARTITION OF form_results '
+        "FOR VALUES FROM ('2020-12-01') TO ('2021-01-01')"
+    )
+
+
+@mock.patch('app.DB.session.execute')
+def test_create_existing_partition(execute_mock):
+    execute_mock.return_value.scalar.return_value = 'form_results_y2020m12'
+
+    test_instance = PartitionManager.create_partition('form_results', date(2020, 12, 1))
+
+    assert test_instance == 'form_results_y2020m12'
+    execute_mock.assert_called_once()
+
+
+@mock.patch('app.DB.session.execute')
+def test_create_partition_moves_default_rows(execute_mock):
+    # partition doesn't exist, default partition exists and has rows of month
+    execute_mock.return_value.scalar.side_effect = [None, 'form_results_default', True]
+
+    PartitionManager.create_partition('form_results', date(2020, 12, 1))
+
+    statements = [call[0][0] for call in execute_mock.call_args_list[3:]]
+    condition = "created >= '2020-12-01' AND created < '2021-01-01'"
+    assert statements == [
+        'ALTER TABLE form_results DETACH PARTITION form_results_default',
+        'CREATE TABLE form_results_y2020m12 PARTITION OF form_results '
+        "FOR VALUES FROM ('2020-12-01') TO ('2021-01-01')",
+        f'INSERT INTO form_results_y2020m12 SELECT * FROM form_results_default WHERE {condition}',
+        f'DELETE FROM form_results_default WHERE {condition}',
+        'ALTER TABLE form_results ATTACH PARTITION form_results_default DEFAULT'
+    ]
+
+
+@mock.patch('app.DB.session.execute')
+def test_create_partitions(execute_mock):
+    execute_mock.return_value.scalar.return_value = None
+
+    test_instance = PartitionManager.create_partitions(
+        'form_results',
+        months_ahead=2,
+        today=date(2020, 11, 20)
+    )
+
+    assert test_instance == [
+        'form_results_y2020m11',
+        'form_results_y2020m12',
+        'form_results_y2021m01'
+    ]
+    # existence of partition and default partition is checked before every CREATE
+    assert execute_mock.call_count == 9
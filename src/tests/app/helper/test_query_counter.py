@@ -0,0 +1,68 @@
+import pytest
+
+from app import DB
+from app.helper.query_counter import QueryBudgetExceeded, QueryCounter, query_budget
+from app.models import Field, Group, GroupUser, SharedField, User
+from app.services import FieldService, GroupService
+
+
+@pytest.fixture()
+def users(client):
+    users = [User(email=f'user{index}@gmail.com', is_active=True) for index in range(5)]
+    DB.session.add_all(users)
+    DB.session.flush()
+    return users
+
+
+def test_query_counter(client):
+    with QueryCounter() as counter:
+        DB.session.execute('SELECT 1')
+        DB.session.execute('SELECT 1')
+
+    assert counter.count == 2
+    assert counter.repeated() == {'SELECT 1': 2}
+
+
+def test_query_budget_exceeded(client):
+    @query_budget(1)
+    def run_queries():
+        DB.session.execute('SELECT 1')
+        DB.session.execute('SELECT 2')
+
+    with pytest.raises(QueryBudgetExceeded):
+        run_queries()
+
+
+def test_get_users_by_groups_budget(users, query_counter):
+    groups = [Group(name=f'group{index}', owner_id=users[0].id) for index in range(3)]
+    DB.session.add_all(groups)
+    DB.session.flush()
+    DB.session.add_all([GroupUser(group_id=group.id, user_id=user.id)
+                        for group in groups for user in users])
+    DB.session.flush()
+    # flush commits in autocommit session, ids are read before counting starts
+    group_ids = [group.id for group in groups]
+    query_counter.statements.clear()
+
+    result = GroupService.get_users_by_groups(group_ids)
+
+    assert all(len(group_users) == len(users) for group_users in result.values())
+    assert query_counter.count == 1
+
+
+def test_get_shared_fields_budget(users, query_counter):
+    fields = [Field(name=f'field{index}', owner_id=users[0].id, field_type=1)
+              for index in range(5)]
+    DB.session.add_all(fields)
+    DB.session.flush()
+    DB.session.add_all([SharedField(user_id=users[1].id, field_id=field.id,
+                                    owner_id=users[0].id)
+                        for field in fields])
+    DB.session.flush()
+    user_id = users[1].id
+    query_counter.statements.clear()
+
+    result = FieldService.get_shared_fields(user_id=user_id)
+
+    assert len(result) == len(fields)
+    assert query_counter.count == 1
@@ -0,0 +1,97 @@
+"""
+Test RateLimiter
+"""
+
+import mock
+import pytest
+from redis import RedisError
+
+from app.helper.rate_limiter import RateLimiter, RateLimitExceeded, rate_limit
+
+
+@mock.patch('app.helper.rate_limiter.TOKEN_BUCKET_SCRIPT')
+def test_consume(script_mock):
+    script_mock.return_value = b'0.25'
+
+    result = RateLimiter.consume('ip:127.0.0.1', 2, 10)
+
+    assert result == 0.25
+    assert script_mock.call_args[1]['keys'] == ['rate_limit:ip:127.0.0.1']
+
+
+@mock.patch('app.helper.rate_limiter.RateLimiter.consume')
+def test_check_allowed(consume_mock, app):
+    consume_mock.return_value = 0
+
+    RateLimiter.check(token='token', form_id=1)
+
+    consume_mock.assert_any_call('token:token', *app.config['RATE_LIMIT_TOKEN'])
+    consume_mock.assert_any_call('form_id:1', *app.config['RATE_LIMIT_FORM'])
+
+
+@mock.patch('app.helper.rate_limiter.RateLimiter.consume')
+def test_check_ip_token(consume_mock, app):
+    consume_mock.return_value = 0
+
+    RateLimiter.check(ip='127.0.0.1', ip_token='127.0.0.1:token')
+
+    consume_mock.assert_any_call('ip:127.0.0.1', *app.config['RATE_LIMIT_IP'])
+    consume_mock.assert_any_call('ip_token:127.0.0.1:token', *app.config['RATE_LIMIT_IP_TOKEN'])
+
+
+@mock.patch('app.helper.rate_limiter.RateLimiter.consume')
+def test_check_exceeded(consume_mock, app):
+    consume_mock.return_value = 1.5
+
+    with pytest.raises(RateLimitExceeded) as error:
+        RateLimiter.check(form_id=1)
+
+    assert error.value.retry_after == 2
+    assert ('Retry-After', '2') in error.value.get_headers()
+
+
+@mock.patch('app.helper.rate_limiter.RateLimiter.consume')
+def test_check_disabled(consume_mock, app):
+    with mock.patch.dict(app.config, {'RATE_LIMIT_ENABLED': False}):
+        RateLimiter.check(form_id=1)
+
+    consume_mock.assert_not_called()
+
+
+@mock.patch('app.helper.rate_limiter.RateLimiter.consume')
+def test_check_redis_unavailable(consume_mock, app):
+    consume_mock.side_effect = RedisError('Connection refused')
+
+    RateLimiter.check(token='token', form_id=1)
+
+    consume_mock.assert_called_once()
+
+
+@mock.patch('app.helper.rate_limiter.CONCURRENCY_SEMAPHORE')
+@mock.patch('app.helper.rate_limiter.RateLimiter.check')
+def test_rate_limit_busy(check_mock, semaphore_mock, app):
+    semaphore_mock.acquire.return_value = False
+
+    @rate_limit
+    def view(token):
+        return token
+
+    with app.test_request_context():
+        with pytest.raises(RateLimitExceeded):
+            view(token='token')
+
+
+@mock.patch('app.helper.rate_limiter.RateLimiter.check')
+def test_rate_limit(check_mock, app):
+    @rate_limit
+    def view(token):
+        return token
+
+    with app.test_request_context(environ_base={'REMOTE_ADDR': '127.0.0.1'}):
+        assert view(token='token') == 'token'
+
+    check_mock.assert_called_once_with(
+        ip='127.0.0.1',
+        ip_token='127.0.0.1:token',
+        token='token'
+    )
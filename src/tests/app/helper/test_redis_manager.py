@@ -1,6 +1,9 @@
 import pytest
 import mock
 
+from flask import g
+
+from app import APP
 from app.helper.redis_manager import RedisManager
 from app.models.user import User
 
@@ -79,6 +82,16 @@ def test_set(set, expire, set_data):
     assert test == None
 
 
+@mock.patch('app.REDIS.expire')
+@mock.patch('app.REDIS.hset')
+def test_set_skips_replica_reads(set, expire, set_data):
+    with APP.test_request_context():
+        g.use_replica = True
+        RedisManager.set(**set_data)
+
+    set.assert_not_called()
+
+
 @mock.patch('app.REDIS.delete')
 def test_delete(delete):
     delete.return_value = None
@@ -91,3 +104,20 @@ def test_generate_key(generate_data):
     test = RedisManager.generate_key(**generate_data)
 
     assert answer == test
+
+
+@mock.patch('app.REDIS.expire')
+@mock.patch('app.REDIS.sadd')
+def test_add_to_index(sadd, expire):
+    RedisManager.add_to_index('name', 'value_1', 'value_2')
+
+    sadd.assert_called_once_with('name', 'value_1', 'value_2')
+
+
+@mock.patch('app.REDIS.delete')
+@mock.patch('app.REDIS.smembers')
+def test_pop_index(smembers, delete):
+    smembers.return_value = {b'value'}
+
+    assert RedisManager.pop_index('name') == ['value']
+    delete.assert_called_once_with('name')
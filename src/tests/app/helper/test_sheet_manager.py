@@ -6,6 +6,7 @@ import mock
 import pytest
 import googleapiclient
 
+from app import APP
 from app.helper.sheet_manager import SheetManager
 from .helper_test_data import (
     SHEET_MANAGER_TEST_GET_DATA_WITH_RANGE_TRUE_DATA,
@@ -22,6 +23,12 @@ from .helper_test_data import (
 )
 
 
+@pytest.fixture(autouse=True)
+def no_sheets_quota():
+    with mock.patch.dict(APP.config, {'SHEETS_QUOTA_ENABLED': False}):
+        yield
+
+
 # get_data_with_range
 @pytest.mark.parametrize(
     "test_input, expected",
@@ -186,3 +193,95 @@ def test_lists_to_list(data, expected):
     result = SheetManager.lists_to_list(data)
 
     assert result == expected
+
+
+@mock.patch('app.helper.sheet_manager.SheetManager.service.spreadsheets')
+def test_batch_get(mock_spreadsheets):
+    """
+    Test SheetManager batch_get()
+    Test case when every range is returned in request order
+    """
+    mock_spreadsheets().values().batchGet().execute.return_value = {
+        'valueRanges': [{'values': [['a'], ['b']]}, {}]
+    }
+
+    result = SheetManager.batch_get('sheet', [('A1', 'A2'), ('B1', 'B2')])
+
+    assert result == [['a', 'b'], None]
+    assert mock_spreadsheets().values().batchGet.call_args[1]['ranges'] == ['A1:A2', 'B1:B2']
+
+
+@mock.patch('app.helper.sheet_manager.SheetManager.service.spreadsheets')
+def test_batch_get_error(mock_spreadsheets):
+    """
+    Test SheetManager batch_get()
+    Test case when method raised googleapiclient.errors.HttpError
+    """
+    mock_spreadsheets().values().batchGet().execute.side_effect = \
+        googleapiclient.errors.HttpError('Test', b'Test')
+
+    assert SheetManager.batch_get('sheet', [('A1', 'A2')]) is None
+
+
+@mock.patch('app.helper.sheet_manager.SheetManager.batch_get')
+def test_get_ranges(mock_batch_get):
+    """
+    Test SheetManager get_ranges()
+    Test case when ranges of one sheet are read with one request
+    """
+    mock_batch_get.side_effect = lambda sheet, ranges: \
+        None if sheet == 'broken' else [[f'{sheet}{from_row}'] for from_row, _ in ranges]
+
+    result = SheetManager.get_ranges([
+        ('first', 'A1', 'A5'),
+        ('second', 'A1', 'A5'),
+        ('first', 'B1', 'B5'),
+        ('first', 'A1', 'A5'),
+        ('broken', 'A1', 'A5')
+    ])
+
+    assert mock_batch_get.call_count == 3
+    mock_batch_get.assert_any_call('first', [('A1', 'A5'), ('B1', 'B5')])
+    assert result == {
+        ('first', 'A1', 'A5'): ['firstA1'],
+        ('first', 'B1', 'B5'): ['firstB1'],
+        ('second', 'A1', 'A5'): ['secondA1'],
+        ('broken', 'A1', 'A5'): None
+    }
+
+
+@mock.patch('app.helper.sheet_manager.SheetManager.service.files')
+def test_get_modified_time(mock_files):
+    """
+    Test SheetManager get_modified_time()
+    Test case when modifiedTime of sheet is returned
+    """
+    mock_files().get().execute.return_value = {'modifiedTime': '2020-03-01T10:00:00.000Z'}
+
+    assert SheetManager.get_modified_time('sheet') == '2020-03-01T10:00:00.000Z'
+    assert mock_files().get.call_args[1] == {'fileId': 'sheet', 'fields': 'modifiedTime'}
+
+
+@mock.patch('app.helper.sheet_manager.SheetManager.service.files')
+def test_get_modified_time_error(mock_files):
+    """
+    Test SheetManager get_modified_time()
+    Test case when method raised googleapiclient.errors.HttpError
+    """
+    mock_files().get().execute.side_effect = googleapiclient.errors.HttpError('Test', b'Test')
+
+    assert SheetManager.get_modified_time('sheet') is None
+
+
+@mock.patch('app.helper.sheet_manager.SheetManager.get_modified_time')
+def test_get_modified_times(mock_get_modified_time):
+    """
+    Test SheetManager get_modified_times()
+    Test case when every sheet is requested once
+    """
+    mock_get_modified_time.side_effect = lambda sheet: f'{sheet}_time'
+
+    result = SheetManager.get_modified_times(['first', 'second', 'first'])
+
+    assert mock_get_modified_time.call_count == 2
+    assert result == {'first': 'first_time', 'second': 'second_time'}
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import flask
+import mock
+import pytest
+from googleapiclient.errors import HttpError
+
+from app import APP
+from app.helper.sheet_manager import SheetManager
+from app.helper.sheets_backend import FakeSheetsBackend, HttpPool, PooledHttp, SheetsService
+
+
+def test_fake_backend_append_and_get():
+    backend = FakeSheetsBackend()
+
+    backend.spreadsheets().values().append(
+        spreadsheetId='sheet',
+        range='A:A',
+        body={'majorDimension': 'COLUMNS', 'values': [['a'], ['b']]},
+        valueInputOption='USER_ENTERED'
+    ).execute()
+    result = backend.spreadsheets().values().get(spreadsheetId='sheet', range='A:ZZZ').execute()
+
+    assert result['values'] == [['a', 'b']]
+
+
+def test_fake_backend_modified_time():
+    backend = FakeSheetsBackend()
+    before = backend.files().get(fileId='sheet', fields='modifiedTime').execute()
+
+    backend.append_rows('sheet', [['a']])
+    after = backend.files().get(fileId='sheet', fields='modifiedTime').execute()
+
+    assert before['modifiedTime'] != after['modifiedTime']
+
+
+def test_fake_backend_quota_error():
+    backend = FakeSheetsBackend(error_rate=1)
+
+    with pytest.raises(HttpError) as error:
+        backend.spreadsheets().values().get(spreadsheetId='sheet', range='A:A').execute()
+
+    assert error.value.resp.status == 429
+
+
+def test_sheets_service_builds_backend_once():
+    with mock.patch.dict(APP.config, {'SHEETS_BACKEND': 'fake'}):
+        service = SheetsService()
+
+        assert service.backend is service.backend
+        assert isinstance(service.backend, FakeSheetsBackend)
+
+
+def test_sheet_manager_with_fake_backend():
+    backend = FakeSheetsBackend()
+    with mock.patch.object(SheetManager, 'service', backend), \
+            mock.patch.dict(APP.config, {'SHEETS_QUOTA_ENABLED': False}):
+        assert SheetManager.append_data('sheet', ['answer', ['a', 'b']]) is True
+        assert SheetManager.get_all_data('sheet') == ['answer', 'a;b']
+
+
+def test_http_pool_reuses_connections():
+    factory = mock.Mock(side_effect=lambda: mock.Mock())
+    pool = HttpPool(factory, size=2, timeout=0.01)
+
+    first = pool.acquire()
+    second = pool.acquire()
+    pool.release(second)
+
+    assert pool.acquire() is second
+    assert factory.call_count == 2
+    pool.release(first)
+
+
+def test_http_pool_is_bounded():
+    pool = HttpPool(mock.Mock, size=1, timeout=0.01)
+    pool.acquire()
+
+    with pytest.raises(HttpError) as error:
+        pool.acquire()
+    assert error.value.resp.status == 503
+
+
+def test_http_pool_waits_until_deadline():
+    pool = HttpPool(mock.Mock, size=1, timeout=30)
+    pool.acquire()
+    start = time.monotonic()
+
+    with pytest.raises(HttpError):
+        pool.acquire(deadline=start + 0.01)
+    assert time.monotonic() - start < 1
+
+
+def test_pooled_http_uses_request_deadline():
+    pool = mock.Mock()
+    pool.acquire.return_value.request.return_value = ({'status': 200}, b'')
+
+    with APP.test_request_context():
+        flask.g.sheets_deadline = 100
+        PooledHttp(pool).request('https://sheets.googleapis.com', 'GET')
+
+    pool.acquire.assert_called_once_with(100)
+
+
+def test_http_pool_factory_error_frees_slot():
+    pool = HttpPool(mock.Mock(side_effect=[OSError(), mock.Mock()]), size=1, timeout=0.01)
+
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.acquire() is not None
+
+
+def test_pooled_http_releases_connection_on_error():
+    http = mock.Mock()
+    http.request.side_effect = OSError()
+    pool = HttpPool(lambda: http, size=1, timeout=0.01)
+
+    with pytest.raises(OSError):
+        PooledHttp(pool).request('https://sheets.googleapis.com', 'GET')
+
+    assert pool.acquire() is http
+
+
+def test_pooled_http_concurrent_requests_use_separate_connections():
+    in_use = set()
+    overlaps = []
+
+    def request(http):
+        def send(*args, **kwargs):
+            overlaps.append(http in in_use)
+            in_use.add(http)
+            time.sleep(0.01)
+            in_use.discard(http)
+            return {'status': 200}, b''
+        return send
+
+    def factory():
+        http = mock.Mock()
+        http.request.side_effect = request(http)
+        return http
+
+    pooled = PooledHttp(HttpPool(factory, size=3, timeout=1))
+    threads = [threading.Thread(target=pooled.request, args=('url',)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(overlaps) == 6
+    assert not any(overlaps)
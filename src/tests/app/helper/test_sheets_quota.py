@@ -0,0 +1,153 @@
+"""
+Test SheetsQuota
+"""
+
+import time
+
+import flask
+import httplib2
+import mock
+import pytest
+from googleapiclient.errors import HttpError
+from redis import RedisError
+
+from app import APP
+from app.helper.sheets_quota import SheetsBusy, SheetsQuota
+
+
+def http_error(status, headers=None):
+    return HttpError(httplib2.Response({'status': status, **(headers or {})}), b'error')
+
+
+@pytest.fixture(autouse=True)
+def quota_config():
+    with mock.patch.dict(APP.config, {
+        'SHEETS_QUOTA_ENABLED': True,
+        'SHEETS_QUOTAS': {'read': {'project': 300, 'user': 60}},
+        'SHEETS_QUOTA_BURST': 1,
+        'SHEETS_QUOTA_MAX_WAIT': 10,
+        'SHEETS_REQUEST_DEADLINE': 5,
+        'SHEETS_MAX_RETRIES': 2,
+        'SHEETS_BACKOFF_BASE': 0.5,
+        'SHEETS_BACKOFF_MAX': 32
+    }):
+        yield
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.RateLimiter.consume')
+def test_acquire_waits_for_token(mock_consume, mock_sleep):
+    mock_consume.side_effect = [0, 0.5, 0]
+
+    assert SheetsQuota.acquire('read') == 0.5
+    mock_sleep.assert_called_once_with(0.5)
+    # burst and refill of a minute make exactly the quota
+    mock_consume.assert_any_call('sheets:read:project', 299 / 60, 1)
+    mock_consume.assert_any_call('sheets:read:user', 59 / 60, 1)
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.RateLimiter.consume')
+def test_acquire_stops_waiting_after_max_wait(mock_consume, mock_sleep):
+    mock_consume.return_value = 6
+
+    assert SheetsQuota.acquire('read') == 6
+    mock_sleep.assert_called_once_with(6)
+
+
+@mock.patch('app.helper.sheets_quota.RateLimiter.consume')
+def test_acquire_without_redis(mock_consume):
+    mock_consume.side_effect = RedisError()
+
+    assert SheetsQuota.acquire('read') == 0
+
+
+@pytest.mark.parametrize("attempt, expected_max", [(0, 0.5), (3, 4), (10, 32)])
+@mock.patch('app.helper.sheets_quota.random.uniform')
+def test_get_delay_backoff(mock_uniform, attempt, expected_max):
+    SheetsQuota.get_delay(attempt)
+
+    mock_uniform.assert_called_once_with(0, expected_max)
+
+
+def test_get_delay_retry_after():
+    assert SheetsQuota.get_delay(0, http_error(429, {'retry-after': '7'})) == 7
+
+
+def test_get_delay_retry_after_capped():
+    assert SheetsQuota.get_delay(0, http_error(429, {'retry-after': '3600'})) == 32
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.RateLimiter.consume')
+def test_acquire_fails_fast_past_deadline(mock_consume, mock_sleep):
+    mock_consume.return_value = 6
+
+    with pytest.raises(SheetsBusy) as error:
+        SheetsQuota.acquire('read', deadline=time.monotonic() + 5)
+
+    assert ('Retry-After', '6') in error.value.get_headers()
+    mock_sleep.assert_not_called()
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.SheetsQuota.acquire', return_value=0)
+def test_execute_in_request_fails_fast(mock_acquire, mock_sleep):
+    request = mock.Mock()
+    request.execute.side_effect = http_error(429, {'retry-after': '20'})
+
+    with APP.test_request_context():
+        with pytest.raises(SheetsBusy):
+            SheetsQuota.execute('append_data', 'write', request)
+
+    request.execute.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.SheetsQuota.acquire', return_value=0)
+def test_execute_in_request_pool_timeout(mock_acquire, mock_sleep):
+    request = mock.Mock()
+    request.execute.side_effect = http_error(503, {'retry-after': '1'})
+
+    with APP.test_request_context(), \
+            mock.patch('app.helper.sheets_quota.time.monotonic', side_effect=[0, 5, 5]):
+        with pytest.raises(SheetsBusy) as error:
+            SheetsQuota.execute('append_data', 'write', request)
+        assert flask.g.sheets_deadline == 5
+
+    assert error.value.retry_after == 1
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.SheetsQuota.acquire', return_value=0)
+def test_execute_retries_quota_error(mock_acquire, mock_sleep):
+    request = mock.Mock()
+    request.execute.side_effect = [http_error(429), http_error(503), {'values': []}]
+
+    assert SheetsQuota.execute('get_all_data', 'read', request) == {'values': []}
+    assert request.execute.call_count == 3
+    assert mock_sleep.call_count == 2
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.SheetsQuota.acquire', return_value=0)
+def test_execute_gives_up(mock_acquire, mock_sleep):
+    request = mock.Mock()
+    request.execute.side_effect = http_error(429)
+
+    with pytest.raises(HttpError):
+        SheetsQuota.execute('get_all_data', 'read', request)
+    assert request.execute.call_count == 3
+
+
+@mock.patch('app.helper.sheets_quota.time.sleep')
+@mock.patch('app.helper.sheets_quota.SheetsQuota.acquire', return_value=0)
+def test_execute_does_not_retry_client_error(mock_acquire, mock_sleep):
+    request = mock.Mock()
+    request.execute.side_effect = http_error(403)
+
+    with pytest.raises(HttpError):
+        SheetsQuota.execute('get_all_data', 'read', request)
+    request.execute.assert_called_once()
+    mock_sleep.assert_not_called()
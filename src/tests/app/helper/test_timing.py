@@ -0,0 +1,43 @@
+import mock
+from flask import Response, g
+
+from app import APP
+from app.helper.timing import RequestTimer, timed
+
+
+@timed('test')
+def timed_function(depth=0):
+    if depth:
+        return timed_function(depth - 1)
+    return 'result'
+
+
+def test_timed_not_sampled():
+    with mock.patch.dict(APP.config, {'TIMING_SAMPLE_RATE': 0}), APP.test_request_context():
+        RequestTimer.start()
+
+        assert timed_function() == 'result'
+        assert RequestTimer.is_enabled() is False
+
+
+def test_timed_nested_calls_counted_once():
+    with mock.patch.dict(APP.config, {'TIMING_SAMPLE_RATE': 1}), APP.test_request_context():
+        RequestTimer.start()
+
+        assert timed_function(depth=2) == 'result'
+        assert g.timings['test'][1] == 1
+
+
+@mock.patch('app.helper.timing.TIMING_LOGGER')
+def test_finish_adds_server_timing(logger_mock):
+    with mock.patch.dict(APP.config, {'TIMING_SAMPLE_RATE': 1}), \
+            APP.test_request_context('/api/v1/tokens/token/answers'):
+        RequestTimer.start()
+        RequestTimer.record('redis', 0.002)
+        RequestTimer.record('redis', 0.001)
+
+        response = RequestTimer.finish(Response())
+
+    header = response.headers['Server-Timing']
+    assert header.startswith('redis;dur=3.0;desc="2x", total;dur=')
+    assert logger_mock.info.called is True
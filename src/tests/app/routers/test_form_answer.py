@@ -0,0 +1,144 @@
+import json
+
+import mock
+import pytest
+from flask import jsonify
+from werkzeug.exceptions import BadRequest
+
+from app.routers.form_answer import FormTokenAnswersAPI
+
+URL = '/api/v1/tokens/token/answers'
+
+
+@pytest.fixture
+def headers():
+    headers = {
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+        'Idempotency-Key': 'key'
+    }
+    return headers
+
+
+@pytest.fixture
+def record():
+    return {'result': {'id': 1}, 'is_appended': True}
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(app):
+    with mock.patch.dict(app.config, {'RATE_LIMIT_ENABLED': False}):
+        yield
+
+
+@mock.patch('app.routers.form_answer.FormTokenAnswersAPI.create_result')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.acquire')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.get')
+def test_post_replays_saved_record(get_mock, acquire_mock, create_mock, client, headers, record):
+    get_mock.return_value = record
+
+    response = client.post(URL, data=json.dumps({'answers': []}), headers=headers)
+
+    assert response.status_code == 201
+    assert response.json == {'id': 1}
+    acquire_mock.assert_not_called()
+    create_mock.assert_not_called()
+
+
+@mock.patch('app.routers.form_answer.FormTokenAnswersAPI.create_result')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.acquire')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.get')
+def test_post_in_progress(get_mock, acquire_mock, create_mock, client, headers):
+    get_mock.return_value = None
+    acquire_mock.return_value = None
+
+    response = client.post(URL, data=json.dumps({'answers': []}), headers=headers)
+
+    assert response.status_code == 409
+    create_mock.assert_not_called()
+
+
+@mock.patch('app.routers.form_answer.FormTokenAnswersAPI.create_result')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.release')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.acquire')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.get')
+def test_post_record_saved_before_lock(get_mock, acquire_mock, release_mock, create_mock,
+                                       client, headers, record):
+    # first request saved record and released lock between get and acquire
+    get_mock.side_effect = [None, record]
+    acquire_mock.return_value = 'lock'
+
+    response = client.post(URL, data=json.dumps({'answers': []}), headers=headers)
+
+    assert response.status_code == 201
+    create_mock.assert_not_called()
+    release_mock.assert_called_once_with('token', 'key', 'lock')
+
+
+@mock.patch('app.routers.form_answer.FormTokenAnswersAPI.create_result')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.release')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.acquire')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.get')
+def test_post_creates_result(get_mock, acquire_mock, release_mock, create_mock,
+                             client, headers):
+    get_mock.return_value = None
+    acquire_mock.return_value = 'lock'
+    create_mock.return_value = jsonify({'id': 1})
+
+    response = client.post(URL, data=json.dumps({'answers': []}), headers=headers)
+
+    assert response.status_code == 200
+    create_mock.assert_called_once_with('token', 'key')
+    release_mock.assert_called_once_with('token', 'key', 'lock')
+
+
+@mock.patch('app.services.SheetReconciliationService.is_reconciled')
+@mock.patch('app.helper.form_events.FormEvents.publish_results')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.save')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_data')
+def test_replay_appends_missing_row(append_mock, save_mock, publish_mock, reconciled_mock, app):
+    append_mock.return_value = True
+    reconciled_mock.return_value = False
+    record = {'result': {'id': 1}, 'sheet_id': 'sheet', 'values': ['a', 'token', 1],
+              'form_id': 1, 'is_appended': False}
+
+    with app.test_request_context():
+        response = FormTokenAnswersAPI.replay_result('token', 'key', record)
+
+    assert response.status_code == 201
+    append_mock.assert_called_once_with('sheet', ['a', 'token', 1])
+    assert save_mock.call_args[0][2]['is_appended'] is True
+    publish_mock.assert_called_once_with(1, [{'id': 1}])
+
+
+@mock.patch('app.services.SheetReconciliationService.is_reconciled')
+@mock.patch('app.helper.form_events.FormEvents.publish_results')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_data')
+def test_replay_append_failed_not_published(append_mock, publish_mock, reconciled_mock, app):
+    append_mock.return_value = None
+    reconciled_mock.return_value = False
+    record = {'result': {'id': 1}, 'sheet_id': 'sheet', 'values': ['a', 'token', 1],
+              'form_id': 1, 'is_appended': False}
+
+    with app.test_request_context(), pytest.raises(BadRequest):
+        FormTokenAnswersAPI.replay_result('token', 'key', record)
+
+    publish_mock.assert_not_called()
+
+
+@mock.patch('app.services.SheetReconciliationService.is_reconciled')
+@mock.patch('app.helper.form_events.FormEvents.publish_results')
+@mock.patch('app.helper.idempotency_manager.IdempotencyManager.save')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_data')
+def test_replay_skips_reconciled_row(append_mock, save_mock, publish_mock, reconciled_mock, app):
+    reconciled_mock.return_value = True
+    record = {'result': {'id': 1}, 'sheet_id': 'sheet', 'values': ['a', 'token', 1],
+              'form_id': 1, 'is_appended': False}
+
+    with app.test_request_context():
+        response = FormTokenAnswersAPI.replay_result('token', 'key', record)
+
+    assert response.status_code == 201
+    reconciled_mock.assert_called_once_with(1, 1)
+    append_mock.assert_not_called()
+    assert save_mock.call_args[0][2]['is_appended'] is True
@@ -171,15 +171,18 @@ def test_groups_get_one_not_found(group_get_by_id_mock, client, group):
     assert response.status_code == 400
 
 
+@mock.patch('app.services.TokenService.invalidate_resolutions')
 @mock.patch('app.services.GroupService.delete')
 @mock.patch('app.services.GroupService.get_by_id')
-def test_groups_delete(group_get_by_id_mock, group_delete_mock, client, login_user, group):
+def test_groups_delete(group_get_by_id_mock, group_delete_mock, invalidate_mock,
+                       client, login_user, group):
     group_get_by_id_mock.return_value = group
     group_delete_mock.return_value = True
     group.user = login_user
 
     response = client.delete(f'api/v1/groups/{group.id}', follow_redirects=True)
     assert response.status_code == 204
+    invalidate_mock.assert_called_once_with(group_id=group.id)
 
 
 @mock.patch('app.services.GroupService.get_by_id')
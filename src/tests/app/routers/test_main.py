@@ -0,0 +1,49 @@
+import mock
+
+
+@mock.patch('app.routers.main.get_pool_status')
+def test_db_pool_forbidden(status_mock, client, app):
+    with mock.patch.dict(app.config, {'ADMIN_EMAILS': set()}):
+        response = client.get('/db_pool')
+
+    assert response.status_code == 403
+    status_mock.assert_not_called()
+
+
+@mock.patch('app.routers.main.get_pool_status')
+def test_db_pool_admin(status_mock, client, app, login_user):
+    status_mock.return_value = {'size': 20, 'checkedOut': 1}
+
+    with mock.patch.dict(app.config, {'ADMIN_EMAILS': {login_user.email}}):
+        response = client.get('/db_pool')
+
+    assert response.status_code == 200
+    assert response.json == {'size': 20, 'checkedOut': 1}
+
+
+@mock.patch('app.routers.main.get_pool_status')
+def test_db_pool_token(status_mock, client, app):
+    status_mock.return_value = {'size': 20}
+
+    with mock.patch.dict(app.config, {'ADMIN_EMAILS': set(), 'METRICS_TOKEN': 'secret'}):
+        response = client.get('/db_pool', headers={'Authorization': 'Bearer secret'})
+
+    assert response.status_code == 200
+
+
+def test_metrics_forbidden(client, app):
+    with mock.patch.dict(app.config, {'ADMIN_EMAILS': set(), 'METRICS_TOKEN': 'secret'}):
+        response = client.get('/metrics', headers={'Authorization': 'Bearer wrong'})
+
+    assert response.status_code == 403
+
+
+@mock.patch('app.routers.main.generate_latest')
+def test_metrics_token(generate_mock, client, app):
+    generate_mock.return_value = b'ngfg_request_duration_seconds'
+
+    with mock.patch.dict(app.config, {'ADMIN_EMAILS': set(), 'METRICS_TOKEN': 'secret'}):
+        response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+
+    assert response.status_code == 200
+    assert b'ngfg_request_duration_seconds' in response.data
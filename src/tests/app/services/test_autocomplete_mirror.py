@@ -0,0 +1,161 @@
+import time
+
+import mock
+import pytest
+
+from app import DB
+from app.models import SettingAutocomplete
+from app.services import AutocompleteMirrorService
+
+SHEET_URL = 'https://docs.google.com/spreadsheets/d/sheet/edit'
+
+
+@pytest.fixture()
+def setting():
+    return SettingAutocomplete(data_url=SHEET_URL, sheet='Sheet1',
+                               from_row='A1', to_row='A3', field_id=1)
+
+
+def mirror(values, synced=None, sheet_range=('sheet', 'A1', 'A3'), modified=None):
+    return {
+        'values': values,
+        'hash': AutocompleteMirrorService.get_hash(values),
+        'range': sheet_range,
+        'synced': synced or time.time(),
+        'changed': 100.0,
+        'modified': modified
+    }
+
+
+@mock.patch('app.services.autocomplete_mirror.RedisManager.get')
+def test_get_fresh(mock_redis_get, setting):
+    mock_redis_get.return_value = mirror(['a'])
+
+    assert AutocompleteMirrorService.get(setting)['values'] == ['a']
+
+
+@pytest.mark.parametrize("saved", [
+    None,
+    mirror(['a'], sheet_range=('sheet', 'B1', 'B3')),
+    mirror(['a'], synced=1)
+])
+@mock.patch('app.services.autocomplete_mirror.RedisManager.get')
+def test_get_missing_or_stale(mock_redis_get, setting, saved):
+    mock_redis_get.return_value = saved
+
+    assert AutocompleteMirrorService.get(setting) is None
+
+
+@mock.patch('app.services.autocomplete_mirror.RedisManager.set')
+def test_save_detects_change(mock_redis_set, setting):
+    assert AutocompleteMirrorService.save(setting, ['a', 'b'], mirror(['a'])) is True
+    assert AutocompleteMirrorService.save(setting, ['a'], mirror(['a'])) is False
+    assert mock_redis_set.call_args[0][1]['changed'] == 100.0
+
+
+@mock.patch('app.services.autocomplete_mirror.AutocompleteMirrorService.save')
+@mock.patch('app.services.autocomplete_mirror.SheetManager.get_ranges')
+@mock.patch('app.services.autocomplete_mirror.AutocompleteMirrorService.get')
+def test_get_values_reads_only_missing(mock_get, mock_get_ranges, mock_save, setting):
+    other = SettingAutocomplete(data_url=SHEET_URL, sheet='Sheet1',
+                                from_row='B1', to_row='B3', field_id=2)
+    mock_get.side_effect = lambda item: mirror(['a'], synced=50.0) if item.field_id == 1 else None
+    mock_get_ranges.return_value = {('sheet', 'B1', 'B3'): ['b']}
+
+    result = AutocompleteMirrorService.get_values([setting, other])
+
+    assert result[1] == (['a'], 50.0)
+    assert result[2][0] == ['b']
+    assert list(mock_get_ranges.call_args[0][0]) == [('sheet', 'B1', 'B3')]
+    mock_save.assert_called_once_with(other, ['b'])
+
+
+@mock.patch('app.services.autocomplete_mirror.AutocompleteMirrorService.get_values')
+def test_get_fields_values(mock_get_values, client):
+    DB.session.add_all([
+        SettingAutocomplete(data_url='https://docs.google.com/spreadsheets/d/first/edit',
+                            sheet='Sheet1', from_row='A1', to_row='A5', field_id=1),
+        SettingAutocomplete(data_url='https://docs.google.com/spreadsheets/d/first/edit',
+                            sheet='Sheet1', from_row='B1', to_row='B5', field_id=2)
+    ])
+    DB.session.flush()
+    mock_get_values.return_value = {1: (['a'], 100.0), 2: (['b'], 100.0)}
+
+    result = AutocompleteMirrorService.get_fields_values([1, 2])
+
+    assert result == {1: (['a'], 100.0), 2: (['b'], 100.0)}
+    assert {setting.field_id for setting in mock_get_values.call_args[0][0]} == {1, 2}
+
+
+def test_get_fields_values_empty():
+    assert AutocompleteMirrorService.get_fields_values([]) == {}
+
+
+@mock.patch('app.services.autocomplete_mirror.FormFieldService.invalidate_definitions')
+@mock.patch('app.services.autocomplete_mirror.RedisManager')
+@mock.patch('app.services.autocomplete_mirror.SheetManager.get_modified_times')
+@mock.patch('app.services.autocomplete_mirror.SheetManager.get_ranges')
+@mock.patch('app.services.autocomplete_mirror.SettingAutocomplete')
+def test_sync(mock_setting_model, mock_get_ranges, mock_get_modified, mock_redis,
+              mock_invalidate):
+    settings = [
+        SettingAutocomplete(data_url=SHEET_URL, sheet='Sheet1', from_row='A1', to_row='A3',
+                            field_id=1),
+        SettingAutocomplete(data_url=SHEET_URL, sheet='Sheet1', from_row='B1', to_row='B3',
+                            field_id=2),
+        SettingAutocomplete(data_url=SHEET_URL, sheet='Sheet1', from_row='C1', to_row='C3',
+                            field_id=3)
+    ]
+    mock_setting_model.query.all.return_value = settings
+    mock_get_modified.return_value = {'sheet': None}
+    mock_get_ranges.return_value = {
+        ('sheet', 'A1', 'A3'): ['changed'],
+        ('sheet', 'B1', 'B3'): ['same'],
+        ('sheet', 'C1', 'C3'): None
+    }
+    mock_redis.get.side_effect = lambda key, field: {
+        'autocomplete_mirror:field_id:1': mirror(['old']),
+        'autocomplete_mirror:field_id:2': mirror(['same'], sheet_range=('sheet', 'B1', 'B3'))
+    }.get(key)
+
+    result = AutocompleteMirrorService.sync()
+
+    assert result == {'changed': 1, 'unchanged': 1, 'skipped': 0, 'failed': 1}
+    mock_invalidate.assert_called_once_with([1])
+    assert mock_redis.set.call_count == 2
+
+
+@mock.patch('app.services.autocomplete_mirror.FormFieldService.invalidate_definitions')
+@mock.patch('app.services.autocomplete_mirror.RedisManager')
+@mock.patch('app.services.autocomplete_mirror.SheetManager.get_modified_times')
+@mock.patch('app.services.autocomplete_mirror.SheetManager.get_ranges')
+@mock.patch('app.services.autocomplete_mirror.SettingAutocomplete')
+def test_sync_skips_unmodified_sheets(mock_setting_model, mock_get_ranges, mock_get_modified,
+                                      mock_redis, mock_invalidate, setting):
+    other = SettingAutocomplete(data_url='https://docs.google.com/spreadsheets/d/other/edit',
+                                sheet='Sheet1', from_row='A1', to_row='A3', field_id=2)
+    mock_setting_model.query.all.return_value = [setting, other]
+    mock_get_modified.return_value = {'sheet': 'time1', 'other': 'time2'}
+    mock_get_ranges.return_value = {('other', 'A1', 'A3'): ['new']}
+    mock_redis.get.side_effect = lambda key, field: {
+        'autocomplete_mirror:field_id:1': mirror(['a'], synced=50.0, modified='time1'),
+        'autocomplete_mirror:field_id:2': mirror(['old'], sheet_range=('other', 'A1', 'A3'),
+                                                 modified='time0')
+    }.get(key)
+
+    result = AutocompleteMirrorService.sync()
+
+    assert result == {'changed': 1, 'unchanged': 0, 'skipped': 1, 'failed': 0}
+    assert list(mock_get_ranges.call_args[0][0]) == [('other', 'A1', 'A3')]
+    mock_invalidate.assert_called_once_with([2])
+    saved = {call[0][0]: call[0][1] for call in mock_redis.set.call_args_list}
+    assert saved['autocomplete_mirror:field_id:1']['synced'] > 50.0
+    assert saved['autocomplete_mirror:field_id:2']['modified'] == 'time2'
+
+
+def test_is_modified(setting):
+    assert AutocompleteMirrorService.is_modified(setting, None, 'time')
+    assert AutocompleteMirrorService.is_modified(setting, mirror(['a'], modified='time'), None)
+    assert AutocompleteMirrorService.is_modified(setting, mirror(['a'], modified='old'), 'time')
+    assert not AutocompleteMirrorService.is_modified(setting, mirror(['a'], modified='time'),
+                                                     'time')
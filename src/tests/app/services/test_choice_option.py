@@ -5,6 +5,12 @@ from app.services import ChoiceOptionService
 from app.models import ChoiceOption
 
 
+@pytest.fixture(autouse=True)
+def invalidate_definitions_mock():
+    with mock.patch('app.services.FormFieldService.invalidate_definitions') as invalidate_mock:
+        yield invalidate_mock
+
+
 @pytest.fixture()
 def choice_options_data():
     data = {'field_id': 1, 'option_text': 'string1'}
@@ -146,7 +152,8 @@ def test_update_option_text(get_by_id_mock, db_mock, option_id, choice_options_d
 
 @mock.patch('app.DB.session.delete')
 @mock.patch('app.services.ChoiceOptionService.get_by_id')
-def test_delete(get_by_id_mock, db_mock, option_id, choice_options_data):
+def test_delete(get_by_id_mock, db_mock, option_id, choice_options_data,
+                invalidate_definitions_mock):
     instance = ChoiceOption(id=option_id, **choice_options_data)
     get_by_id_mock.return_value = instance
     db_mock.return_value = None
@@ -154,6 +161,7 @@ def test_delete(get_by_id_mock, db_mock, option_id, choice_options_data):
     test_instance = ChoiceOptionService.delete(option_id=option_id)
 
     assert test_instance is True
+    invalidate_definitions_mock.assert_called_once_with([instance.field_id])
 
 
 @mock.patch('app.services.ChoiceOptionService.get_by_id')
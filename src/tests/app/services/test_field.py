@@ -5,8 +5,18 @@ FieldService tests
 import mock
 import pytest
 
-from app.models import Field, Range, FieldRange, ChoiceOption, SettingAutocomplete
-from app.services import FieldService
+from app import DB
+from app.helper.enums import FieldType
+from app.models import (
+    Field,
+    Range,
+    FieldRange,
+    ChoiceOption,
+    SettingAutocomplete,
+    SharedField,
+    User
+)
+from app.services import FieldLibraryService, FieldService
 from app.helper.errors import FieldNotExist, SettingAutocompleteNotExist
 
 from .services_test_data import (
@@ -50,6 +60,12 @@ from .services_test_data import (
 )
 
 
+@pytest.fixture(autouse=True)
+def invalidate_definitions_mock():
+    with mock.patch('app.services.FormFieldService.invalidate_definitions') as invalidate_mock:
+        yield invalidate_mock
+
+
 @pytest.fixture()
 def field_data():
     data = {
@@ -962,11 +978,15 @@ def test_get_choice_additional_options_error(
     "test_input",
     FIELD_SERVICE_GET_AUTOCOMPLETE_ADDITIONAL_OPTIONS_TRUE_DATA
 )
+@mock.patch('app.services.AutocompleteMirrorService.save')
+@mock.patch('app.services.AutocompleteMirrorService.get', return_value=None)
 @mock.patch('app.helper.sheet_manager.SheetManager.get_data_with_range')
 @mock.patch('app.services.SettingAutocompleteService.get_by_field_id')
 def test_get_autocomplete_additional_options_true(
         mock_settings_get,
         mock_manager_get_data,
+        mock_mirror_get,
+        mock_mirror_save,
         test_input):
     """
     Test FieldService _get_choice_additional_options()
@@ -1010,6 +1030,25 @@ def test_get_autocomplete_additional_options_error(mock_settings_get, field_id):
         FieldService._get_autocomplete_additional_options(field_id)
 
 
+@mock.patch('app.services.AutocompleteMirrorService.get_field_values')
+@mock.patch('app.services.SettingAutocompleteService.get_by_field_id')
+def test_get_autocomplete_additional_options_prefetched(mock_settings_get, mock_mirror_get):
+    """
+    Test FieldService _get_autocomplete_additional_options()
+    Test case when values were fetched with AutocompleteMirrorService get_fields_values
+    """
+    mock_settings_get.return_value = SettingAutocomplete(
+        data_url='https://docs.google.com/spreadsheets/d/sheet/edit',
+        sheet='Sheet1', from_row='A1', to_row='A5', field_id=1
+    )
+
+    result = FieldService._get_autocomplete_additional_options(1, {1: (['a', 'b'], 100.0)})
+
+    assert result['values'] == ['a', 'b']
+    assert result['valuesSyncedAt'] == 100.0
+    mock_mirror_get.assert_not_called()
+
+
 # get_additional_options
 @pytest.mark.parametrize(
     "field_id, field_type, expected",
@@ -1917,3 +1956,105 @@ def test_validate_checkbox_update(mock_options, mock_options_and_range, test_inp
     )
     assert result == expected_result
     assert errors == expected_errors
+
+
+# get_library
+@pytest.fixture()
+def library_users(client):
+    users = [User(email=f'user{index}@gmail.com', is_active=True) for index in range(2)]
+    DB.session.add_all(users)
+    DB.session.flush()
+    # flush commits in autocommit session, ids are read before objects expire
+    return [user.id for user in users]
+
+
+def test_get_library_budget(library_users, query_counter):
+    """
+    Test FieldLibraryService get_library()
+    Test case when options of all fields on page are loaded at once
+    """
+    user_id, other_id = library_users
+    fields = [Field(name=f'field{index}', owner_id=library_users[index % 2],
+                    field_type=field_type.value)
+              for index, field_type in enumerate(list(FieldType) * 3)]
+    DB.session.add_all(fields)
+    DB.session.flush()
+    field_range = Range(min=1, max=10)
+    DB.session.add(field_range)
+    DB.session.flush()
+    for field in fields:
+        if field.field_type == FieldType.Number.value:
+            DB.session.add(FieldRange(field_id=field.id, range_id=field_range.id))
+        elif field.field_type == FieldType.Radio.value:
+            DB.session.add_all([ChoiceOption(field_id=field.id, option_text=option)
+                                for option in ('yes', 'no')])
+        elif field.field_type == FieldType.Autocomplete.value:
+            DB.session.add(SettingAutocomplete(data_url='https://docs.google.com/spreadsheets/d/id',
+                                               sheet='Sheet1', from_row='A1', to_row='A5',
+                                               field_id=field.id))
+        if field.owner_id == other_id:
+            DB.session.add(SharedField(user_id=user_id, field_id=field.id, owner_id=other_id))
+    DB.session.flush()
+    query_counter.statements.clear()
+
+    result, total = FieldLibraryService.get_library(user_id=user_id, page=1, per_page=10)
+
+    assert total == len(fields)
+    assert len(result) == 10
+    # count, page, ranges, choice options, autocomplete settings, owners
+    assert query_counter.count == 6
+    for field in result:
+        if field['fieldType'] == FieldType.Number.value:
+            assert field['range'] == {'min': 1, 'max': 10}
+        elif field['fieldType'] == FieldType.Radio.value:
+            assert field['choiceOptions'] == ['yes', 'no']
+        elif field['fieldType'] == FieldType.Autocomplete.value:
+            assert 'values' not in field['settingAutocomplete']
+        assert field['owner'].get('current', False) == (field['ownerId'] == user_id)
+
+
+def test_get_library_filters(library_users):
+    """
+    Test FieldLibraryService get_library()
+    Test case when fields are filtered by type and name
+    """
+    user_id, other_id = library_users
+    DB.session.add_all([
+        Field(name='email', owner_id=user_id, field_type=FieldType.Text.value),
+        Field(name='age', owner_id=user_id, field_type=FieldType.Number.value),
+        Field(name='not shared', owner_id=other_id, field_type=FieldType.Text.value)
+    ])
+    DB.session.flush()
+
+    result, total = FieldLibraryService.get_library(user_id=user_id, page=1, per_page=10,
+                                                    field_type=FieldType.Text.value)
+    assert total == 1
+    assert result[0]['name'] == 'email'
+
+    result, total = FieldLibraryService.get_library(user_id=user_id, page=1, per_page=10,
+                                                    name='AG')
+    assert [field['name'] for field in result] == ['age']
+
+    assert FieldLibraryService.get_library(user_id=user_id, page=5, per_page=10) == ([], 2)
+
+
+def test_get_library_name_wildcards(library_users):
+    """
+    Test FieldLibraryService get_library()
+    Test case when LIKE wildcards of name are matched literally
+    """
+    user_id, _ = library_users
+    DB.session.add_all([
+        Field(name='first_name', owner_id=user_id, field_type=FieldType.Text.value),
+        Field(name='firstname', owner_id=user_id, field_type=FieldType.Text.value),
+        Field(name='discount %', owner_id=user_id, field_type=FieldType.Number.value)
+    ])
+    DB.session.flush()
+
+    result, _ = FieldLibraryService.get_library(user_id=user_id, page=1, per_page=10,
+                                                name='t_n')
+    assert [field['name'] for field in result] == ['first_name']
+
+    result, _ = FieldLibraryService.get_library(user_id=user_id, page=1, per_page=10,
+                                                name='%')
+    assert [field['name'] for field in result] == ['discount %']
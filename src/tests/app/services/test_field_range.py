@@ -5,6 +5,12 @@ from app.services import FieldRangeService
 from app.models.field_range import FieldRange
 
 
+@pytest.fixture(autouse=True)
+def invalidate_definitions_mock():
+    with mock.patch('app.services.FormFieldService.invalidate_definitions') as invalidate_mock:
+        yield invalidate_mock
+
+
 @pytest.fixture()
 def field_range_data():
     data = {
@@ -5,7 +5,7 @@ Test FormService
 import mock
 import pytest
 
-from app.models import Form
+from app.models import Form, FormField, Field
 from app.services import FormService
 from app.schemas import FormSchema
 
@@ -116,11 +116,13 @@ def form():
     "form_id, owner_id, name, title, result_url, is_published",
     FORM_SERVICE_UPDATE_DATA
 )
+@mock.patch("app.helper.redis_manager.RedisManager.delete")
 @mock.patch("app.DB.session.merge")
 @mock.patch("app.services.FormService.get_by_id")
 def test_update(
         mock_form_get,
         mock_db_merge,
+        mock_redis_delete,
         form,
         form_id,
         owner_id,
@@ -172,9 +174,10 @@ def test_update_error(mock_form_get, form_id):
     "form_id",
     FORM_SERVICE_DELETE_DATA
 )
+@mock.patch("app.helper.redis_manager.RedisManager.delete")
 @mock.patch("app.DB.session.delete")
 @mock.patch("app.services.FormService.get_by_id")
-def test_delete(mock_form_get, mock_db_delete, form, form_id):
+def test_delete(mock_form_get, mock_db_delete, mock_redis_delete, form, form_id):
     """
     Test FormService delete()
     Test case when method executed successfully
@@ -379,3 +382,65 @@ def test_to_json(schema_mock, form_before_dump_data, form_after_dump_data):
 
     test_instance = FormService.to_json(form_before_dump_data)
     assert test_instance == form_after_dump_data
+
+
+# get_definition
+@mock.patch("app.helper.redis_manager.RedisManager.get")
+def test_get_definition_cached(mock_redis_get):
+    """
+    Test FormService get_definition()
+    Test case when definition is cached
+    """
+    definition = {'id': 1, 'formFields': []}
+    mock_redis_get.return_value = definition
+
+    result = FormService.get_definition(1)
+
+    assert result == definition
+
+
+@mock.patch("app.helper.redis_manager.RedisManager.set")
+@mock.patch("app.services.FieldService.get_additional_options")
+@mock.patch("app.services.FieldService.get_by_id")
+@mock.patch("app.services.FormFieldService.filter")
+@mock.patch("app.services.FormService.get_by_id")
+@mock.patch("app.helper.redis_manager.RedisManager.get")
+def test_get_definition_not_cached(
+        mock_redis_get,
+        mock_form_get,
+        mock_form_field_filter,
+        mock_field_get,
+        mock_options,
+        mock_redis_set,
+        form):
+    """
+    Test FormService get_definition()
+    Test case when definition is built and cached
+    """
+    mock_redis_get.return_value = None
+    mock_form_get.return_value = form
+    mock_form_field_filter.return_value = [
+        FormField(id=1, form_id=1, field_id=1, question='question', position=0)
+    ]
+    mock_field_get.return_value = Field(id=1, name='field', field_type=2, owner_id=1)
+    mock_options.return_value = {'range': {'min': 1, 'max': 10}}
+
+    result = FormService.get_definition(1)
+
+    assert result['title'] == form.title
+    assert result['formFields'][0]['question'] == 'question'
+    assert result['formFields'][0]['field']['range'] == {'min': 1, 'max': 10}
+    mock_redis_set.assert_called_once()
+
+
+@mock.patch("app.services.FormService.get_by_id")
+@mock.patch("app.helper.redis_manager.RedisManager.get")
+def test_get_definition_form_not_exist(mock_redis_get, mock_form_get):
+    """
+    Test FormService get_definition()
+    Test case when form doesn't exist
+    """
+    mock_redis_get.return_value = None
+    mock_form_get.return_value = None
+
+    assert FormService.get_definition(1) is None
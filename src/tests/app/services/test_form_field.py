@@ -1,8 +1,9 @@
 import pytest
 import mock
 
+from app import DB
 from app.services import FormFieldService
-from app.models import FormField
+from app.models import FieldRange, FormField
 
 
 @pytest.fixture()
@@ -369,3 +370,28 @@ def test_response_to_json(schema):
     schema.return_value = None
     result = FormFieldService.response_to_json(None, many=False)
     assert result == {}
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.delete')
+@mock.patch('app.models.FormField.query')
+def test_invalidate_definitions(query_mock, delete_mock, form_field_data):
+    query_mock.filter.return_value.all.return_value = [
+        FormField(**form_field_data),
+        FormField(**form_field_data)
+    ]
+
+    FormFieldService.invalidate_definitions([1])
+
+    delete_mock.assert_called_once_with('form_definition:form_id:1')
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.delete')
+def test_invalidate_definitions_by_range(delete_mock, client, form_field_data):
+    DB.session.add_all([FormField(**form_field_data), FieldRange(field_id=1, range_id=5)])
+    DB.session.flush()
+
+    FormFieldService.invalidate_definitions(
+        DB.session.query(FieldRange.field_id).filter_by(range_id=5)
+    )
+
+    delete_mock.assert_called_once_with('form_definition:form_id:1')
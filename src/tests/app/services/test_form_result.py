@@ -2,7 +2,7 @@ import pytest
 import mock
 
 from app.services import FormResultService
-from app.models import FormResult
+from app.models import FormResult, FormResultUser
 
 
 @pytest.fixture()
@@ -47,6 +47,42 @@ def test_create(db_mock, redis_get_mock, redis_delete_mock, answer_data):
     assert instance.answers == test_instance.answers
 
 
+
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+@mock.patch('app.DB.session.add')
+def test_create_saves_result_user(add_mock, redis_get_mock, answer_data):
+    redis_get_mock.return_value = None
+
+    FormResultService.create(**answer_data)
+
+    result_user = add_mock.call_args_list[1][0][0]
+    assert isinstance(result_user, FormResultUser)
+    assert (result_user.user_id, result_user.token_id) == (1, 1)
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+@mock.patch('app.DB.session.add')
+def test_create_anonymous(add_mock, redis_get_mock, answer_data):
+    redis_get_mock.return_value = None
+
+    FormResultService.create(**dict(answer_data, user_id=None))
+
+    add_mock.assert_called_once()
+
+
+@pytest.mark.parametrize("passed, expected", [
+    ((1,), False),
+    (None, True)
+])
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+@mock.patch('app.DB.session.query')
+def test_check_whether_user_passed_form(query_mock, redis_get_mock, passed, expected):
+    query_mock.return_value.filter_by.return_value.first.return_value = passed
+
+    assert FormResultService.check_whether_user_passed_form(user_id=1, token_id=1) is expected
+    query_mock.return_value.filter_by.assert_called_once_with(user_id=1, token_id=1)
+    redis_get_mock.assert_not_called()
+
 @mock.patch('app.helper.redis_manager.RedisManager.set')
 @mock.patch('app.models.FormResult.query')
 @mock.patch('app.helper.redis_manager.RedisManager.get')
@@ -97,3 +133,220 @@ def test_filter(key, get, query, set, answer_data, filter_data):
     assert instance.user_id == test_instance.user_id
     assert instance.token_id == test_instance.token_id
     assert instance.answers == test_instance.answers
+
+
+@pytest.fixture()
+def submission(answer_data):
+    data = dict(answer_data)
+    data.update({
+        'submission_id': 'submission',
+        'token': 'token',
+        'sheet_id': 'sheet',
+        'values': ['Nick', 'token']
+    })
+    return data
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.delete')
+@mock.patch('app.DB.session.execute')
+def test_create_many(execute_mock, redis_delete_mock, answer_data):
+    row = dict(answer_data, id=1, created=None)
+    execute_mock.return_value.fetchall.return_value = [row]
+
+    test_instance = FormResultService.create_many([answer_data])
+
+    # result users and results are inserted with one statement each
+    assert execute_mock.call_count == 2
+    assert test_instance[0]['id'] == 1
+    assert test_instance[0]['tokenId'] == answer_data['token_id']
+    assert test_instance[0]['answers'] == answer_data['answers']
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.delete')
+@mock.patch('app.DB.session.execute')
+def test_create_many_saves_submission_ids(execute_mock, redis_delete_mock, submission):
+    row = dict(submission, id=1, created=None)
+    execute_mock.return_value.fetchall.return_value = [row]
+
+    FormResultService.create_many([submission])
+
+    # result users, results and ids of submissions
+    assert execute_mock.call_count == 3
+    assert execute_mock.call_args[0][0].parameters == [
+        {'submission_id': 'submission', 'result_id': 1}
+    ]
+
+
+@mock.patch('app.helper.form_result_stream.FormResultStream.publish')
+def test_enqueue(publish_mock, answer_data):
+    publish_mock.return_value = 'submission'
+
+    test_instance = FormResultService.enqueue(
+        token='token',
+        sheet_id='sheet',
+        values=['Nick', 'token'],
+        **answer_data
+    )
+
+    assert test_instance == 'submission'
+    assert publish_mock.call_args[0][0]['token_id'] == answer_data['token_id']
+
+
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued_empty(read_mock):
+    read_mock.return_value = []
+
+    assert FormResultService.process_queued(count=10, block=0) == 0
+
+
+@mock.patch('app.helper.form_result_stream.FormResultStream.ack')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_rows')
+@mock.patch('app.services.FormResultService.create_many')
+@mock.patch('app.services.FormResultService.get_inserted')
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued(read_mock, inserted_mock, create_many_mock, append_mock, status_mock,
+                        ack_mock, submission):
+    read_mock.return_value = [(b'1-0', submission)]
+    inserted_mock.return_value = {}
+    create_many_mock.return_value = [{'id': 1}]
+    append_mock.return_value = True
+
+    assert FormResultService.process_queued(count=10, block=0) == 1
+
+    append_mock.assert_called_once_with('sheet', [['Nick', 'token', 1]])
+    status_mock.assert_called_once_with(
+        'submission', 'token', 'created', result={'id': 1}, errors=None
+    )
+    ack_mock.assert_called_once_with([b'1-0'])
+
+
+@mock.patch('app.helper.form_result_stream.FormResultStream.ack')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_rows')
+@mock.patch('app.services.FormResultService.create_many')
+@mock.patch('app.services.FormResultService.get_inserted')
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued_appends_per_sheet(read_mock, inserted_mock, create_many_mock,
+                                          append_mock, status_mock, ack_mock, submission):
+    read_mock.return_value = [
+        (b'1-0', dict(submission, submission_id='first')),
+        (b'2-0', dict(submission, submission_id='second', sheet_id='other')),
+        (b'3-0', dict(submission, submission_id='third'))
+    ]
+    inserted_mock.return_value = {}
+    create_many_mock.return_value = [{'id': 1}, {'id': 2}, {'id': 3}]
+    append_mock.side_effect = [True, None]
+
+    assert FormResultService.process_queued(count=10, block=0) == 3
+
+    append_mock.assert_has_calls([
+        mock.call('sheet', [['Nick', 'token', 1], ['Nick', 'token', 3]]),
+        mock.call('other', [['Nick', 'token', 2]])
+    ])
+    status_mock.assert_any_call(
+        'second', 'token', 'created', result={'id': 2}, errors='Cannot append result to sheet'
+    )
+    assert status_mock.call_count == 3
+
+
+@mock.patch('app.helper.form_result_stream.FormResultStream.ack')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_rows')
+@mock.patch('app.services.FormResultService.create_many')
+@mock.patch('app.services.FormResultService.get_inserted')
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued_replayed(read_mock, inserted_mock, create_many_mock, append_mock,
+                                 status_mock, ack_mock, submission):
+    read_mock.return_value = [(b'1-0', submission)]
+    inserted_mock.return_value = {'submission': {'id': 1}}
+
+    assert FormResultService.process_queued(count=10, block=0) == 1
+
+    create_many_mock.assert_not_called()
+    append_mock.assert_not_called()
+    status_mock.assert_called_once_with('submission', 'token', 'created', result={'id': 1})
+    ack_mock.assert_called_once_with([b'1-0'])
+
+
+@mock.patch('app.helper.form_events.FormEvents.publish_results')
+@mock.patch('app.helper.form_result_stream.FormResultStream.ack')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_rows')
+@mock.patch('app.services.FormResultService.create_many')
+@mock.patch('app.services.FormResultService.get_inserted')
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued_publishes(read_mock, inserted_mock, create_many_mock, append_mock,
+                                  status_mock, ack_mock, publish_mock, submission):
+    read_mock.return_value = [
+        (b'1-0', dict(submission, submission_id='first', form_id=1)),
+        (b'2-0', dict(submission, submission_id='second', form_id=1)),
+        (b'3-0', dict(submission, submission_id='third', form_id=2))
+    ]
+    inserted_mock.return_value = {}
+    create_many_mock.return_value = [{'id': 1}, {'id': 2}, {'id': 3}]
+    append_mock.return_value = True
+
+    assert FormResultService.process_queued(count=10, block=0) == 3
+
+    publish_mock.assert_has_calls([
+        mock.call(1, [{'id': 1}, {'id': 2}]),
+        mock.call(2, [{'id': 3}])
+    ])
+
+
+@mock.patch('app.helper.form_events.FormEvents.publish_results')
+@mock.patch('app.helper.form_result_stream.FormResultStream.ack')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_rows')
+@mock.patch('app.services.FormResultService.create_many')
+@mock.patch('app.services.FormResultService.get_inserted')
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued_not_appended_not_published(read_mock, inserted_mock, create_many_mock,
+                                                   append_mock, status_mock, ack_mock,
+                                                   publish_mock, submission):
+    read_mock.return_value = [(b'1-0', dict(submission, form_id=1))]
+    inserted_mock.return_value = {}
+    create_many_mock.return_value = [{'id': 1}]
+    append_mock.return_value = None
+
+    assert FormResultService.process_queued(count=10, block=0) == 1
+
+    publish_mock.assert_not_called()
+
+
+@mock.patch('app.helper.form_result_stream.FormResultStream.ack')
+@mock.patch('app.helper.form_result_stream.FormResultStream.set_status')
+@mock.patch('app.helper.sheet_manager.SheetManager.append_rows')
+@mock.patch('app.services.FormResultService.create_many')
+@mock.patch('app.services.FormResultService.get_inserted')
+@mock.patch('app.helper.form_result_stream.FormResultStream.read')
+def test_process_queued_failed(read_mock, inserted_mock, create_many_mock, append_mock,
+                               status_mock, ack_mock, submission):
+    read_mock.return_value = [(b'1-0', submission)]
+    inserted_mock.return_value = {}
+    create_many_mock.return_value = None
+
+    assert FormResultService.process_queued(count=10, block=0) == 1
+
+    append_mock.assert_not_called()
+    status_mock.assert_called_once_with(
+        'submission', 'token', 'failed', errors='Cannot create result instance'
+    )
+    ack_mock.assert_called_once_with([b'1-0'])
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.set')
+@mock.patch('app.models.FormResult.query')
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_filter_prunes_by_form_created(get_mock, query, set_mock, answer_data):
+    instance = FormResult(**answer_data)
+    get_mock.return_value = None
+    query.filter_by.return_value.filter.return_value.all.return_value = [instance]
+
+    test_instance = FormResultService.filter(token_id=1, form_created='2020-03-23')
+
+    query.filter_by.assert_called_once_with(token_id=1)
+    query.filter_by.return_value.filter.assert_called_once()
+    get_mock.assert_called_once_with('form_results:token_id:1', 'data')
+    assert test_instance == [instance]
@@ -0,0 +1,150 @@
+import time
+
+import mock
+import pytest
+
+from app.models import FormResultArchive, Token
+from app.services import FormResultArchiveService
+
+
+@pytest.fixture()
+def rows():
+    data = [
+        {
+            'id': 1,
+            'user_id': 1,
+            'token_id': 1,
+            'answers': {'name': 'Nick'},
+            'created': '2020-03-23T22:42:02.614691+02:00'
+        },
+        {
+            'id': 2,
+            'user_id': None,
+            'token_id': 2,
+            'answers': {'name': 'Ann'},
+            'created': '2020-03-24T10:00:00+02:00'
+        }
+    ]
+    return data
+
+
+def test_write_read_file(tmp_path, rows):
+    path = str(tmp_path / 'form_results' / 'form_1.json.gz')
+
+    FormResultArchiveService.write_file(path, rows)
+
+    assert FormResultArchiveService.read_file(path) == rows
+
+
+@mock.patch('app.services.FormResultArchiveService.get_by_form_id')
+def test_read_by_user(get_mock, tmp_path, rows):
+    path = str(tmp_path / 'form_1.json.gz')
+    FormResultArchiveService.write_file(path, rows)
+    get_mock.return_value = FormResultArchive(form_id=1, path=path, results_count=2)
+
+    test_instance = FormResultArchiveService.read(1, user_id=1)
+
+    assert test_instance == rows[:1]
+
+
+@mock.patch('app.services.FormResultArchiveService.get_by_form_id')
+def test_read_not_archived(get_mock):
+    get_mock.return_value = None
+
+    assert FormResultArchiveService.read(1) == []
+
+
+@mock.patch('app.services.FormResultArchiveService.get_by_form_id')
+def test_read_skips_live_results(get_mock, tmp_path, rows):
+    path = str(tmp_path / 'form_1.json.gz')
+    FormResultArchiveService.write_file(path, rows)
+    get_mock.return_value = FormResultArchive(form_id=1, path=path, results_count=2)
+
+    test_instance = FormResultArchiveService.read(1, live_ids=[1])
+
+    assert test_instance == rows[1:]
+
+
+@mock.patch('app.services.form_result_archive.FormResultArchive')
+@mock.patch('app.services.form_result_archive.RedisManager')
+def test_get_by_form_id_caches_missing_archive(redis_mock, model_mock):
+    redis_mock.get.return_value = None
+    model_mock.query.filter_by.return_value.first.return_value = None
+
+    test_instance = FormResultArchiveService.get_by_form_id(1)
+
+    redis_mock.set.assert_called_once_with('form_result_archive:form_id:1', False)
+    assert test_instance is None
+
+
+@mock.patch('app.services.form_result_archive.FormResultArchive')
+@mock.patch('app.services.form_result_archive.RedisManager')
+def test_get_by_form_id_cached_missing_archive(redis_mock, model_mock):
+    redis_mock.get.return_value = False
+
+    test_instance = FormResultArchiveService.get_by_form_id(1)
+
+    model_mock.query.filter_by.assert_not_called()
+    assert test_instance is None
+
+
+@mock.patch('app.services.form_result_archive.RedisManager')
+@mock.patch('app.services.FormResultArchiveService.move_results')
+def test_archive_form_clears_cache_after_move(move_mock, redis_mock):
+    archive = FormResultArchive(form_id=1, path='form_1.json.gz', results_count=1)
+    result = mock.Mock(id=5, user_id=1, token_id=2)
+    move_mock.return_value = (archive, [result], [Token(id=2, token='token', form_id=1)])
+
+    test_instance = FormResultArchiveService.archive_form(1)
+
+    redis_mock.delete.assert_any_call('form_result:5')
+    redis_mock.delete.assert_any_call('form_results:token_id:2')
+    redis_mock.delete.assert_any_call('form_result_archive:form_id:1')
+    assert test_instance == archive
+
+
+@mock.patch('app.services.form_result_archive.RedisManager')
+@mock.patch('app.services.FormResultArchiveService.move_results')
+def test_archive_form_failed(move_mock, redis_mock):
+    move_mock.return_value = None
+
+    assert FormResultArchiveService.archive_form(1) is None
+    redis_mock.delete.assert_not_called()
+
+
+@mock.patch('app.services.TokenService.decode_token_for_check')
+@mock.patch('app.services.TokenService.filter')
+def test_is_form_inactive(filter_mock, decode_mock):
+    filter_mock.return_value = [Token(id=1, token='expired', form_id=1)]
+    decode_mock.return_value = {'form_id': 1, 'exp': time.time() - 3600}
+
+    assert FormResultArchiveService.is_form_inactive(1) is True
+
+
+@mock.patch('app.services.TokenService.decode_token_for_check')
+@mock.patch('app.services.TokenService.filter')
+def test_is_form_inactive_without_exp(filter_mock, decode_mock):
+    filter_mock.return_value = [Token(id=1, token='unlimited', form_id=1)]
+    decode_mock.return_value = {'form_id': 1}
+
+    assert FormResultArchiveService.is_form_inactive(1) is False
+
+
+@mock.patch('app.services.TokenService.filter')
+def test_is_form_inactive_without_tokens(filter_mock):
+    filter_mock.return_value = []
+
+    assert FormResultArchiveService.is_form_inactive(1) is False
+
+
+@mock.patch('app.services.FormResultArchiveService.archive_form')
+@mock.patch('app.services.FormResultArchiveService.is_form_inactive')
+@mock.patch('app.services.FormResultArchiveService.get_forms_with_results')
+def test_archive_inactive_forms(forms_mock, inactive_mock, archive_mock):
+    forms_mock.return_value = [1, 2]
+    inactive_mock.side_effect = [True, False]
+
+    test_instance = FormResultArchiveService.archive_inactive_forms()
+
+    archive_mock.assert_called_once_with(1)
+    assert test_instance == [1]
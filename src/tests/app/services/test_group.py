@@ -209,18 +209,18 @@ def test_update_group_owner_id(db_mock, group_service_mock, group_data_with_id):
     assert updated_instance.owner_id == update_result.owner_id
 
 
-@mock.patch('app.services.UserService.to_json')
+@mock.patch('app.services.GroupService.get_users_by_groups')
 @mock.patch('app.services.GroupService.get_by_id')
-def test_get_users_by_group(get_by_id_mock, to_json_mock, group_data, group_user_data, user_data):
+def test_get_users_by_group(get_by_id_mock, get_users_mock, group_data, user_data):
     group_instance = Group(**group_data)
-    group_instance.groups_users = [GroupUser(**group_user_data), GroupUser(**group_user_data)]
     user_json = user_data
 
     get_by_id_mock.return_value = group_instance
-    to_json_mock.return_value = user_json
+    get_users_mock.return_value = {1: [user_json, user_json]}
 
     test_instance = GroupService.get_users_by_group(1)
 
+    get_users_mock.assert_called_once_with([1])
     assert [user_json, user_json] == test_instance
 
 
@@ -232,6 +232,56 @@ def test_get_users_by_group_error(get_by_id_mock):
     assert test_instance == None
 
 
+@mock.patch('app.models.Group.query')
+def test_get_by_ids(query, group_data_with_id):
+    instance = Group(**group_data_with_id)
+
+    query.filter.return_value.all.return_value = [instance]
+    test_instance = GroupService.get_by_ids([1, 2])
+
+    assert test_instance == {1: instance}
+
+
+def test_get_by_ids_empty():
+    assert GroupService.get_by_ids([]) == {}
+
+
+@mock.patch('app.services.UserService.to_json')
+@mock.patch('app.DB.session.query')
+def test_get_users_by_groups(query_mock, to_json_mock, user, user_data):
+    query_mock.return_value.join.return_value.filter.return_value.all.return_value = [
+        (1, user),
+        (1, user)
+    ]
+    to_json_mock.return_value = user_data
+
+    test_instance = GroupService.get_users_by_groups([1, 2])
+
+    assert test_instance == {1: [user_data, user_data], 2: []}
+
+
+@mock.patch('app.services.GroupService.get_users_by_groups')
+@mock.patch('app.services.GroupService.get_by_ids')
+def test_get_groups_emails(get_by_ids_mock, get_users_mock, group_data_with_id, user_data):
+    get_by_ids_mock.return_value = {1: Group(**group_data_with_id)}
+    get_users_mock.return_value = {1: [user_data]}
+
+    test_instance = GroupService.get_groups_emails([1, 2])
+
+    get_users_mock.assert_called_once_with([1])
+    assert test_instance == {1: {'name': group_data_with_id['name'],
+                                 'emails': [user_data['email']]}}
+
+
+@mock.patch('app.services.GroupService.get_by_ids')
+def test_check_whether_groups_exist(get_by_ids_mock, group_data_with_id):
+    get_by_ids_mock.return_value = {1: Group(**group_data_with_id)}
+
+    errors = GroupService.check_whether_groups_exist([1, 2])
+
+    assert errors == ["Group 2 doesn't exist"]
+
+
 @mock.patch('app.services.GroupUserService.delete_by_group_and_user_id')
 @mock.patch('app.services.GroupUserService.filter')
 @mock.patch('app.services.UserService.filter')
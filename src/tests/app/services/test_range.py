@@ -9,6 +9,12 @@ from app.models import Range
 from app.services import RangeService
 
 
+@pytest.fixture(autouse=True)
+def invalidate_definitions_mock():
+    with mock.patch('app.services.FormFieldService.invalidate_definitions') as invalidate_mock:
+        yield invalidate_mock
+
+
 @pytest.fixture()
 def range_data():
     data = {
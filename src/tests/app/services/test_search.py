@@ -0,0 +1,58 @@
+"""
+SearchService tests
+"""
+
+import mock
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import SearchService
+
+
+def compile_query(query):
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.parametrize("test_input, expected", [
+    ('name', 'name'),
+    ('100%', '100\\%'),
+    ('first_name', 'first\\_name'),
+    ('a\\b', 'a\\\\b')
+])
+def test_escape_like(test_input, expected):
+    assert SearchService.escape_like(test_input) == expected
+
+
+def test_build_query_all_kinds():
+    sql = compile_query(SearchService.build_query(user_id=1, text='email'))
+
+    assert sql.count('UNION ALL') == 2
+    assert 'similarity(fields.name' in sql
+    assert 'similarity(forms.title' in sql
+    assert 'similarity(form_fields.question' in sql
+    assert 'ts_rank(to_tsvector' in sql
+    assert 'shared_fields' in sql
+
+
+def test_build_query_one_kind():
+    sql = compile_query(SearchService.build_query(user_id=1, text='email', kinds=('form',)))
+
+    assert 'UNION ALL' not in sql
+    assert 'forms.name' in sql
+    assert 'form_fields' not in sql
+
+
+@mock.patch('app.services.search.DB')
+def test_search(mock_db):
+    row = mock.Mock(kind='question', id=3, form_id=2, text='Your email?', rank=0.53333)
+    mock_db.session.query.return_value.select_from.return_value.scalar.return_value = 1
+    mock_db.session.query.return_value.order_by.return_value \
+        .limit.return_value.offset.return_value.all.return_value = [row]
+
+    results, total = SearchService.search(user_id=1, text='email', page=2, per_page=10)
+
+    assert total == 1
+    assert results == [{'kind': 'question', 'id': 3, 'formId': 2,
+                        'text': 'Your email?', 'rank': 0.5333}]
+    mock_db.session.query.return_value.order_by.return_value \
+        .limit.return_value.offset.assert_called_once_with(10)
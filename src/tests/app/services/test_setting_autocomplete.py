@@ -5,6 +5,12 @@ from app.services import SettingAutocompleteService
 from app.models import SettingAutocomplete
 
 
+@pytest.fixture(autouse=True)
+def invalidate_definitions_mock():
+    with mock.patch('app.services.FormFieldService.invalidate_definitions') as invalidate_mock:
+        yield invalidate_mock
+
+
 @pytest.fixture()
 def setting_autocomplete_data():
     data = {
@@ -0,0 +1,32 @@
+import mock
+
+from app.services import SharedFormService
+
+
+@mock.patch('app.services.shared_form.TokenService.create_many')
+@mock.patch('app.services.shared_form.generate_token')
+def test_create_tokens(generate_mock, create_many_mock):
+    generate_mock.side_effect = lambda payload: f"token_{payload['group_id']}"
+    create_many_mock.side_effect = lambda tokens, form_id: {
+        token: mock.Mock() for token in tokens if token != 'token_2'
+    }
+
+    users_token, groups_tokens = SharedFormService.create_tokens(
+        form_id=1,
+        groups_ids=[1, 2],
+        with_users_token=True
+    )
+
+    assert create_many_mock.call_count == 1
+    assert users_token == 'token_None'
+    assert groups_tokens == {1: 'token_1'}
+
+
+@mock.patch('app.services.shared_form.TokenService.create_many')
+@mock.patch('app.services.shared_form.generate_token')
+def test_create_tokens_not_created(generate_mock, create_many_mock):
+    generate_mock.return_value = 'token'
+    create_many_mock.return_value = None
+
+    assert SharedFormService.create_tokens(form_id=1, groups_ids=[1],
+                                           with_users_token=False) is None
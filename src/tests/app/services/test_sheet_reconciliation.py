@@ -0,0 +1,165 @@
+import mock
+import pytest
+
+from app import APP
+from app.helper.sheet_manager import SheetManager
+from app.helper.sheets_backend import FakeSheetsBackend
+from app.models import Form, FormResult, FormSheetSync
+from app.services import SheetReconciliationService
+
+SHEET_URL = 'https://docs.google.com/spreadsheets/d/sheet/edit'
+
+
+@pytest.fixture()
+def backend():
+    backend = FakeSheetsBackend()
+    with mock.patch.object(SheetManager, 'service', backend), \
+            mock.patch.dict(APP.config, {
+                'SHEETS_QUOTA_ENABLED': False,
+                'SHEET_RECONCILE_PAGE_SIZE': 2,
+                'SHEET_RECONCILE_BATCH_SIZE': 1
+            }):
+        yield backend
+
+
+@pytest.fixture()
+def results():
+    tokens = {1: 'tokenA', 2: 'tokenB', 3: 'tokenB', 4: 'tokenB', 5: 'tokenC'}
+    return [(FormResult(id=result_id, token_id=1, answers={'name': f'answer {result_id}'}),
+             token)
+            for result_id, token in tokens.items()]
+
+
+def get_results_mock(results):
+    return lambda form, after_id, before: \
+        [item for item in results if item[0].id > after_id][:2]
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ('12', 12),
+    ('1,234', 1234),
+    (7, 7),
+    ('note', None)
+])
+def test_parse_result_id(cell, expected):
+    assert SheetReconciliationService.parse_result_id(cell) == expected
+
+
+@pytest.mark.parametrize("row, expected", [
+    (['answer', 'token', '12'], ('token', 12)),
+    (['answer', 'token', '12', 'owner note', '5'], ('token', 12)),
+    (['token', 'token', '12'], ('token', 12)),
+    (['answer', 'token'], ('token', None)),
+    (['answer', 'token', 'owner note'], ('token', None)),
+    (['12'], None),
+    ([], None)
+])
+def test_parse_row(row, expected):
+    assert SheetReconciliationService.parse_row(row, {'token'}) == expected
+
+
+@pytest.mark.parametrize("row_ids, expected", [
+    ([(3, 1, 'tokenA'), (4, 2, 'tokenA'), (5, 7, 'tokenA'), (6, 3, 'tokenA')], 4),
+    ([(3, 1, 'tokenA'), (4, 2, 'tokenA')], 10),
+    ([], 10)
+])
+def test_get_row_mark(row_ids, expected):
+    assert SheetReconciliationService.get_row_mark(row_ids, 10, mark=5) == expected
+
+
+@pytest.mark.parametrize('mark, expected', [
+    (None, False),
+    (4, False),
+    (5, True),
+    (9, True)
+])
+@mock.patch('app.services.sheet_reconciliation.DB.session.query')
+def test_is_reconciled(query_mock, mark, expected):
+    query_mock.return_value.filter_by.return_value.scalar.return_value = mark
+
+    assert SheetReconciliationService.is_reconciled(1, 5) is expected
+
+
+@pytest.fixture(autouse=True)
+def tokens_mock():
+    with mock.patch('app.services.SheetReconciliationService.get_tokens') as tokens_mock:
+        tokens_mock.return_value = {'tokenA', 'tokenB', 'tokenC'}
+        yield tokens_mock
+
+
+@mock.patch('app.services.SheetReconciliationService.save_state')
+@mock.patch('app.services.SheetReconciliationService.get_state')
+@mock.patch('app.services.SheetReconciliationService.get_results')
+def test_reconcile_form(results_mock, state_mock, save_mock, backend, results):
+    backend.append_rows('sheet', [
+        ['answer 1', 'tokenA'],
+        ['answer 2', 'tokenB', '2'],
+        ['answer 4', 'tokenB', '4']
+    ])
+    state_mock.return_value = FormSheetSync(form_id=1, result_id_mark=0, row_mark=0)
+    results_mock.side_effect = get_results_mock(results)
+
+    appended = SheetReconciliationService.reconcile_form(Form(id=1, result_url=SHEET_URL))
+
+    assert appended == 2
+    assert backend.get_rows('sheet')[3:] == [
+        ['answer 3', 'tokenB', 3],
+        ['answer 5', 'tokenC', 5]
+    ]
+    save_mock.assert_called_once_with(state_mock.return_value, 5, 3)
+
+
+@mock.patch('app.services.SheetReconciliationService.save_state')
+@mock.patch('app.services.SheetReconciliationService.get_state')
+@mock.patch('app.services.SheetReconciliationService.get_results')
+def test_reconcile_form_owner_columns(results_mock, state_mock, save_mock, backend, results):
+    # owner added own columns after token and result id
+    backend.append_rows('sheet', [
+        ['answer 1', 'tokenA', '', 'checked'],
+        ['answer 2', 'tokenB', '2', 'checked', '3'],
+        ['answer 4', 'tokenB', '4', '', '5']
+    ])
+    state_mock.return_value = FormSheetSync(form_id=1, result_id_mark=0, row_mark=0)
+    results_mock.side_effect = get_results_mock(results)
+
+    appended = SheetReconciliationService.reconcile_form(Form(id=1, result_url=SHEET_URL))
+
+    assert appended == 2
+    assert backend.get_rows('sheet')[3:] == [
+        ['answer 3', 'tokenB', 3],
+        ['answer 5', 'tokenC', 5]
+    ]
+
+
+@mock.patch('app.services.SheetReconciliationService.scan_sheet')
+@mock.patch('app.services.SheetReconciliationService.get_state')
+@mock.patch('app.services.SheetReconciliationService.get_results')
+def test_reconcile_form_without_new_results(results_mock, state_mock, scan_mock, backend):
+    state_mock.return_value = FormSheetSync(form_id=1, result_id_mark=5, row_mark=5)
+    results_mock.return_value = []
+
+    assert SheetReconciliationService.reconcile_form(Form(id=1, result_url=SHEET_URL)) == 0
+    scan_mock.assert_not_called()
+
+
+@mock.patch('app.services.SheetReconciliationService.save_state')
+@mock.patch('app.services.SheetReconciliationService.get_state')
+@mock.patch('app.services.SheetReconciliationService.get_results')
+def test_reconcile_form_append_failed(results_mock, state_mock, save_mock, backend, results):
+    backend.append_rows('sheet', [['answer 1', 'tokenA', '1'], ['answer 2', 'tokenB', '2']])
+    state_mock.return_value = FormSheetSync(form_id=1, result_id_mark=0, row_mark=0)
+    results_mock.side_effect = get_results_mock(results)
+
+    with mock.patch.object(SheetManager, 'append_rows', return_value=None):
+        appended = SheetReconciliationService.reconcile_form(Form(id=1, result_url=SHEET_URL))
+
+    assert appended is None
+    save_mock.assert_called_once_with(state_mock.return_value, 2, 2)
+
+
+def test_get_rows_with_fake_backend(backend):
+    backend.append_rows('sheet', [[str(index)] for index in range(5)])
+
+    assert SheetManager.get_rows('sheet', 2, 3) == [['1'], ['2']]
+    assert SheetManager.append_rows('sheet', [['a', ['b', 'c']]]) is True
+    assert backend.get_rows('sheet')[-1] == ['a', 'b;c']
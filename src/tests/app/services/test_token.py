@@ -0,0 +1,121 @@
+import pytest
+import mock
+
+from app.services import TokenService
+from app.models import Token
+
+
+@pytest.fixture()
+def token_data():
+    data = {
+        'id': 1,
+        'token': 'test_token',
+        'form_id': 1
+    }
+    return data
+
+
+@mock.patch('app.DB.session.execute')
+@mock.patch('app.services.TokenService.filter_by_tokens')
+def test_create_many(filter_mock, execute_mock, token_data):
+    instance = Token(**token_data)
+    new_instance = Token(id=2, token='new_token', form_id=1)
+    filter_mock.side_effect = [[instance], [instance, new_instance]]
+
+    test_instance = TokenService.create_many(
+        tokens=['test_token', 'new_token', 'new_token'],
+        form_id=1
+    )
+
+    assert execute_mock.call_count == 1
+    assert test_instance == {'test_token': instance, 'new_token': new_instance}
+
+
+@mock.patch('app.DB.session.execute')
+@mock.patch('app.services.TokenService.filter_by_tokens')
+def test_create_many_all_exist(filter_mock, execute_mock, token_data):
+    instance = Token(**token_data)
+    filter_mock.return_value = [instance]
+
+    test_instance = TokenService.create_many(tokens=['test_token'], form_id=1)
+
+    execute_mock.assert_not_called()
+    assert test_instance == {'test_token': instance}
+
+
+def test_create_many_empty():
+    assert TokenService.create_many(tokens=[], form_id=1) == {}
+
+
+@pytest.fixture()
+def resolved_data():
+    data = {
+        'token_id': 1,
+        'form_id': 1,
+        'group_id': None,
+        'exp': None,
+        'nbf': None
+    }
+    return data
+
+
+@mock.patch('app.services.TokenService._resolve_token')
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_resolve_cached(get_mock, resolve_mock, resolved_data):
+    get_mock.return_value = resolved_data
+
+    test_instance = TokenService.resolve('test_token')
+
+    resolve_mock.assert_not_called()
+    assert test_instance == resolved_data
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.add_to_index')
+@mock.patch('app.helper.redis_manager.RedisManager.set')
+@mock.patch('app.services.TokenService._resolve_token')
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_resolve_not_cached(get_mock, resolve_mock, set_mock, index_mock, resolved_data):
+    get_mock.return_value = None
+    resolve_mock.return_value = resolved_data
+
+    test_instance = TokenService.resolve('test_token')
+
+    assert test_instance == resolved_data
+    set_mock.assert_called_once()
+    index_mock.assert_called_once_with('token_resolution:form_id:1', 'test_token')
+
+
+@mock.patch('app.services.TokenService._resolve_token')
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_resolve_wrong_token(get_mock, resolve_mock):
+    get_mock.return_value = None
+    resolve_mock.return_value = None
+
+    assert TokenService.resolve('test_token') is None
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_resolve_expired(get_mock, resolved_data):
+    resolved_data['exp'] = 1
+    get_mock.return_value = resolved_data
+
+    assert TokenService.resolve('test_token') is None
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.get')
+def test_resolve_not_before(get_mock, resolved_data):
+    resolved_data['nbf'] = 4102444800  # 2100-01-01
+    get_mock.return_value = resolved_data
+
+    assert TokenService.resolve('test_token') is None
+
+
+@mock.patch('app.helper.redis_manager.RedisManager.delete')
+@mock.patch('app.helper.redis_manager.RedisManager.pop_index')
+def test_invalidate_resolutions(pop_mock, delete_mock):
+    pop_mock.side_effect = [['token_1'], ['token_2']]
+
+    TokenService.invalidate_resolutions(form_id=1, group_id=2)
+
+    delete_mock.assert_any_call('token_resolution:token_1')
+    delete_mock.assert_any_call('token_resolution:token_2')
@@ -0,0 +1,86 @@
+"""
+Test db_config
+"""
+
+import mock
+import pytest
+from flask import g
+from psycopg2 import extensions, OperationalError
+from sqlalchemy.pool import QueuePool, NullPool
+
+from app import APP, DB
+from app.db_config import (
+    REPLICA_BIND,
+    RoutingSession,
+    gevent_wait_callback,
+    get_pool_status
+)
+from app.models import Form
+
+
+@mock.patch('app.db_config.wait_read')
+def test_gevent_wait_callback(wait_read_mock):
+    conn = mock.MagicMock()
+    conn.poll.side_effect = [extensions.POLL_READ, extensions.POLL_OK]
+    conn.fileno.return_value = 5
+
+    gevent_wait_callback(conn)
+
+    wait_read_mock.assert_called_once_with(5, timeout=None)
+
+
+def test_gevent_wait_callback_error():
+    conn = mock.MagicMock()
+    conn.poll.return_value = -1
+
+    with pytest.raises(OperationalError):
+        gevent_wait_callback(conn)
+
+
+def test_get_pool_status_queue_pool():
+    engine = mock.MagicMock()
+    engine.pool = QueuePool(mock.MagicMock(), pool_size=5)
+
+    status = get_pool_status(engine)
+
+    assert status['pool'] == 'QueuePool'
+    assert status['size'] == 5
+    assert status['checkedOut'] == 0
+
+
+def test_get_pool_status_null_pool():
+    engine = mock.MagicMock()
+    engine.pool = NullPool(mock.MagicMock())
+
+    status = get_pool_status(engine)
+
+    assert status['pool'] == 'NullPool'
+    assert 'size' not in status
+
+
+def test_routing_session_uses_replica():
+    session = RoutingSession(DB)
+    with mock.patch.dict(APP.config, {'SQLALCHEMY_BINDS': {REPLICA_BIND: 'sqlite://'}}), \
+            mock.patch.object(DB, 'get_engine') as get_engine_mock, \
+            APP.test_request_context():
+        g.use_replica = True
+        bind = session.get_bind()
+
+    get_engine_mock.assert_called_once_with(APP, bind=REPLICA_BIND)
+    assert bind == get_engine_mock.return_value
+
+
+def test_routing_session_stays_on_primary_after_write():
+    session = RoutingSession(DB)
+    with mock.patch.dict(APP.config, {'SQLALCHEMY_BINDS': {REPLICA_BIND: 'sqlite://'}}), \
+            mock.patch.object(DB, 'get_engine') as get_engine_mock, \
+            mock.patch('app.db_config.SignallingSession.get_bind') as primary_mock, \
+            APP.test_request_context():
+        g.use_replica = True
+        session.get_bind(clause=Form.__table__.insert())
+        bind = session.get_bind()
+
+        assert g.db_written is True
+
+    assert bind == primary_mock.return_value
+    get_engine_mock.assert_not_called()
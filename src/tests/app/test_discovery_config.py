@@ -0,0 +1,66 @@
+import os
+
+import mock
+import pytest
+import requests
+
+from app.discovery_config import DiscoveryCache, GoogleOAuthConfig
+
+DOCUMENT = {
+    'issuer': 'https://accounts.google.com',
+    'authorization_endpoint': 'https://accounts.google.com/o/oauth2/v2/auth',
+    'token_endpoint': 'https://oauth2.googleapis.com/token'
+}
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return DiscoveryCache(str(tmp_path), max_age=60, timeout=1)
+
+
+@mock.patch('app.discovery_config.requests.get')
+def test_cache_fetches_once(mock_get, cache):
+    mock_get.return_value.json.return_value = DOCUMENT
+
+    assert cache.get('google', 'url') == DOCUMENT
+    assert cache.get('google', 'url') == DOCUMENT
+    mock_get.assert_called_once_with('url', timeout=1)
+
+
+@mock.patch('app.discovery_config.requests.get')
+def test_cache_refetches_stale_document(mock_get, cache):
+    cache.write('google', {'old': True})
+    old_time = os.path.getmtime(cache.get_path('google')) - 120
+    os.utime(cache.get_path('google'), (old_time, old_time))
+    mock_get.return_value.json.return_value = DOCUMENT
+
+    assert cache.get('google', 'url') == DOCUMENT
+    assert cache.read('google') == DOCUMENT
+
+
+@mock.patch('app.discovery_config.requests.get')
+def test_cache_uses_stale_document_offline(mock_get, cache):
+    cache.write('google', DOCUMENT)
+    old_time = os.path.getmtime(cache.get_path('google')) - 120
+    os.utime(cache.get_path('google'), (old_time, old_time))
+    mock_get.side_effect = requests.ConnectionError()
+
+    assert cache.get('google', 'url') == DOCUMENT
+
+
+@mock.patch('app.discovery_config.requests.get')
+def test_cache_offline_without_document(mock_get, cache):
+    mock_get.side_effect = requests.ConnectionError()
+
+    with pytest.raises(requests.ConnectionError):
+        cache.get('google', 'url')
+
+
+@mock.patch('app.discovery_config.get_google_provider_config')
+def test_google_oauth_config_is_lazy(mock_provider_config):
+    mock_provider_config.return_value = DOCUMENT
+    config = GoogleOAuthConfig()
+    mock_provider_config.assert_not_called()
+
+    assert config['authorize_url'] == DOCUMENT['authorization_endpoint']
+    assert config.get('request_token_url') is None
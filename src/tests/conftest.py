@@ -1,6 +1,7 @@
 import pytest
 import mock
 from app import APP, DB
+from app.helper.query_counter import QueryCounter
 from app.models import User
 
 
@@ -21,6 +22,7 @@ def app(login_user):
     APP.config['TESTING'] = True
     APP.config['WTF_CSRF_ENABLED'] = False
     APP.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    APP.config['SQLALCHEMY_ENGINE_OPTIONS'] = {}
     query = mock.MagicMock('app.models.User.query')
     query = query()
     query.get.return_value = login_user
@@ -44,3 +46,13 @@ def client(login_user, app):
     yield testing_client
 
     ctx.pop()
+
+
+@pytest.fixture
+def query_counter():
+    """
+    Collect SQL statements executed by test,
+    e.g. assert query_counter.count <= 2
+    """
+    with QueryCounter() as counter:
+        yield counter
@@ -0,0 +1,25 @@
+from loadtest.driver import compare, parse_query_count, percentile
+
+
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) is None
+
+
+def test_parse_query_count():
+    header = 'redis;dur=1.2;desc="3x", db;dur=4.5;desc="7x", total;dur=20.1'
+
+    assert parse_query_count(header) == 7
+    assert parse_query_count('total;dur=1.0') == 0
+    assert parse_query_count(None) is None
+
+
+def test_compare():
+    current = {'submit': {'p95': 110, 'errors': 0}}
+    previous = {'submit': {'p95': 100, 'errors': 0}}
+
+    assert compare(current, previous) == {'submit': {'p95': 10.0}}
+
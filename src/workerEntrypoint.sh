@@ -3,4 +3,9 @@
 set -e
 sleep 1m
 
-celery -A app worker --loglevel=info -Q notification_queue,share_field_queue,share_form_to_group_queue,share_form_to_users_queue
+# prefork children share metrics through this directory, it must be empty on start
+export prometheus_multiproc_dir=/tmp/prometheus_metrics
+rm -rf "$prometheus_multiproc_dir"
+mkdir -p "$prometheus_multiproc_dir"
+
+celery -A app worker --loglevel=info -Q notification_queue,share_field_queue,share_form_to_group_queue,share_form_to_users_queue,partitions_queue,archive_queue,autocomplete_queue,reconciliation_queue,form_events_queue,form_results_queue